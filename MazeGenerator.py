@@ -1,26 +1,46 @@
 import random
 import time
+from collections import deque
+
+import numpy as np
+
+import maze_jit
+from MazeGrid import MazeGrid, DIRECTIONS, OPPOSITE
+from maze_events import Carve, Backtrack, batched
 
 
 class MazeGenerator:
-    def __init__(self, i_maze, cursor_pos=(0, 0), step_to_next_random=1):
+    def __init__(self, i_maze, cursor_pos=(0, 0), step_to_next_random=None, seed=None, stats=None):
         """
         Initializes the maze generator with a maze layout and starting position.
 
         Args:
             i_maze (list): The maze represented as a grid of nodes.
             cursor_pos (tuple): Starting position in the maze (default (0, 0)).
-            step_to_next_random (int): Time step to increment for randomization (default 1).
+            step_to_next_random (int): Compatibility mode, reseeds the generator's random stream with an incremented
+                seed every step_to_next_random steps, like the original global random.seed control. Default None
+                draws every step from a single stream.
+            seed (int): Seed of the generator's own random stream. Default None uses time.time_ns().
+            stats (MazeStats): Collects step counts and timings when given. Default None measures nothing.
         """
-        self.__visited = [cursor_pos]
-        self.cursor_pos = cursor_pos
-        self.__remain_pos = []
         self.maze = i_maze
+        self.__height = len(i_maze[0])
+        self.__visited = bytearray(len(i_maze) * self.__height)
+        self.__visited[self.__index(cursor_pos)] = 1
+        self.__visited_count = 1
+        self.cursor_pos = cursor_pos
+        self.__remain_pos = deque()
         self.__first = True
 
+        self.seed = time.time_ns() if seed is None else seed
+        self.__rng = random.Random(self.seed)
         self.__step_counter = 0
-        self.__random = time.time_ns()
+        self.__random = self.seed
         self.step_to_next_random = step_to_next_random
+        self.stats = stats
+
+    def __index(self, pos):
+        return pos[0] * self.__height + pos[1]
 
     def get_possible_moves(self, root_node):
         """
@@ -34,18 +54,20 @@ class MazeGenerator:
         """
         possible_moves = []
         for node, wall in root_node:
-            if node and node.pos not in self.__visited:
+            if node and not self.__visited[self.__index(node.pos)]:
                 possible_moves.append(node)
         return possible_moves
 
     def __random_control(self):
         """
-            Increments the random seed and resets the step counter if necessary.
+            Increments the random seed and resets the step counter if necessary, in compatibility mode only.
         """
+        if self.step_to_next_random is None:
+            return
         if self.__step_counter >= self.step_to_next_random:
             self.__random = self.__random + 1
             self.__step_counter = 0
-        random.seed(self.__random)
+        self.__rng.seed(self.__random)
         self.__step_counter += 1
 
     def next_step(self, pop_first=False):
@@ -54,15 +76,23 @@ class MazeGenerator:
 
         Args:
             pop_first (bool): Whether to remove the current position from the remain positions list if it's empty. Default False.
+
+        Returns:
+            Carve | Backtrack: What the step changed.
         """
+        if self.stats is not None:
+            started = time.perf_counter_ns()
+            move_checks = 1
+        start = self.cursor_pos
         x, y = self.cursor_pos
         root_node = self.maze[x][y]
         possible_moves = self.get_possible_moves(root_node)
         self.__random_control()
 
         if len(possible_moves) > 0:
-            next_node = random.choice(possible_moves)
-            self.__visited.append(next_node.pos)
+            next_node = self.__rng.choice(possible_moves)
+            self.__visited[self.__index(next_node.pos)] = 1
+            self.__visited_count += 1
 
             if len(possible_moves) > 1:
                 self.__remain_pos.append(self.cursor_pos)
@@ -76,20 +106,150 @@ class MazeGenerator:
                 root_node.right = (root_node.right[0], False)
             elif root_node.left[0] == next_node:
                 root_node.left = (root_node.left[0], False)
+            event = Carve(start, self.cursor_pos)
         else:
             while len(self.__remain_pos) > 0:
-                x, y = self.cursor_pos = self.__remain_pos.pop(0 if pop_first else -1)
+                x, y = self.cursor_pos = self.__remain_pos.popleft() if pop_first else self.__remain_pos.pop()
+                if self.stats is not None:
+                    move_checks += 1
                 if len(self.get_possible_moves(self.maze[x][y])) > 0:
                     break
+            event = Backtrack(start, self.cursor_pos)
 
         self.__first = False
+        if self.stats is not None:
+            self.__record(1, len(possible_moves) > 0, move_checks, len(self.__remain_pos))
+            self.stats.observe_ns("generator_step_ns", time.perf_counter_ns() - started)
+        return event
 
-    def run(self):
+    def __record(self, steps, carves, move_checks, remain_peak):
+        """
+        Adds the counters of one or more steps to the stats object.
         """
-            Runs the maze generator algorithm until all reachable nodes have been visited.
+        self.stats.count("generator_steps", steps)
+        self.stats.count("generator_carves", carves)
+        self.stats.count("generator_backtracks", steps - carves)
+        self.stats.count("generator_neighbor_checks", 4 * move_checks)
+        self.stats.high_water("generator_remain", remain_peak)
+
+    def steps(self, batch_size=None, pop_first=False):
+        """
+        Runs the generator step by step, yielding what each step changed.
+
+        Args:
+            batch_size (int, optional): If given, yields lists of up to batch_size events instead. Defaults to None.
+            pop_first (bool): Same as in next_step. Default False.
+
+        Yields:
+            Carve | Backtrack: One event per step, or lists of them when batch_size is given.
+        """
+        events = (self.next_step(pop_first) for _ in iter(lambda: self.has_next, False))
+        return events if batch_size is None else batched(events, batch_size)
+
+    def run(self, pop_first=False):
         """
-        while self.has_next:
-            self.next_step()
+        Runs the maze generator algorithm until all reachable nodes have been visited.
+
+        On a MazeGrid the steps run directly over a copy of the wall bytes, skipping the node views and
+        properties used by next_step, while producing exactly the same maze for the same random state. Large
+        grids run on the compiled kernel of maze_jit when Numba is installed, with the same result.
+
+        Args:
+            pop_first (bool): Same as in next_step. Default False.
+        """
+        if not isinstance(self.maze, MazeGrid):
+            while self.has_next:
+                self.next_step(pop_first)
+            return
+        started = time.perf_counter_ns()
+
+        width, height = self.maze.width, self.maze.height
+        if maze_jit.use_jit(width * height) and (self.step_to_next_random is None or abs(self.__random) < 1 << 62):
+            self.__run_compiled(pop_first, started)
+            return
+        walls = bytearray(self.maze.walls.tobytes())
+        visited = self.__visited
+        remain = self.__remain_pos
+        pop_remain = remain.popleft if pop_first else remain.pop
+        steps_per_seed = self.step_to_next_random
+        step_counter, seed = self.__step_counter, self.__random
+        visited_count = self.__visited_count
+        seed_random, choice = self.__rng.seed, self.__rng.choice
+        # offsets in the flat x * height + y index, in the same order as the node neighbors
+        deltas = (-height, -1, height, 1)
+
+        def moves_from(i):
+            x, y = divmod(i, height)
+            moves = []
+            if x > 0 and not visited[i - height]:
+                moves.append(0)
+            if y > 0 and not visited[i - 1]:
+                moves.append(1)
+            if x + 1 < width and not visited[i + height]:
+                moves.append(2)
+            if y + 1 < height and not visited[i + 1]:
+                moves.append(3)
+            return moves
+
+        current = self.__index(self.cursor_pos)
+        first = self.__first
+        start_count = visited_count
+        backtracks = pops = 0
+        remain_peak = len(remain)
+        while True:
+            moves = moves_from(current)
+            if not (remain or first or moves):
+                break
+            if steps_per_seed is not None:
+                if step_counter >= steps_per_seed:
+                    seed += 1
+                    step_counter = 0
+                seed_random(seed)
+                step_counter += 1
+
+            if moves:
+                direction = choice(moves)
+                if len(moves) > 1:
+                    remain.append((current // height, current % height))
+                    if len(remain) > remain_peak:
+                        remain_peak = len(remain)
+                next_index = current + deltas[direction]
+                visited[next_index] = 1
+                visited_count += 1
+                walls[current] &= ~DIRECTIONS[direction]
+                walls[next_index] &= ~OPPOSITE[DIRECTIONS[direction]]
+                current = next_index
+            else:
+                backtracks += 1
+                while remain:
+                    current = self.__index(pop_remain())
+                    pops += 1
+                    if moves_from(current):
+                        break
+            first = False
+
+        self.maze.walls[...] = np.frombuffer(walls, dtype=np.uint8).reshape(self.maze.walls.shape)
+        self.cursor_pos = (current // height, current % height)
+        self.__step_counter, self.__random = step_counter, seed
+        self.__visited_count = visited_count
+        self.__first = first
+        if self.stats is not None:
+            carves = visited_count - start_count
+            self.__record(carves + backtracks, carves, carves + backtracks + pops, remain_peak)
+            self.stats.observe_ns("generator_run_ns", time.perf_counter_ns() - started)
+
+    def __run_compiled(self, pop_first, started):
+        """
+        The MazeGrid branch of run on the maze_jit kernel.
+        """
+        (self.cursor_pos, self.__first, self.__step_counter, self.__random, carves, backtracks, pops,
+         remain_peak) = maze_jit.run_backtracker(self.maze.walls, self.__visited, self.__remain_pos, self.cursor_pos,
+                                                 self.__first, pop_first, self.__rng, self.step_to_next_random,
+                                                 self.__step_counter, self.__random)
+        self.__visited_count += carves
+        if self.stats is not None:
+            self.__record(carves + backtracks, carves, carves + backtracks + pops, remain_peak)
+            self.stats.observe_ns("generator_run_ns", time.perf_counter_ns() - started)
 
     @property
     def remain_count(self):
@@ -109,7 +269,7 @@ class MazeGenerator:
         Returns:
             int: Number of visited nodes.
         """
-        return len(self.__visited)
+        return self.__visited_count
 
     @property
     def visited(self):
@@ -117,16 +277,24 @@ class MazeGenerator:
         Returns a list of all visited node positions in the maze.
 
         Returns:
-            list: List of visited positions.
+            list: List of visited positions, in column order.
         """
-        return self.__visited
+        return [divmod(i, self.__height) for i, seen in enumerate(self.__visited) if seen]
 
     @property
     def has_next(self):
         """
         Indicates whether there are remaining nodes to be visited in the maze.
 
+        Generation goes on while positions are pending or the cursor itself still has unvisited neighbors. The
+        cursor check matters once the last pending position has been popped, as in a one cell wide maze where
+        cells with a single move are never pushed.
+
         Returns:
             bool: True if there are remaining nodes, False otherwise.
         """
-        return len(self.__remain_pos) > 0 or self.__first
+        if len(self.__remain_pos) > 0 or self.__first:
+            return True
+        # the cursor may still have moves after the last pending position was popped, e.g. in a one cell wide maze
+        x, y = self.cursor_pos
+        return len(self.get_possible_moves(self.maze[x][y])) > 0
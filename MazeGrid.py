@@ -0,0 +1,303 @@
+import numpy as np
+
+LEFT, TOP, RIGHT, BOTTOM = 1, 2, 4, 8
+ALL_WALLS = LEFT | TOP | RIGHT | BOTTOM
+
+# Same order as MazeNode.neighbors / MazeNode.walls: left, top, right, bottom.
+DIRECTIONS = (LEFT, TOP, RIGHT, BOTTOM)
+OFFSETS = ((-1, 0), (0, -1), (1, 0), (0, 1))
+OPPOSITE = {LEFT: RIGHT, TOP: BOTTOM, RIGHT: LEFT, BOTTOM: TOP}
+
+
+class MazeGrid:
+    """
+    Represents a maze as a NumPy uint8 array holding a 4-bit wall mask per cell.
+
+    The array is indexed as walls[x, y], like the list[list[MazeNode]] returned by the old new_maze, and
+    bit i of a cell is set when the wall towards neighbor i (left, top, right, bottom) is present.
+    Indexing the grid with maze[x][y] returns a MazeCell, a MazeNode-compatible view over the array.
+    """
+
+    def __init__(self, walls: np.ndarray):
+        """
+        Initializes the grid with an existing wall array.
+
+        Args:
+            walls (numpy.ndarray): A (width, height) uint8 array of wall masks.
+        """
+        self.walls = walls
+
+    @classmethod
+    def new(cls, maze_height, maze_width):
+        """
+        Creates a grid with the specified height and width where every wall is present.
+
+        Args:
+            maze_height (int): The height of the maze.
+            maze_width (int): The width of the maze.
+
+        Returns:
+            MazeGrid: The new grid.
+        """
+        return cls(np.full((maze_width, maze_height), ALL_WALLS, dtype=np.uint8))
+
+    @classmethod
+    def from_nodes(cls, maze):
+        """
+        Builds a grid from a maze of MazeNode objects.
+
+        Args:
+            maze (list[list[MazeNode]]): The maze to convert.
+
+        Returns:
+            MazeGrid: A grid with the same walls.
+        """
+        if isinstance(maze, MazeGrid):
+            return maze
+        walls = np.zeros((len(maze), len(maze[0])), dtype=np.uint8)
+        for x, line in enumerate(maze):
+            for y, node in enumerate(line):
+                walls[x, y] = sum(bit for bit, wall in zip(DIRECTIONS, node.walls) if wall)
+        return cls(walls)
+
+    @property
+    def width(self):
+        """
+        Returns the width of the maze.
+
+        Returns:
+            int: Number of columns.
+        """
+        return self.walls.shape[0]
+
+    @property
+    def height(self):
+        """
+        Returns the height of the maze.
+
+        Returns:
+            int: Number of rows.
+        """
+        return self.walls.shape[1]
+
+    def __len__(self):
+        return self.width
+
+    def __getitem__(self, x):
+        """
+        Returns a column of the maze, so that maze[x][y] works like the list based maze.
+
+        Args:
+            x (int): The column index.
+
+        Returns:
+            MazeColumn: A view over the column.
+        """
+        if not 0 <= x < self.width:
+            raise IndexError(f"column {x} out of range")
+        return MazeColumn(self, x)
+
+    def __iter__(self):
+        return (MazeColumn(self, x) for x in range(self.width))
+
+    def in_bounds(self, x, y):
+        """
+        Checks if a position is inside the maze.
+
+        Args:
+            x (int): The x-coordinate.
+            y (int): The y-coordinate.
+
+        Returns:
+            bool: True if the position is inside the maze.
+        """
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def check_pos(self, pos, name="position"):
+        """
+        Raises ValueError if a position is outside the maze, where its flat index x * height + y would silently
+        point at another cell.
+
+        Args:
+            pos (tuple): The position.
+            name (str, optional): How the error message refers to it. Defaults to "position".
+        """
+        if not self.in_bounds(*pos):
+            raise ValueError(f"{name} {tuple(pos)} is outside the {self.width}x{self.height} maze")
+
+    def sealed_walls(self):
+        """
+        Returns a copy of the wall array with every side on the outer border closed.
+
+        Searches step from cell to cell by flat index, so an open border side would lead into the next column or
+        off the array. Generated mazes are sealed already, unlike a region cut from a larger maze with seal=False
+        or a file written by another tool.
+
+        Returns:
+            numpy.ndarray: The (width, height) wall masks.
+        """
+        walls = self.walls.copy()
+        walls[0, :] |= LEFT
+        walls[-1, :] |= RIGHT
+        walls[:, 0] |= TOP
+        walls[:, -1] |= BOTTOM
+        return walls
+
+    def has_wall(self, x, y, direction):
+        """
+        Checks if a cell has a wall in the given direction.
+
+        Args:
+            x (int): The x-coordinate.
+            y (int): The y-coordinate.
+            direction (int): One of LEFT, TOP, RIGHT or BOTTOM.
+
+        Returns:
+            bool: True if the wall is present.
+        """
+        return bool(self.walls[x, y] & direction)
+
+    def set_wall(self, x, y, direction, wall):
+        """
+        Sets or removes a wall on both cells that share it.
+
+        Args:
+            x (int): The x-coordinate.
+            y (int): The y-coordinate.
+            direction (int): One of LEFT, TOP, RIGHT or BOTTOM.
+            wall (bool): True to place the wall, False to remove it.
+        """
+        dx, dy = OFFSETS[DIRECTIONS.index(direction)]
+        cells = [(x, y, direction)]
+        if self.in_bounds(x + dx, y + dy):
+            cells.append((x + dx, y + dy, OPPOSITE[direction]))
+        for cx, cy, bit in cells:
+            if wall:
+                self.walls[cx, cy] |= bit
+            else:
+                self.walls[cx, cy] &= ~bit & ALL_WALLS
+
+    def copy(self):
+        """
+        Returns a copy of the grid that does not share the wall array.
+
+        Returns:
+            MazeGrid: The copied grid.
+        """
+        return MazeGrid(self.walls.copy())
+
+
+class MazeColumn:
+    """
+    A single column of a MazeGrid, returned by maze[x].
+    """
+    __slots__ = ("grid", "x")
+
+    def __init__(self, grid: MazeGrid, x):
+        self.grid = grid
+        self.x = x
+
+    def __len__(self):
+        return self.grid.height
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.grid.height:
+            raise IndexError(f"row {y} out of range")
+        return MazeCell(self.grid, (self.x, y))
+
+    def __iter__(self):
+        return (MazeCell(self.grid, (self.x, y)) for y in range(self.grid.height))
+
+
+class MazeCell:
+    """
+    A MazeNode-compatible view of one cell of a MazeGrid.
+
+    Neighbors are fixed by the grid geometry, so the direction setters only change the wall status.
+    """
+    __slots__ = ("grid", "pos")
+
+    def __init__(self, grid: MazeGrid, pos):
+        self.grid = grid
+        self.pos = pos
+
+    def __eq__(self, other):
+        return isinstance(other, MazeCell) and other.grid is self.grid and other.pos == self.pos
+
+    def __hash__(self):
+        return hash(self.pos)
+
+    def __iter__(self):
+        """
+        Returns an iterator over the cell's neighbors and corresponding wall status.
+
+        Yields:
+            tuple: A pair containing a neighbor and its wall status.
+        """
+        return iter(zip(self.neighbors, self.walls))
+
+    def __str__(self):
+        directions = ["Left", "Top", "Right", "bottom"]
+        output = [f"Pos={self.pos}"]
+        for i, (neighbor, wall) in enumerate(self):
+            output.append(
+                f"{directions[i]}: Neighbor={neighbor.pos if neighbor else 'None'}, Wall={'Yes' if wall else 'No'}")
+        return "\n".join(output)
+
+    def neighbor(self, direction):
+        """
+        Returns the neighbor in the given direction.
+
+        Args:
+            direction (int): One of LEFT, TOP, RIGHT or BOTTOM.
+
+        Returns:
+            MazeCell: The neighbor, or None on the maze border.
+        """
+        dx, dy = OFFSETS[DIRECTIONS.index(direction)]
+        x, y = self.pos[0] + dx, self.pos[1] + dy
+        return MazeCell(self.grid, (x, y)) if self.grid.in_bounds(x, y) else None
+
+    @property
+    def neighbors(self):
+        return [self.neighbor(direction) for direction in DIRECTIONS]
+
+    @property
+    def walls(self):
+        mask = int(self.grid.walls[self.pos])
+        return [bool(mask & direction) for direction in DIRECTIONS]
+
+    def __side(self, direction):
+        return self.neighbor(direction), self.grid.has_wall(self.pos[0], self.pos[1], direction)
+
+    @property
+    def left(self):
+        return self.__side(LEFT)
+
+    @left.setter
+    def left(self, new_neighbor):
+        self.grid.set_wall(self.pos[0], self.pos[1], LEFT, new_neighbor[1])
+
+    @property
+    def top(self):
+        return self.__side(TOP)
+
+    @top.setter
+    def top(self, new_neighbor):
+        self.grid.set_wall(self.pos[0], self.pos[1], TOP, new_neighbor[1])
+
+    @property
+    def right(self):
+        return self.__side(RIGHT)
+
+    @right.setter
+    def right(self, new_neighbor):
+        self.grid.set_wall(self.pos[0], self.pos[1], RIGHT, new_neighbor[1])
+
+    @property
+    def bottom(self):
+        return self.__side(BOTTOM)
+
+    @bottom.setter
+    def bottom(self, new_neighbor):
+        self.grid.set_wall(self.pos[0], self.pos[1], BOTTOM, new_neighbor[1])
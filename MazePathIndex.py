@@ -0,0 +1,159 @@
+from collections import deque
+
+import numpy as np
+
+from MazeGrid import MazeGrid, DIRECTIONS
+
+
+class MazePathIndex:
+    """
+    Answers path queries between any two cells of a perfect maze without searching it again.
+
+    A perfect maze is a spanning tree, so the index roots it once and keeps the parent and depth of every cell
+    plus binary lifting tables for lowest common ancestor queries. Path lengths are answered in O(log n) and
+    paths are extracted in O(path length). The lifting tables take depth.bit_length() int32 arrays of the maze
+    size.
+    """
+
+    def __init__(self, maze, root=(0, 0)):
+        """
+        Builds the index for a maze.
+
+        Args:
+            maze (MazeGrid | list[list[MazeNode]]): A perfect maze, every cell reachable by exactly one path.
+            root (tuple): The cell the tree is rooted at (default (0, 0)).
+
+        Raises:
+            ValueError: If root is outside the maze, or the maze has loops or unreachable cells.
+        """
+        grid = MazeGrid.from_nodes(maze)
+        grid.check_pos(root, "root")
+        height = grid.height
+        size = grid.width * height
+        # closed on the border so that no move leaves the grid
+        walls = grid.sealed_walls().tobytes()
+        self.__grid = grid
+        self.__height = height
+
+        parent = np.empty(size, dtype=np.int32)
+        depth = np.full(size, -1, dtype=np.int32)
+        parent_view, depth_view = memoryview(parent), memoryview(depth)
+        start = root[0] * height + root[1]
+        parent_view[start], depth_view[start] = start, 0
+        deltas = tuple(zip(DIRECTIONS, (-height, -1, height, 1)))
+        queue = deque([start])
+        reached = 1
+        while queue:
+            index = queue.popleft()
+            next_depth = depth_view[index] + 1
+            mask = walls[index]
+            for direction, delta in deltas:
+                if mask & direction:
+                    continue
+                neighbor = index + delta
+                if depth_view[neighbor] >= 0:
+                    if neighbor != parent_view[index]:
+                        raise ValueError("maze has loops, it is not a perfect maze")
+                    continue
+                parent_view[neighbor], depth_view[neighbor] = index, next_depth
+                queue.append(neighbor)
+                reached += 1
+        if reached != size:
+            raise ValueError(f"{size - reached} cells are unreachable from {root}, it is not a perfect maze")
+
+        levels = max(1, int(depth.max()).bit_length())
+        up = np.empty((levels, size), dtype=np.int32)
+        up[0] = parent
+        for level in range(1, levels):
+            up[level] = up[level - 1][up[level - 1]]
+
+        self.root = root
+        self.parent = parent
+        self.depth = depth
+        self.up = up
+        self.__parent = parent_view
+        self.__depth = depth_view
+        self.__up = [memoryview(row) for row in up]
+
+    def __index(self, pos, name):
+        self.__grid.check_pos(pos, name)
+        return pos[0] * self.__height + pos[1]
+
+    def __lca(self, a, b):
+        depth, up = self.__depth, self.__up
+        if depth[a] < depth[b]:
+            a, b = b, a
+        diff = depth[a] - depth[b]
+        level = 0
+        while diff:
+            if diff & 1:
+                a = up[level][a]
+            diff >>= 1
+            level += 1
+        if a == b:
+            return a
+        for level in range(len(up) - 1, -1, -1):
+            if up[level][a] != up[level][b]:
+                a, b = up[level][a], up[level][b]
+        return up[0][a]
+
+    def lca(self, a, b):
+        """
+        Returns the lowest common ancestor of two cells in the rooted maze tree.
+
+        Args:
+            a (tuple): The first position.
+            b (tuple): The second position.
+
+        Returns:
+            tuple: The position where the paths from a and b to the root join.
+
+        Raises:
+            ValueError: If a or b is outside the maze.
+        """
+        return divmod(self.__lca(self.__index(a, "a"), self.__index(b, "b")), self.__height)
+
+    def distance(self, start_pos, end_pos):
+        """
+        Returns the number of moves on the path between two cells.
+
+        Args:
+            start_pos (tuple): Starting position.
+            end_pos (tuple): Ending position.
+
+        Returns:
+            int: The path length in moves.
+
+        Raises:
+            ValueError: If start_pos or end_pos is outside the maze.
+        """
+        a, b = self.__index(start_pos, "start_pos"), self.__index(end_pos, "end_pos")
+        return self.__depth[a] + self.__depth[b] - 2 * self.__depth[self.__lca(a, b)]
+
+    def path(self, start_pos, end_pos):
+        """
+        Returns the path between two cells.
+
+        Args:
+            start_pos (tuple): Starting position.
+            end_pos (tuple): Ending position.
+
+        Returns:
+            list: List of positions from start_pos to end_pos, both included.
+
+        Raises:
+            ValueError: If start_pos or end_pos is outside the maze.
+        """
+        a, b = self.__index(start_pos, "start_pos"), self.__index(end_pos, "end_pos")
+        meet = self.__lca(a, b)
+        parent, height = self.__parent, self.__height
+        head, tail = [], []
+        while a != meet:
+            head.append(divmod(a, height))
+            a = parent[a]
+        while b != meet:
+            tail.append(divmod(b, height))
+            b = parent[b]
+        head.append(divmod(meet, height))
+        head.extend(reversed(tail))
+        return head
@@ -1,64 +1,358 @@
-import math
-import random
+import heapq
+import time
+from array import array
+from collections import deque
+
+import maze_jit
+from MazeGrid import MazeGrid, DIRECTIONS
+from maze_events import PathPush, PathPop, batched
 from MazeNode import MazeNode
 
+ALGORITHMS = ("astar", "bfs")
+
+
+def _manhattan(height, target):
+    """
+    Returns a function giving the Manhattan distance from a cell index to target, the A* heuristic.
+    """
+    target_x, target_y = target
+
+    def distance(index):
+        x, y = divmod(index, height)
+        return abs(x - target_x) + abs(y - target_y)
+
+    return distance
+
+
+class _SearchFront:
+    """
+    One breadth-first or A* search of a MazeGrid, expanded a cell at a time, keeping the path to the last expanded
+    cell up to date. Every solver in this module runs one or more of them. The solve methods of MazeSolver and
+    BidirectionalSolver inline the expansion over the same arrays instead, as a method call per cell makes them up
+    to half again slower.
+    """
+
+    def __init__(self, grid, root_pos, heuristic=None, path_index=0):
+        """
+        Initializes the search at a root cell.
+
+        Args:
+            grid (MazeGrid): The maze.
+            root_pos (tuple): Where the search starts.
+            heuristic (callable, optional): Lower bound of the remaining distance from a cell index, for A*.
+                Defaults to None, a breadth-first search.
+            path_index (int, optional): The path value of the emitted PathPush and PathPop events. Defaults to 0.
+
+        Raises:
+            ValueError: If root_pos is outside the maze.
+        """
+        grid.check_pos(root_pos, "root_pos")
+        self.height = grid.height
+        # closed on the border so that no move leaves the grid
+        self.walls = grid.sealed_walls().tobytes()
+        size = grid.width * self.height
+        self.closed = bytearray(size)
+        self.parent = array("i", bytes(4 * size))
+        self.depth = array("i", [-1]) * size
+        self.heuristic = heuristic
+        self.path_index = path_index
+        self.path = [root_pos]
+        self.deltas = tuple(zip(DIRECTIONS, (-self.height, -1, self.height, 1)))
+        self.counter = 0
+        root = self.index(root_pos)
+        self.depth[root] = 0
+        self.frontier = deque([root]) if heuristic is None else [(heuristic(root), 0, root)]
+
+    def index(self, pos):
+        return pos[0] * self.height + pos[1]
+
+    def top(self):
+        """
+        Returns the smallest key of the frontier, the depth for BFS or the depth plus the heuristic for A*.
+
+        Returns:
+            int: The key, or None if the frontier is exhausted.
+        """
+        frontier = self.frontier
+        if self.heuristic is None:
+            return self.depth[frontier[0]] if frontier else None
+        while frontier and self.closed[frontier[0][2]]:
+            heapq.heappop(frontier)
+        return frontier[0][0] if frontier else None
+
+    def pop(self):
+        """
+        Removes the next cell to expand from the frontier.
+
+        Returns:
+            int: The cell index, or None if the frontier is exhausted.
+        """
+        frontier = self.frontier
+        while frontier:
+            index = frontier.popleft() if self.heuristic is None else heapq.heappop(frontier)[2]
+            if not self.closed[index]:
+                return index
+        return None
+
+    def expand(self, index):
+        """
+        Closes a cell and pushes the neighbors it gives a shorter path to.
+
+        Returns:
+            list: The indexes of every cell reachable from the given one without crossing a wall.
+        """
+        closed, depth, parent, frontier, heuristic = self.closed, self.depth, self.parent, self.frontier, self.heuristic
+        closed[index] = 1
+        next_depth = depth[index] + 1
+        mask = self.walls[index]
+        neighbors = []
+        for direction, delta in self.deltas:
+            if mask & direction:
+                continue
+            neighbor = index + delta
+            neighbors.append(neighbor)
+            if closed[neighbor] or 0 <= depth[neighbor] <= next_depth:
+                continue
+            depth[neighbor] = next_depth
+            parent[neighbor] = index
+            if heuristic is None:
+                frontier.append(neighbor)
+            else:
+                self.counter += 1
+                heapq.heappush(frontier, (next_depth + heuristic(neighbor), self.counter, neighbor))
+        return neighbors
+
+    def search(self, targets, count=1):
+        """
+        Expands cells until count of the targets are reached or the frontier is exhausted, the one-shot loop of
+        the solvers' solve methods. The last target reached is closed but not expanded.
+
+        Args:
+            targets (set): The target cell indexes.
+            count (int, optional): How many targets to reach. Defaults to 1.
+
+        Returns:
+            tuple[list, int, int]: The targets reached, in order, the last cell expanded or None, and the number
+                of cells expanded.
+        """
+        pop, expand, closed = self.pop, self.expand, self.closed
+        reached, index, expanded = [], None, 0
+        while len(reached) < count:
+            next_index = pop()
+            if next_index is None:
+                break
+            index = next_index
+            expanded += 1
+            if index in targets:
+                reached.append(index)
+                if len(reached) == count:
+                    closed[index] = 1
+                    break
+            expand(index)
+        return reached, index, expanded
+
+    def follow(self, index):
+        """
+        Updates the path list in place so it leads to the given cell.
+
+        Only the cells that differ from the previous path are popped and pushed, walking the parent pointers
+        up from the new cell until it joins the old path.
+
+        Returns:
+            list: The PathPop and PathPush events, in order.
+        """
+        path, height = self.path, self.height
+        branch = []
+        depth = self.depth[index]
+        while depth >= len(path) or self.index(path[depth]) != index:
+            branch.append(divmod(index, height))
+            index = self.parent[index]
+            depth -= 1
+        events = [PathPop(pos, self.path_index) for pos in reversed(path[depth + 1:])]
+        del path[depth + 1:]
+        branch.reverse()
+        path.extend(branch)
+        events.extend(PathPush(pos, self.path_index) for pos in branch)
+        return events
+
+    def path_to(self, index):
+        """
+        Returns the positions from the root to a reached cell, following the parent pointers.
+        """
+        positions = [divmod(index, self.height)]
+        for _ in range(self.depth[index]):
+            index = self.parent[index]
+            positions.append(divmod(index, self.height))
+        positions.reverse()
+        return positions
+
 
 class MazeSolver:
     """
     Solves a maze by navigating from a starting position to an end position.
     """
-    def __init__(self, i_maze: list[list[MazeNode]], start_pos=(0, 0), end_pos=(10, 10)):
+    def __init__(self, i_maze: list[list[MazeNode]], start_pos=(0, 0), end_pos=(10, 10), algorithm="astar",
+                 stats=None):
         """
         Initializes the maze solver with a maze layout, start position, and end position.
 
         Args:
-            i_maze (list[list[MazeNode]]): The maze represented as a grid of MazeNode objects.
+            i_maze (list[list[MazeNode]]): The maze represented as a grid of MazeNode objects, or a MazeGrid.
             start_pos (tuple): Starting position in the maze (default (0, 0)).
             end_pos (tuple): Ending position in the maze (default (10, 10)).
+            algorithm (str): "astar" for A* with a Manhattan heuristic, or "bfs" for breadth-first search.
+                Both return a shortest path (default "astar").
+            stats (MazeStats): Collects step counts and timings when given. Default None measures nothing.
         """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"unknown algorithm {algorithm!r}, expected one of {', '.join(ALGORITHMS)}")
         self.maze = i_maze
         self.start_pos = start_pos
         self.end_pos = end_pos
+        self.algorithm = algorithm
+        self.stats = stats
         self.__current_pos = start_pos
         self.__path = [start_pos]
-        self.__blocked = []
+        self.__grid = None
+        self.__front = None
+        self.__finished = self.__found = start_pos == end_pos
 
-    def next_step(self):
+    def __setup(self):
         """
-        Advances to the next step in the maze by exploring adjacent nodes from the current position.
+        Reads the wall masks and creates the search state on the first step, after the maze has been generated.
 
-        This method uses a greedy approach, selecting the nearest from end unvisited node that does not lead back to the start position.
+        Raises:
+            ValueError: If start_pos or end_pos is outside the maze.
+        """
+        self.__grid = MazeGrid.from_nodes(self.maze)
+        self.__grid.check_pos(self.start_pos, "start_pos")
+        self.__grid.check_pos(self.end_pos, "end_pos")
+        heuristic = _manhattan(self.__grid.height, self.end_pos) if self.algorithm == "astar" else None
+        self.__front = _SearchFront(self.__grid, self.start_pos, heuristic)
+        # the search updates the same list the path property returned before the first step
+        self.__front.path = self.__path
 
-        If no such node is found, the solver will backtrack and try another path.
+    def next_step(self):
         """
-        if self.has_next:
-            x, y = self.__current_pos
-            current_node = self.maze[x][y]
-            nodes: list = [current_node.top, current_node.bottom, current_node.left, current_node.right]
-            nodes = sorted([node for node in nodes if node[0] is not None], key=self.get_distance)
+        Advances the search by expanding the next cell of the frontier.
 
-            for node in nodes:
-                if self.check_node(node[0], node[1]):
-                    self.__path.append(node[0].pos)
-                    self.__current_pos = node[0].pos
-                    return
+        The path property follows the cell being expanded, so rendering it shows the search moving through the
+        maze. Once the end position is expanded, the path is a shortest path between start and end.
 
-            self.__blocked.append(self.__current_pos)
-            self.__path.pop()
+        Returns:
+            list: The PathPop and PathPush events of the step, in order.
+        """
+        if not self.has_next:
+            return []
+        if self.stats is not None:
+            started = time.perf_counter_ns()
+        if self.__front is None:
+            self.__setup()
+
+        front = self.__front
+        index = front.pop()
+        if index is None:
+            self.__finished = True
+            events = []
+        else:
+            events = front.follow(index)
             self.__current_pos = self.__path[-1]
+            if self.__current_pos == self.end_pos:
+                front.closed[index] = 1
+                self.__finished = self.__found = True
+            else:
+                front.expand(index)
 
-    def check_node(self, node: MazeNode, has_wall: bool):
+        if self.stats is not None:
+            self.stats.count("solver_steps")
+            self.stats.count("solver_expanded", index is not None)
+            self.stats.count("solver_neighbor_checks", 4 * (index is not None))
+            self.stats.count("solver_path_events", len(events))
+            self.stats.high_water("solver_frontier", len(front.frontier))
+            self.stats.observe_ns("solver_step_ns", time.perf_counter_ns() - started)
+        return events
+
+    def steps(self, batch_size=None):
         """
-        Checks if a node is traversable and not yet visited.
+        Runs the search step by step, yielding the changes to the path.
 
         Args:
-            node (MazeNode): The node to check.
-            has_wall (bool): Indicates if the path to this node is blocked by a wall.
+            batch_size (int, optional): If given, yields lists of up to batch_size events instead. Defaults to None.
+
+        Yields:
+            PathPush | PathPop: One event per changed path position, or lists of them when batch_size is given.
+        """
+        events = (event for _ in iter(lambda: self.has_next, False) for event in self.next_step())
+        return events if batch_size is None else batched(events, batch_size)
+
+    def solve(self):
+        """
+        Runs the search to completion in one go, skipping the path updates of every intermediate step. Large mazes
+        are searched by the compiled kernel of maze_jit when Numba is installed.
 
         Returns:
-            bool: True if the node is open for traversal, False otherwise.
+            list: The shortest path from start to end, or an empty list if the end can't be reached.
         """
-        return node and not has_wall and node.pos not in self.__path and node.pos not in self.__blocked
+        started = time.perf_counter_ns()
+        if self.__front is None:
+            self.__setup()
+        front = self.__front
+        walls, deltas, height = front.walls, front.deltas, front.height
+        closed, parent, depth, frontier = front.closed, front.parent, front.depth, front.frontier
+        astar = self.algorithm == "astar"
+        end = front.index(self.end_pos)
+        end_x, end_y = self.end_pos
+        counter = front.counter
+        heappop, heappush = heapq.heappop, heapq.heappush
+
+        # the kernel's A* heap keys hold the counter in 32 bits, and each expansion pushes at most 4 cells
+        compiled = maze_jit.use_jit(len(closed)) and counter + 4 * len(closed) < 1 << 32
+        index, expanded = None, 0
+        if not self.__finished and compiled:
+            index, found, expanded, counter = maze_jit.search(walls, height, closed, parent, depth, frontier,
+                                                              astar, counter, self.end_pos)
+            self.__finished, self.__found = True, found
+        while not self.__finished:
+            if not frontier:
+                self.__finished = True
+                break
+            index = heappop(frontier)[2] if astar else frontier.popleft()
+            if closed[index]:
+                continue
+            closed[index] = 1
+            expanded += 1
+            if index == end:
+                self.__finished = self.__found = True
+                break
+            next_depth = depth[index] + 1
+            mask = walls[index]
+            for direction, delta in deltas:
+                if mask & direction:
+                    continue
+                neighbor = index + delta
+                if closed[neighbor] or 0 <= depth[neighbor] <= next_depth:
+                    continue
+                depth[neighbor] = next_depth
+                parent[neighbor] = index
+                if astar:
+                    counter += 1
+                    x, y = divmod(neighbor, height)
+                    heappush(frontier, (next_depth + abs(x - end_x) + abs(y - end_y), counter, neighbor))
+                else:
+                    frontier.append(neighbor)
+        front.counter = counter
+
+        if index is not None:
+            if compiled:
+                self.__path[:] = maze_jit.trace_path(parent, depth, index, height)
+            else:
+                front.follow(index)
+            self.__current_pos = self.__path[-1]
+        if self.stats is not None:
+            self.stats.count("solver_expanded", expanded)
+            self.stats.count("solver_neighbor_checks", 4 * expanded)
+            self.stats.observe_ns("solver_solve_ns", time.perf_counter_ns() - started)
+        return self.__path if self.__found else []
 
     @property
     def path(self):
@@ -66,22 +360,519 @@ class MazeSolver:
         Returns the path taken through the maze.
 
         Returns:
-            list: List of positions visited in the maze.
+            list: List of positions from the start to the cell being expanded.
         """
         return self.__path
 
+    @property
+    def paths(self):
+        """
+        Returns the paths to draw, see draw_path.
+
+        Returns:
+            list: The path as the only element.
+        """
+        return [self.__path]
+
     @property
     def has_next(self):
         """
         Indicates if there are remaining steps to reach the end position.
 
         Returns:
-            bool: True if the current position is not the end position, False otherwise.
+            bool: True while the end position has not been reached and cells remain to be expanded.
+        """
+        return not self.__finished and self.__current_pos != self.end_pos
+
+    @property
+    def found(self):
+        """
+        Indicates if the search reached the end position.
+
+        Returns:
+            bool: True if a path to the end position was found.
+        """
+        return self.__found
+
+
+class BidirectionalSolver:
+    """
+    Solves a maze with two searches, one from the start and one from the end, that stop once they meet.
+
+    Each step expands a cell from the side with the smaller frontier. Whenever a cell reached by one side is next
+    to a cell reached by the other, the path through both is a candidate, and the search stops once neither
+    frontier can lead to a shorter one. On a maze where the search spreads in every direction this explores about
+    half the cells a single MazeSolver would.
+    """
+
+    def __init__(self, i_maze: list[list[MazeNode]], start_pos=(0, 0), end_pos=(10, 10), algorithm="astar",
+                 stats=None):
+        """
+        Initializes the solver, see MazeSolver.
+
+        Args:
+            i_maze (list[list[MazeNode]]): The maze represented as a grid of MazeNode objects, or a MazeGrid.
+            start_pos (tuple): Starting position in the maze (default (0, 0)).
+            end_pos (tuple): Ending position in the maze (default (10, 10)).
+            algorithm (str): "astar" or "bfs", used by both sides. The A* sides are guided by the Manhattan
+                distances to both ends (default "astar").
+            stats (MazeStats): Collects step counts and timings when given. Default None measures nothing.
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"unknown algorithm {algorithm!r}, expected one of {', '.join(ALGORITHMS)}")
+        self.maze = i_maze
+        self.start_pos = start_pos
+        self.end_pos = end_pos
+        self.algorithm = algorithm
+        self.stats = stats
+        self.__fronts = None
+        self.__best = None
+        self.__meeting = None
+        self.__finished = self.__found = start_pos == end_pos
+        self.__paths = [[start_pos], [] if self.__found else [end_pos]]
+        self.__path = [start_pos] if self.__found else []
+
+    def __setup(self):
+        grid = MazeGrid.from_nodes(self.maze)
+        grid.check_pos(self.start_pos, "start_pos")
+        grid.check_pos(self.end_pos, "end_pos")
+        heuristics = (None, None)
+        if self.algorithm == "astar":
+            heuristics = (self.__potential(grid.height, self.end_pos, self.start_pos),
+                          self.__potential(grid.height, self.start_pos, self.end_pos))
+        self.__fronts = (_SearchFront(grid, self.start_pos, heuristics[0], 0),
+                         _SearchFront(grid, self.end_pos, heuristics[1], 1))
+        self.__paths = [front.path for front in self.__fronts]
+
+    @staticmethod
+    def __potential(height, target, root):
+        """
+        Returns the A* heuristic of one side, half the difference of the Manhattan distances to its target and
+        to its own root. Both sides then agree on the length of every path, so they can stop on the same test as
+        breadth-first searches instead of overshooting each other.
+        """
+        target_x, target_y = target
+        root_x, root_y = root
+
+        def potential(index):
+            x, y = divmod(index, height)
+            return (abs(x - target_x) + abs(y - target_y) - abs(x - root_x) - abs(y - root_y)) / 2
+
+        return potential
+
+    def __done(self):
+        """
+        Indicates if no shorter path than the best meeting found so far can remain.
+        """
+        forward_top, backward_top = self.__fronts[0].top(), self.__fronts[1].top()
+        if forward_top is None or backward_top is None:
+            return True
+        return self.__best is not None and forward_top + backward_top >= self.__best
+
+    def __expand(self):
+        """
+        Expands the next cell of the side with the smaller frontier, recording the shortest meeting.
+
+        Returns:
+            tuple[_SearchFront, int]: The side and the expanded cell.
+        """
+        forward, backward = self.__fronts
+        side = 0 if len(forward.frontier) <= len(backward.frontier) else 1
+        front, other = (forward, backward) if side == 0 else (backward, forward)
+        index = front.pop()
+        for neighbor in front.expand(index):
+            if other.depth[neighbor] < 0:
+                continue
+            length = front.depth[index] + 1 + other.depth[neighbor]
+            if self.__best is None or length < self.__best:
+                self.__best = length
+                self.__meeting = (index, neighbor) if side == 0 else (neighbor, index)
+        return front, index
+
+    def __finish(self):
+        """
+        Ends the search, pointing both paths at the meeting cells.
+
+        Returns:
+            list: The PathPop and PathPush events of both paths.
         """
-        return self.__current_pos != self.end_pos
+        self.__finished = True
+        if self.__meeting is None:
+            return []
+        self.__found = True
+        events = []
+        for front, index in zip(self.__fronts, self.__meeting):
+            events.extend(front.follow(index))
+        forward, backward = self.__paths
+        self.__path = forward + backward[::-1]
+        return events
+
+    def next_step(self):
+        """
+        Advances the search by expanding one cell of either side.
+
+        The paths property follows the cell each side expanded last, so drawing it shows both searches moving
+        through the maze. The last step joins them at the meeting point.
 
-    def get_distance(self, node: tuple[MazeNode, bool]):
-        x1, y1 = self.end_pos
-        x2, y2 = node[0].pos
-        return math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+        Returns:
+            list: The PathPop and PathPush events of the step, in order, their path being 0 for the side from the
+                start and 1 for the side from the end.
+        """
+        if not self.has_next:
+            return []
+        if self.stats is not None:
+            started = time.perf_counter_ns()
+        if self.__fronts is None:
+            self.__setup()
+
+        if self.__done():
+            events = self.__finish()
+        else:
+            front, index = self.__expand()
+            events = front.follow(index)
+
+        if self.stats is not None:
+            self.stats.count("solver_steps")
+            self.stats.count("solver_expanded", not self.__finished)
+            self.stats.count("solver_path_events", len(events))
+            self.stats.high_water("solver_frontier", sum(len(front.frontier) for front in self.__fronts))
+            self.stats.observe_ns("solver_step_ns", time.perf_counter_ns() - started)
+        return events
+
+    def steps(self, batch_size=None):
+        """
+        Runs the search step by step, yielding the changes to both paths, see MazeSolver.steps.
+        """
+        events = (event for _ in iter(lambda: self.has_next, False) for event in self.next_step())
+        return events if batch_size is None else batched(events, batch_size)
 
+    def solve(self):
+        """
+        Runs the search to completion in one go, skipping the path updates of every intermediate step. Large mazes
+        are searched by the compiled kernel of maze_jit when Numba is installed.
+
+        Returns:
+            list: The shortest path from start to end, or an empty list if the end can't be reached.
+        """
+        started = time.perf_counter_ns()
+        if self.__finished:
+            return self.__path
+        if self.__fronts is None:
+            self.__setup()
+        forward, backward = self.__fronts
+        walls, deltas, height = forward.walls, forward.deltas, forward.height
+        astar = self.algorithm == "astar"
+        best, meeting = self.__best, self.__meeting
+        size = len(walls)
+
+        # the kernel's A* heap keys hold each side's counter in 32 bits, see MazeSolver.solve
+        if maze_jit.use_jit(size) and max(forward.counter, backward.counter) + 4 * size < 1 << 32:
+            sides = tuple((front.closed, front.parent, front.depth, front.frontier, front.counter)
+                          for front in self.__fronts)
+            best, meeting, expanded, forward.counter, backward.counter = maze_jit.meet(
+                walls, height, sides, astar, self.start_pos, self.end_pos, best, meeting)
+        else:
+            # per side: the search, the other one, and the target and root of its potential
+            sides = ((forward, backward, self.end_pos, self.start_pos),
+                     (backward, forward, self.start_pos, self.end_pos))
+            heappop, heappush = heapq.heappop, heapq.heappush
+            expanded = 0
+            while True:
+                forward_frontier, backward_frontier = forward.frontier, backward.frontier
+                if astar:
+                    while forward_frontier and forward.closed[forward_frontier[0][2]]:
+                        heappop(forward_frontier)
+                    while backward_frontier and backward.closed[backward_frontier[0][2]]:
+                        heappop(backward_frontier)
+                    if not forward_frontier or not backward_frontier:
+                        break
+                    if best is not None and forward_frontier[0][0] + backward_frontier[0][0] >= best:
+                        break
+                else:
+                    if not forward_frontier or not backward_frontier:
+                        break
+                    if best is not None and \
+                            forward.depth[forward_frontier[0]] + backward.depth[backward_frontier[0]] >= best:
+                        break
+
+                side = 0 if len(forward_frontier) <= len(backward_frontier) else 1
+                front, other, (target_x, target_y), (root_x, root_y) = sides[side]
+                frontier, closed, depth, parent, other_depth = \
+                    front.frontier, front.closed, front.depth, front.parent, other.depth
+                index = heappop(frontier)[2] if astar else frontier.popleft()
+                closed[index] = 1
+                expanded += 1
+                next_depth = depth[index] + 1
+                mask = walls[index]
+                for direction, delta in deltas:
+                    if mask & direction:
+                        continue
+                    neighbor = index + delta
+                    if other_depth[neighbor] >= 0 and (best is None or next_depth + other_depth[neighbor] < best):
+                        best = next_depth + other_depth[neighbor]
+                        meeting = (index, neighbor) if side == 0 else (neighbor, index)
+                    if closed[neighbor] or 0 <= depth[neighbor] <= next_depth:
+                        continue
+                    depth[neighbor] = next_depth
+                    parent[neighbor] = index
+                    if astar:
+                        front.counter += 1
+                        x, y = divmod(neighbor, height)
+                        potential = (abs(x - target_x) + abs(y - target_y) - abs(x - root_x) - abs(y - root_y)) / 2
+                        heappush(frontier, (next_depth + potential, front.counter, neighbor))
+                    else:
+                        frontier.append(neighbor)
+        self.__best, self.__meeting = best, meeting
+
+        self.__finish()
+        if self.stats is not None:
+            self.stats.count("solver_expanded", expanded)
+            self.stats.observe_ns("solver_solve_ns", time.perf_counter_ns() - started)
+        return self.__path
+
+    @property
+    def path(self):
+        """
+        Returns the shortest path once found, otherwise the path of the side searching from the start.
+
+        Returns:
+            list: List of positions from the start.
+        """
+        return self.__path if self.__found else self.__paths[0]
+
+    @property
+    def paths(self):
+        """
+        Returns the paths of both sides, see draw_path.
+
+        Returns:
+            list: The path from the start to the cell its side expanded last, and the one from the end. Once the
+                end is found, together they make the shortest path.
+        """
+        return self.__paths
+
+    @property
+    def has_next(self):
+        """
+        Indicates if the search is still running.
+
+        Returns:
+            bool: True until both sides met or one ran out of cells.
+        """
+        return not self.__finished
+
+    @property
+    def found(self):
+        """
+        Indicates if the search reached the end position.
+
+        Returns:
+            bool: True if a path to the end position was found.
+        """
+        return self.__found
+
+
+class MultiTargetSolver:
+    """
+    Searches from a start position towards many targets at once, sharing a single frontier.
+
+    By default the search stops at the nearest target. With all_targets it goes on until every target is reached,
+    giving the distance to each of them from one search instead of one MazeSolver per target.
+    """
+
+    def __init__(self, i_maze: list[list[MazeNode]], start_pos=(0, 0), targets=((10, 10),), algorithm="bfs",
+                 all_targets=False, stats=None):
+        """
+        Initializes the solver.
+
+        Args:
+            i_maze (list[list[MazeNode]]): The maze represented as a grid of MazeNode objects, or a MazeGrid.
+            start_pos (tuple): Starting position in the maze (default (0, 0)).
+            targets (iterable): The positions to search for (default ((10, 10),)).
+            algorithm (str): "bfs", or "astar" guided by the Manhattan distance to the nearest target, which costs
+                a pass over the targets for every pushed cell. A* only applies when searching for the nearest
+                target, with all_targets the search is breadth-first (default "bfs").
+            all_targets (bool): Keep searching until every target is reached (default False).
+            stats (MazeStats): Collects step counts and timings when given. Default None measures nothing.
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"unknown algorithm {algorithm!r}, expected one of {', '.join(ALGORITHMS)}")
+        self.maze = i_maze
+        self.start_pos = start_pos
+        self.targets = list(dict.fromkeys(targets))
+        self.algorithm = algorithm
+        self.all_targets = all_targets
+        self.stats = stats
+        self.__front = None
+        self.__path = [start_pos]
+        self.__distances = {}
+        self.__finished = not self.targets
+
+    def __setup(self):
+        grid = MazeGrid.from_nodes(self.maze)
+        grid.check_pos(self.start_pos, "start_pos")
+        for target in self.targets:
+            grid.check_pos(target, "target")
+        heuristic = None
+        if self.algorithm == "astar" and not self.all_targets:
+            height, targets = grid.height, self.targets
+
+            def heuristic(index):
+                x, y = divmod(index, height)
+                return min(abs(x - target_x) + abs(y - target_y) for target_x, target_y in targets)
+
+        self.__front = _SearchFront(grid, self.start_pos, heuristic)
+        self.__front.path = self.__path
+        self.__target_indexes = {self.__front.index(pos) for pos in self.targets}
+
+    def __expand(self):
+        """
+        Expands the next cell, recording it when it is a target.
+
+        Returns:
+            int: The cell index, or None once the search is over.
+        """
+        front = self.__front
+        index = front.pop()
+        if index is None:
+            self.__finished = True
+            return None
+        front.expand(index)
+        if index in self.__target_indexes:
+            self.__distances[divmod(index, front.height)] = front.depth[index]
+            if not self.all_targets or len(self.__distances) == len(self.targets):
+                self.__finished = True
+        return index
+
+    def next_step(self):
+        """
+        Advances the search by expanding the next cell of the frontier, see MazeSolver.next_step.
+
+        Returns:
+            list: The PathPop and PathPush events of the step, in order.
+        """
+        if not self.has_next:
+            return []
+        if self.stats is not None:
+            started = time.perf_counter_ns()
+        if self.__front is None:
+            self.__setup()
+
+        index = self.__expand()
+        events = [] if index is None else self.__front.follow(index)
+
+        if self.stats is not None:
+            self.stats.count("solver_steps")
+            self.stats.count("solver_expanded", index is not None)
+            self.stats.count("solver_path_events", len(events))
+            self.stats.high_water("solver_frontier", len(self.__front.frontier))
+            self.stats.observe_ns("solver_step_ns", time.perf_counter_ns() - started)
+        return events
+
+    def steps(self, batch_size=None):
+        """
+        Runs the search step by step, yielding the changes to the path, see MazeSolver.steps.
+        """
+        events = (event for _ in iter(lambda: self.has_next, False) for event in self.next_step())
+        return events if batch_size is None else batched(events, batch_size)
+
+    def solve(self):
+        """
+        Runs the search to completion in one go, skipping the path updates of every intermediate step.
+
+        Returns:
+            list: The shortest path from start to the nearest target, or an empty list if none can be reached.
+        """
+        started = time.perf_counter_ns()
+        if self.__finished:
+            return self.path_to(self.nearest) if self.found else []
+        if self.__front is None:
+            self.__setup()
+        front = self.__front
+        count = len(self.targets) - len(self.__distances) if self.all_targets else 1
+        reached, index, expanded = front.search(self.__target_indexes, count)
+        for target in reached:
+            self.__distances[divmod(target, front.height)] = front.depth[target]
+        self.__finished = True
+
+        if index is not None:
+            front.follow(index)
+        if self.stats is not None:
+            self.stats.count("solver_expanded", expanded)
+            self.stats.observe_ns("solver_solve_ns", time.perf_counter_ns() - started)
+        return self.path_to(self.nearest) if self.found else []
+
+    def path_to(self, target):
+        """
+        Returns the shortest path from the start to a target the search has reached.
+
+        Args:
+            target (tuple): The target position.
+
+        Returns:
+            list: List of positions from the start to the target, or an empty list if it wasn't reached.
+        """
+        if target not in self.__distances:
+            return []
+        return self.__front.path_to(self.__front.index(target))
+
+    @property
+    def distances(self):
+        """
+        Returns the distance to every target reached so far.
+
+        Returns:
+            dict: Number of moves by target position, in the order the targets were reached.
+        """
+        return self.__distances
+
+    @property
+    def nearest(self):
+        """
+        Returns the target closest to the start.
+
+        Returns:
+            tuple: The position of the first target reached, or None if none was.
+        """
+        return next(iter(self.__distances), None)
+
+    @property
+    def path(self):
+        """
+        Returns the path taken through the maze.
+
+        Returns:
+            list: List of positions from the start to the cell being expanded. Once the search is over it ends at
+                the nearest target, or with all_targets at the last target reached, see path_to for the others.
+        """
+        return self.__path
+
+    @property
+    def paths(self):
+        """
+        Returns the paths to draw, see draw_path.
+
+        Returns:
+            list: The path as the only element.
+        """
+        return [self.__path]
+
+    @property
+    def has_next(self):
+        """
+        Indicates if the search is still running.
+
+        Returns:
+            bool: True until the nearest target, or every target with all_targets, is reached or no cell is left.
+        """
+        return not self.__finished
+
+    @property
+    def found(self):
+        """
+        Indicates if a target was reached.
+
+        Returns:
+            bool: True if at least one target was reached.
+        """
+        return bool(self.__distances)
@@ -0,0 +1,161 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+from MazeGenerator import MazeGenerator
+from MazeGrid import MazeGrid, LEFT, TOP, RIGHT, BOTTOM, ALL_WALLS
+from MazeSolver import MazeSolver
+
+
+def _mix(*key):
+    """
+    Derives a 64-bit seed from a tuple of ints, the same on every run and platform.
+    """
+    return int.from_bytes(hashlib.blake2b(repr(key).encode(), digest_size=8).digest(), "little")
+
+
+class TiledMaze:
+    """
+    An effectively unbounded maze made of square tiles generated on demand.
+
+    Each tile is a perfect maze carved by MazeGenerator from a seed derived from the world seed and the tile
+    coordinates. Every edge shared by two tiles gets one opening, at a row or column derived from the seed of
+    that edge, so a tile knows its openings without generating its neighbors. The world is connected, with
+    loops only at the tile scale. Generated tiles are kept in a bounded LRU cache, so memory follows the area
+    being looked at, not the area explored so far.
+
+    World coordinates can be any integers, negative ones included.
+    """
+
+    def __init__(self, tile_size=32, seed=0, cache_size=256):
+        """
+        Initializes the maze, no tile is generated yet.
+
+        Args:
+            tile_size (int, optional): The width and height of each tile in cells. Defaults to 32.
+            seed (int, optional): The world seed. Defaults to 0.
+            cache_size (int, optional): Maximum number of tiles kept in memory. Defaults to 256.
+        """
+        if tile_size < 1 or cache_size < 1:
+            raise ValueError("tile_size and cache_size must be positive")
+        self.tile_size = tile_size
+        self.seed = seed
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self.__tiles = OrderedDict()
+
+    def __opening(self, axis, tx, ty):
+        """
+        Returns the offset of the opening on the edge after tile (tx, ty) along an axis, "x" for the edge on its
+        right and "y" for the edge below it.
+        """
+        return _mix(self.seed, axis, tx, ty) % self.tile_size
+
+    def __generate(self, tx, ty):
+        size = self.tile_size
+        grid = MazeGrid.new(size, size)
+        MazeGenerator(grid, seed=_mix(self.seed, "tile", tx, ty)).run()
+        walls = grid.walls
+        walls[0, self.__opening("x", tx - 1, ty)] &= ~LEFT & ALL_WALLS
+        walls[-1, self.__opening("x", tx, ty)] &= ~RIGHT & ALL_WALLS
+        walls[self.__opening("y", tx, ty - 1), 0] &= ~TOP & ALL_WALLS
+        walls[self.__opening("y", tx, ty), -1] &= ~BOTTOM & ALL_WALLS
+        return walls
+
+    def tile(self, tx, ty):
+        """
+        Returns the walls of a tile, generating it if it is not cached.
+
+        Args:
+            tx (int): The tile column.
+            ty (int): The tile row.
+
+        Returns:
+            numpy.ndarray: The (tile_size, tile_size) wall array of the tile, shared with the cache.
+        """
+        key = (tx, ty)
+        walls = self.__tiles.get(key)
+        if walls is not None:
+            self.hits += 1
+            self.__tiles.move_to_end(key)
+            return walls
+        self.misses += 1
+        walls = self.__tiles[key] = self.__generate(tx, ty)
+        if len(self.__tiles) > self.cache_size:
+            self.__tiles.popitem(last=False)
+        return walls
+
+    @property
+    def cached_tiles(self):
+        """
+        Returns the number of tiles currently in memory.
+
+        Returns:
+            int: The cache length.
+        """
+        return len(self.__tiles)
+
+    def region(self, x, y, width, height, seal=True):
+        """
+        Copies a rectangle of the world into a MazeGrid, position (x, y) becomes (0, 0) in the returned grid.
+
+        The grid can be passed to draw_maze to render a viewport. A sealed region is only guaranteed to be connected
+        when it covers whole tiles, x, y, width and height being multiples of tile_size: a window cutting through
+        tiles can cut a path whose detour runs outside it, leaving cells that MazeSolver can't reach. To find a
+        path between world positions, use solve, which searches a window of whole tiles.
+
+        Args:
+            x (int): The first column.
+            y (int): The first row.
+            width (int): Number of columns.
+            height (int): Number of rows.
+            seal (bool, optional): Whether to close the openings on the border of the rectangle, so solvers
+                and generators can't step outside it. Defaults to True.
+
+        Returns:
+            MazeGrid: A new grid with the region.
+        """
+        size = self.tile_size
+        walls = np.empty((width, height), dtype=np.uint8)
+        for tx in range(x // size, (x + width - 1) // size + 1):
+            x0, x1 = max(x, tx * size), min(x + width, (tx + 1) * size)
+            for ty in range(y // size, (y + height - 1) // size + 1):
+                y0, y1 = max(y, ty * size), min(y + height, (ty + 1) * size)
+                walls[x0 - x:x1 - x, y0 - y:y1 - y] = self.tile(tx, ty)[x0 - tx * size:x1 - tx * size,
+                                                                         y0 - ty * size:y1 - ty * size]
+        if seal:
+            walls[0, :] |= LEFT
+            walls[-1, :] |= RIGHT
+            walls[:, 0] |= TOP
+            walls[:, -1] |= BOTTOM
+        return MazeGrid(walls)
+
+    def solve(self, start_pos, end_pos, margin=1, algorithm="astar"):
+        """
+        Finds a path between two world positions, searching a window of whole tiles around them.
+
+        The window spans the tiles of both positions plus margin tiles on every side. The tiles of a window are
+        always connected, so a path is always found; with a larger margin it is more likely to be the shortest
+        one in the whole world.
+
+        Args:
+            start_pos (tuple): Starting world position.
+            end_pos (tuple): Ending world position.
+            margin (int, optional): Extra tiles around the positions. Defaults to 1.
+            algorithm (str, optional): The MazeSolver algorithm. Defaults to "astar".
+
+        Returns:
+            list: List of world positions from start_pos to end_pos.
+        """
+        size = self.tile_size
+        tx0 = min(start_pos[0], end_pos[0]) // size - margin
+        ty0 = min(start_pos[1], end_pos[1]) // size - margin
+        tx1 = max(start_pos[0], end_pos[0]) // size + margin + 1
+        ty1 = max(start_pos[1], end_pos[1]) // size + margin + 1
+        x0, y0 = tx0 * size, ty0 * size
+        window = self.region(x0, y0, (tx1 - tx0) * size, (ty1 - ty0) * size)
+        solver = MazeSolver(window, (start_pos[0] - x0, start_pos[1] - y0), (end_pos[0] - x0, end_pos[1] - y0),
+                            algorithm=algorithm)
+        return [(x + x0, y + y0) for x, y in solver.solve()]
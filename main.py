@@ -4,10 +4,12 @@ import cv2
 
 from MazeGenerator import MazeGenerator
 from MazeSolver import MazeSolver
-from maze_utils import new_maze, draw_maze, draw_path
+from maze_draw import draw_maze, PathOverlay
+from maze_utils import new_maze
 
 
-def render_loop(maze, maze_gen: MazeGenerator, maze_solver: MazeSolver, maze_height, maze_width, window_name="Maze"):
+def render_loop(maze, maze_gen: MazeGenerator, maze_solver: MazeSolver, maze_height, maze_width, window_name="Maze",
+                stats=None):
     """
     Main rendering loop for the maze generation and solving process.
 
@@ -18,46 +20,61 @@ def render_loop(maze, maze_gen: MazeGenerator, maze_solver: MazeSolver, maze_hei
         maze_height (int): The height of the maze.
         maze_width (int): The width of the maze.
         window_name (str, optional): The name of the window to display the maze. Defaults to "Maze".
+        stats (MazeStats, optional): Collects per-phase frame timings and draw counters when given. Defaults to None.
     """
     continue_loop = True
     target_frame_time = 1
     maze_img = None
+    path_overlay = None
 
     while continue_loop:
         redraw_list = [(0, 0)]
         cursor_pos = None
         start_time = time.time() * 1000
+        phase_start = time.perf_counter_ns()
 
+        path_events = []
         if maze_gen.has_next:
-            redraw_list.append(maze_gen.cursor_pos)
-            maze_gen.next_step()
-            redraw_list.append(maze_gen.cursor_pos)
+            phase = "generate"
+            redraw_list.extend(maze_gen.next_step())
             cursor_pos = maze_gen.cursor_pos
         elif maze_solver.has_next:
-            maze_solver.next_step()
+            phase = "solve"
+            path_events = maze_solver.next_step()
         else:
+            phase = "done"
             continue_loop = False
 
         # draw maze
-        maze_img = draw_maze(
-            maze, last_frame=maze_img,
-            redraw_list=redraw_list,
-            width=18, height=18, border_thickness=1, cursor_pos=cursor_pos,
-            bg_color=(0, 0, 0), node_color=(50, 50, 50))
-
-        frame = maze_img.copy()
-
-        # draw maze solve
+        if path_overlay is None:
+            maze_img = draw_maze(
+                maze, last_frame=maze_img,
+                redraw_list=redraw_list,
+                width=18, height=18, border_thickness=1, cursor_pos=cursor_pos,
+                bg_color=(0, 0, 0), node_color=(50, 50, 50), stats=stats)
+            frame = maze_img
+
+        # draw maze solve, only the path segments that changed since the last frame
         if not maze_gen.has_next:
-            draw_path(frame, (0, 0, 255), maze_solver)
+            if path_overlay is None:
+                path_overlay = PathOverlay.for_solver(maze_img, (0, 0, 255), maze_solver, width=18, height=18)
+                for index, path in enumerate(maze_solver.paths):
+                    frame = path_overlay.update(path, index)
+            else:
+                frame = path_overlay.apply(path_events)
 
         end_time = time.time() * 1000
+        if stats is not None:
+            stats.observe_ns(f"frame_{phase}_ns", time.perf_counter_ns() - phase_start)
         status1 = f"solve path length: {len(maze_solver.path)}"
         status2 = f"remain: {maze_gen.remain_count} progress: {(maze_gen.visited_count / (maze_height * maze_width)) * 100:0.2f}% draw time: {end_time - start_time:0.2f} ms"
 
+        # the status text is drawn on the persistent frame, so the strip under it is restored after showing it
+        status_strip = frame[850:900].copy()
         cv2.putText(frame, status1, (10, 870), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (150, 150, 150), 1, lineType=cv2.LINE_AA)
         cv2.putText(frame, status2, (10, 890), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (150, 150, 150), 1, lineType=cv2.LINE_AA)
         cv2.imshow(window_name, frame)
+        frame[850:900] = status_strip
 
         end_time = time.time() * 1000
         delay = int(max(target_frame_time - (end_time - start_time), 1))
@@ -0,0 +1,300 @@
+import itertools
+import random
+import time
+
+import numpy as np
+
+from MazeGenerator import MazeGenerator
+from MazeGrid import MazeGrid, ALL_WALLS, LEFT, TOP, RIGHT, BOTTOM
+
+
+def carve(walls, open_right, open_down):
+    """
+    Removes walls of a full wall array in bulk.
+
+    Args:
+        walls (numpy.ndarray): A (width, height) wall array, modified in place.
+        open_right (numpy.ndarray): A (width - 1, height) boolean mask, True where (x, y) connects to (x + 1, y).
+        open_down (numpy.ndarray): A (width, height - 1) boolean mask, True where (x, y) connects to (x, y + 1).
+
+    Returns:
+        numpy.ndarray: The same wall array.
+    """
+    open_right = open_right.astype(np.uint8)
+    open_down = open_down.astype(np.uint8)
+    walls[:-1, :] &= ~(open_right * RIGHT)
+    walls[1:, :] &= ~(open_right * LEFT)
+    walls[:, :-1] &= ~(open_down * BOTTOM)
+    walls[:, 1:] &= ~(open_down * TOP)
+    return walls
+
+
+def eller_rows(maze_width, maze_height=None, seed=None):
+    """
+    Generates a perfect maze row by row with Eller's algorithm.
+
+    Only the set membership of the current row is kept in memory, so the maze can be streamed to disk or to a
+    renderer without ever holding the full grid.
+
+    Args:
+        maze_width (int): The width of the maze.
+        maze_height (int, optional): The number of rows to generate. Defaults to None, an endless stream.
+        seed (int, optional): Seed of the random stream. Defaults to time.time_ns().
+
+    Yields:
+        numpy.ndarray: The finished wall masks of one row (all cells with the same y), as a uint8 array of
+        length maze_width.
+    """
+    rng = random.Random(time.time_ns() if seed is None else seed)
+    set_ids = itertools.count()
+    sets = [None] * maze_width
+    open_top = [False] * maze_width
+
+    for y in itertools.count() if maze_height is None else range(maze_height):
+        last = maze_height is not None and y == maze_height - 1
+        row = bytearray([ALL_WALLS]) * maze_width
+        members = {}
+        for x in range(maze_width):
+            if open_top[x]:
+                row[x] &= ~TOP
+            if sets[x] is None:
+                sets[x] = next(set_ids)
+            members.setdefault(sets[x], []).append(x)
+
+        # join adjacent cells of different sets, always on the last row so every set ends up connected
+        for x in range(maze_width - 1):
+            a, b = sets[x], sets[x + 1]
+            if a != b and (last or rng.random() < 0.5):
+                row[x] &= ~RIGHT
+                row[x + 1] &= ~LEFT
+                if len(members[a]) < len(members[b]):
+                    a, b = b, a
+                for member in members[b]:
+                    sets[member] = a
+                members[a].extend(members.pop(b))
+
+        # carve at least one passage down from every set
+        open_top = [False] * maze_width
+        if not last:
+            for group in members.values():
+                down = [x for x in group if rng.random() < 0.5] or [rng.choice(group)]
+                for x in down:
+                    open_top[x] = True
+                    row[x] &= ~BOTTOM
+            sets = [s if down else None for s, down in zip(sets, open_top)]
+
+        yield np.frombuffer(bytes(row), dtype=np.uint8)
+
+
+def eller(maze_height, maze_width, seed=None):
+    """
+    Generates a full maze with Eller's algorithm.
+
+    Args:
+        maze_height (int): The height of the maze.
+        maze_width (int): The width of the maze.
+        seed (int, optional): Seed of the random stream. Defaults to time.time_ns().
+
+    Returns:
+        MazeGrid: The generated maze.
+    """
+    walls = np.empty((maze_width, maze_height), dtype=np.uint8)
+    for y, row in enumerate(eller_rows(maze_width, maze_height, seed)):
+        walls[:, y] = row
+    return MazeGrid(walls)
+
+
+def backtracker(maze_height, maze_width, seed=None):
+    """
+    Generates a maze with the depth-first backtracker of MazeGenerator.
+
+    Args:
+        maze_height (int): The height of the maze.
+        maze_width (int): The width of the maze.
+        seed (int, optional): Seed of the random stream. Defaults to time.time_ns().
+
+    Returns:
+        MazeGrid: The generated maze.
+    """
+    maze = MazeGrid.new(maze_height, maze_width)
+    MazeGenerator(maze, seed=seed).run()
+    return maze
+
+
+def binary_tree(maze_height, maze_width, seed=None):
+    """
+    Generates a maze where every cell opens either to the top or to the left, drawn in one NumPy call.
+
+    Args:
+        maze_height (int): The height of the maze.
+        maze_width (int): The width of the maze.
+        seed (int, optional): Seed of the NumPy random generator. Defaults to fresh entropy.
+
+    Returns:
+        MazeGrid: The generated maze.
+    """
+    rng = np.random.default_rng(seed)
+    up = rng.random((maze_width, maze_height)) < 0.5
+    up[0, :] = True
+    up[:, 0] = False
+    maze = MazeGrid.new(maze_height, maze_width)
+    carve(maze.walls, ~up[1:, :], up[:, 1:])
+    return maze
+
+
+def sidewinder(maze_height, maze_width, seed=None):
+    """
+    Generates a maze with the sidewinder algorithm.
+
+    Each row is split into runs of cells joined to the right, and every run opens to the top from one random
+    member. Runs are found with a cumulative sum over the whole grid instead of a per-cell loop.
+
+    Args:
+        maze_height (int): The height of the maze.
+        maze_width (int): The width of the maze.
+        seed (int, optional): Seed of the NumPy random generator. Defaults to fresh entropy.
+
+    Returns:
+        MazeGrid: The generated maze.
+    """
+    rng = np.random.default_rng(seed)
+    east = rng.random((maze_height, maze_width)) < 0.5
+    east[0, :] = True
+    east[:, -1] = False
+
+    # every row ends a run, so runs never cross rows of the flattened (y, x) array
+    run_end = ~east[1:].ravel()
+    run_start = np.ones(run_end.size, dtype=bool)
+    run_start[1:] = run_end[:-1]
+    starts = np.flatnonzero(run_start)
+    lengths = np.diff(np.append(starts, run_end.size))
+    picks = starts + (rng.random(starts.size) * lengths).astype(np.int64)
+    up = np.zeros(run_end.size, dtype=bool)
+    up[picks] = True
+
+    maze = MazeGrid.new(maze_height, maze_width)
+    carve(maze.walls, east[:, :-1].T, up.reshape(maze_height - 1, maze_width).T)
+    return maze
+
+
+def _join_components(parent):
+    """
+    Resolves the components formed when every component points to the one across its lowest ranked edge.
+
+    Args:
+        parent (numpy.ndarray): For each component, the component it points to, or itself.
+
+    Returns:
+        tuple[numpy.ndarray, int]: The new component label of every old component, and the number of new components.
+    """
+    ids = np.arange(parent.size, dtype=np.int32)
+    # two components sharing the same lowest edge point at each other, the smaller one becomes the root
+    mutual = (parent[parent] == ids) & (ids < parent)
+    parent[mutual] = ids[mutual]
+    while True:
+        grand = parent[parent]
+        if (grand == parent).all():
+            break
+        parent = grand
+    is_root = parent == ids
+    return (np.cumsum(is_root, dtype=np.int32) - 1)[parent], int(is_root.sum())
+
+
+def kruskal(maze_height, maze_width, seed=None):
+    """
+    Generates a maze with Kruskal's algorithm over a shuffled edge list.
+
+    Instead of a per-edge Python loop, the edges are joined in Boruvka rounds: every component takes its first
+    edge in shuffled order, and the components are merged with an array union-find whose parent pointers are
+    fully compressed by pointer jumping. With distinct edge ranks this selects exactly the spanning tree
+    sequential Kruskal would over the same shuffled list.
+
+    Args:
+        maze_height (int): The height of the maze.
+        maze_width (int): The width of the maze.
+        seed (int, optional): Seed of the NumPy random generator. Defaults to fresh entropy.
+
+    Returns:
+        MazeGrid: The generated maze.
+    """
+    rng = np.random.default_rng(seed)
+    cells = np.arange(maze_width * maze_height, dtype=np.int32).reshape(maze_width, maze_height)
+    n_right = (maze_width - 1) * maze_height
+
+    # rank[e] is the position of edge e in the shuffled list, right edges first and then down edges in grid order
+    rank = rng.permutation(n_right + maze_width * (maze_height - 1)).astype(np.int32)
+    rank_right = rank[:n_right].reshape(maze_width - 1, maze_height)
+    rank_down = rank[n_right:].reshape(maze_width, maze_height - 1)
+
+    # the first round runs on the grid arrays, every cell takes its lowest ranked edge
+    best = np.full(cells.shape, rank.size, dtype=np.int32)
+    sides = ((best[:-1, :], rank_right, cells[1:, :]), (best[1:, :], rank_right, cells[:-1, :]),
+             (best[:, :-1], rank_down, cells[:, 1:]), (best[:, 1:], rank_down, cells[:, :-1]))
+    for cell_best, edge_rank, _ in sides:
+        np.minimum(cell_best, edge_rank, out=cell_best)
+    parent = cells.copy()
+    for (cell_best, edge_rank, other), cell_parent in zip(sides, (parent[:-1, :], parent[1:, :],
+                                                                 parent[:, :-1], parent[:, 1:])):
+        np.copyto(cell_parent, other, where=cell_best == edge_rank)
+    chosen = np.concatenate((((rank_right == best[:-1, :]) | (rank_right == best[1:, :])).ravel(),
+                             ((rank_down == best[:, :-1]) | (rank_down == best[:, 1:])).ravel()))
+
+    labels, n_comp = _join_components(parent.ravel())
+    labels = labels.reshape(cells.shape)
+    keep_right = labels[:-1, :] != labels[1:, :]
+    keep_down = labels[:, :-1] != labels[:, 1:]
+    edges = np.flatnonzero(np.concatenate((keep_right.ravel(), keep_down.ravel()))).astype(np.int32)
+    rank = np.concatenate((rank_right[keep_right], rank_down[keep_down]))
+    comp_u = np.concatenate((labels[:-1, :][keep_right], labels[:, :-1][keep_down]))
+    comp_v = np.concatenate((labels[1:, :][keep_right], labels[:, 1:][keep_down]))
+
+    # later rounds run on the contracted edge list
+    while edges.size:
+        best = np.full(n_comp, rank.size + n_right + maze_width * maze_height, dtype=np.int32)
+        np.minimum.at(best, comp_u, rank)
+        np.minimum.at(best, comp_v, rank)
+        best_of_u = np.flatnonzero(best[comp_u] == rank)
+        best_of_v = np.flatnonzero(best[comp_v] == rank)
+        chosen[edges[best_of_u]] = True
+        chosen[edges[best_of_v]] = True
+
+        parent = np.arange(n_comp, dtype=np.int32)
+        parent[comp_u[best_of_u]] = comp_v[best_of_u]
+        parent[comp_v[best_of_v]] = comp_u[best_of_v]
+        labels, n_comp = _join_components(parent)
+        comp_u, comp_v = labels[comp_u], labels[comp_v]
+        keep = comp_u != comp_v
+        edges, rank, comp_u, comp_v = edges[keep], rank[keep], comp_u[keep], comp_v[keep]
+
+    maze = MazeGrid.new(maze_height, maze_width)
+    carve(maze.walls,
+          chosen[:n_right].reshape(maze_width - 1, maze_height),
+          chosen[n_right:].reshape(maze_width, maze_height - 1))
+    return maze
+
+
+ALGORITHMS = {
+    "backtracker": backtracker,
+    "binary_tree": binary_tree,
+    "sidewinder": sidewinder,
+    "kruskal": kruskal,
+    "eller": eller,
+}
+
+
+def generate(maze_height, maze_width, algorithm="backtracker", seed=None):
+    """
+    Generates a maze with one of the registered algorithms.
+
+    Args:
+        maze_height (int): The height of the maze.
+        maze_width (int): The width of the maze.
+        algorithm (str, optional): A key of ALGORITHMS. Defaults to "backtracker".
+        seed (int, optional): Seed of the algorithm's random stream. Defaults to fresh entropy.
+
+    Returns:
+        MazeGrid: The generated maze.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"unknown algorithm {algorithm!r}, expected one of {', '.join(ALGORITHMS)}")
+    return ALGORITHMS[algorithm](maze_height, maze_width, seed=seed)
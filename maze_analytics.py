@@ -0,0 +1,373 @@
+from typing import NamedTuple
+
+import numpy as np
+
+import maze_jit
+from MazeGrid import MazeGrid, ALL_WALLS, DIRECTIONS, RIGHT, BOTTOM
+from maze_distance import diameter, distance_field
+
+# Lookup tables over the 4-bit mask of open sides, bit i being direction i (left, top, right, bottom).
+_DEGREE = np.array([bin(mask).count("1") for mask in range(16)], dtype=np.uint8)
+# [mask * 4 + d]: number of open sides before direction d, the position of passage d among the cell's passages
+_BEFORE = np.zeros(64, dtype=np.int32)
+# [mask * 4 + d]: the side a wall follower leaves by after entering the cell through side d
+_TURN = np.zeros(64, dtype=np.uint8)
+for _mask in range(16):
+    for _side in range(4):
+        _BEFORE[_mask * 4 + _side] = _DEGREE[_mask & ((1 << _side) - 1)]
+        _TURN[_mask * 4 + _side] = next(((_side + k) % 4 for k in range(1, 5) if _mask >> (_side + k) % 4 & 1), 0)
+
+# one tour splitter per this many passages on average, see _euler_tour
+_SPLITTER_SPACING = 64
+
+
+class MazeAnalysis(NamedTuple):
+    """
+    Difficulty metrics of a maze, see analyze.
+    """
+    cells: int
+    dead_ends: int
+    junctions: int
+    branching: tuple
+    corridor_runs: np.ndarray
+    dead_end_reduction: float
+    longest_path: int
+    longest_path_ends: tuple
+
+
+def passage_counts(maze):
+    """
+    Counts the open sides of every cell.
+
+    Args:
+        maze (MazeGrid | list[list[MazeNode]]): The maze.
+
+    Returns:
+        numpy.ndarray: A (width, height) uint8 array, 1 for dead ends and 3 or 4 for junctions.
+    """
+    return _DEGREE[(~MazeGrid.from_nodes(maze).walls) & ALL_WALLS]
+
+
+def branching_histogram(maze):
+    """
+    Counts the cells by number of open sides.
+
+    Args:
+        maze (MazeGrid | list[list[MazeNode]]): The maze.
+
+    Returns:
+        numpy.ndarray: Five counts, index i holding the number of cells with i open sides.
+    """
+    return np.bincount(passage_counts(maze).ravel(), minlength=5)
+
+
+def corridor_runs(maze):
+    """
+    Measures the straight corridors of a maze, the runs of cells joined along one axis.
+
+    Args:
+        maze (MazeGrid | list[list[MazeNode]]): The maze.
+
+    Returns:
+        numpy.ndarray: A histogram, index i holding the number of straight runs of i cells, horizontal and
+            vertical together. Cells with no passage along an axis are not counted as runs of that axis.
+    """
+    walls = MazeGrid.from_nodes(maze).walls
+    # each line is padded with a closed side so runs never continue into the next line
+    horizontal = np.pad((walls & RIGHT) == 0, ((0, 1), (0, 0))).T
+    vertical = np.pad((walls & BOTTOM) == 0, ((0, 0), (0, 1)))
+    lengths = []
+    for passages in (horizontal, vertical):
+        edges = np.diff(passages.ravel().view(np.int8), prepend=np.int8(0))
+        lengths.append(np.flatnonzero(edges < 0) - np.flatnonzero(edges > 0) + 1)
+    return np.bincount(np.concatenate(lengths), minlength=2)
+
+
+def dead_end_filling(maze, start_pos=(0, 0), end_pos=None):
+    """
+    Fills every dead end except the start and end until none is left, the cells that remain are the only ones
+    a solver needs to consider.
+
+    Perfect mazes are reduced to their solution path in one pass over an Euler tour, or from the distance fields
+    of both ends on mazes large enough for the compiled kernel of maze_jit. Mazes with loops are filled one layer
+    of dead ends at a time.
+
+    Args:
+        maze (MazeGrid | list[list[MazeNode]]): The maze.
+        start_pos (tuple): The start position (default (0, 0)).
+        end_pos (tuple, optional): The end position, defaults to the bottom right cell.
+
+    Returns:
+        numpy.ndarray: A (width, height) bool array of the cells left open.
+
+    Raises:
+        ValueError: If start_pos or end_pos is outside the maze.
+    """
+    grid = MazeGrid.from_nodes(maze)
+    end_pos = (grid.width - 1, grid.height - 1) if end_pos is None else end_pos
+    grid.check_pos(start_pos, "start_pos")
+    grid.check_pos(end_pos, "end_pos")
+    from_start = _tree_distances(grid, start_pos)
+    if from_start is not None:
+        return _distance_path(grid, from_start, end_pos)
+    tour = _euler_tour(grid, start_pos)
+    if tour is None:
+        return _fill_dead_ends(grid, start_pos, end_pos)
+    return _tour_path(grid, tour, end_pos)
+
+
+def longest_path(maze):
+    """
+    Finds the longest shortest path of the maze, its diameter.
+
+    Perfect mazes are measured exactly from an Euler tour with array operations, or with maze_distance.diameter
+    on mazes large enough for the compiled kernel of maze_jit. Mazes with loops fall back to
+    maze_distance.diameter too, whose result is a lower bound for them. When several paths are the longest, either
+    way may return the ends of a different one.
+
+    Args:
+        maze (MazeGrid | list[list[MazeNode]]): The maze.
+
+    Returns:
+        tuple[tuple[int, int], tuple[int, int], int]: Both ends of the path and its length in moves.
+    """
+    grid = MazeGrid.from_nodes(maze)
+    distances = _tree_distances(grid, (0, 0))
+    if distances is not None:
+        return diameter(grid, (0, 0), distances)
+    tour = _euler_tour(grid, (0, 0))
+    if tour is None:
+        return diameter(grid)
+    return _tour_diameter(grid, tour)
+
+
+def analyze(maze, start_pos=(0, 0), end_pos=None):
+    """
+    Computes the difficulty metrics of a maze.
+
+    Args:
+        maze (MazeGrid | list[list[MazeNode]]): The maze.
+        start_pos (tuple): The start position used for dead end filling (default (0, 0)).
+        end_pos (tuple, optional): The end position used for dead end filling, defaults to the bottom right cell.
+
+    Returns:
+        MazeAnalysis: The dead end and junction counts, the branching histogram from passage_counts, the
+            straight corridor histogram from corridor_runs, the fraction of cells removed by dead end filling
+            and the longest path with its ends.
+
+    Raises:
+        ValueError: If start_pos or end_pos is outside the maze.
+    """
+    grid = MazeGrid.from_nodes(maze)
+    end_pos = (grid.width - 1, grid.height - 1) if end_pos is None else end_pos
+    grid.check_pos(start_pos, "start_pos")
+    grid.check_pos(end_pos, "end_pos")
+    branching = branching_histogram(grid)
+    cells = grid.width * grid.height
+
+    # the distance field from the start, or a single tour rooted there, serves both the filling and the diameter
+    # of a perfect maze
+    from_start = _tree_distances(grid, start_pos)
+    tour = None if from_start is not None else _euler_tour(grid, start_pos)
+    if from_start is not None:
+        remaining = _distance_path(grid, from_start, end_pos)
+        ends_and_length = diameter(grid, start_pos, from_start)
+    elif tour is None:
+        remaining = _fill_dead_ends(grid, start_pos, end_pos)
+        ends_and_length = diameter(grid)
+    else:
+        remaining = _tour_path(grid, tour, end_pos)
+        ends_and_length = _tour_diameter(grid, tour)
+
+    return MazeAnalysis(
+        cells=cells,
+        dead_ends=int(branching[1]),
+        junctions=int(branching[3] + branching[4]),
+        branching=tuple(int(count) for count in branching),
+        corridor_runs=corridor_runs(grid),
+        dead_end_reduction=1 - int(np.count_nonzero(remaining)) / cells,
+        longest_path=ends_and_length[2],
+        longest_path_ends=ends_and_length[:2],
+    )
+
+
+def _tree_distances(grid, source):
+    """
+    Returns the distance field from source when the maze is perfect and large enough for the compiled kernel of
+    maze_jit, otherwise None. Three kernel passes take less than half the time of an Euler tour there, which
+    is mostly spent in NumPy calls over every passage.
+    """
+    if not maze_jit.use_jit(grid.walls.size):
+        return None
+    # a perfect maze has one passage less than cells, each opening two sides, and every cell reachable
+    if int(_DEGREE[(~grid.sealed_walls()) & ALL_WALLS].sum(dtype=np.int64)) != 2 * (grid.walls.size - 1):
+        return None
+    distances = distance_field(grid, source)
+    return distances if (distances >= 0).all() else None
+
+
+def _distance_path(grid, from_start, end_pos):
+    """
+    Marks the cells on the path from the source of a distance field of a perfect maze to end_pos, the only cells
+    whose distances from both ends add up to the length of the path.
+    """
+    from_end = distance_field(grid, end_pos)
+    return from_start + from_end == from_start[end_pos]
+
+
+def _euler_tour(grid, root):
+    """
+    Walks around a perfect maze with a hand on the wall, from the root cell back to it.
+
+    Every passage is crossed once in each direction, first away from the root, then back. The successor of each
+    directed passage only depends on the cell it enters, so all of them are found with lookups; the tour order
+    is then recovered by walking from a sparse random set of splitter passages in lockstep, until each walker
+    reaches the next splitter, and chaining the splitters in Python.
+
+    Args:
+        grid (MazeGrid): The maze.
+        root (tuple): Where the tour starts.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray] | None: The flat index of every cell along the tour, starting and
+            ending at the root, and the depth of each one below the root. None when the maze has loops or
+            cells that can't be reached, where a tour doesn't visit every cell.
+    """
+    height = grid.height
+    # sides open on the border lead nowhere, and would step into the next column
+    opened = (~grid.sealed_walls().ravel()) & ALL_WALLS
+    degree = _DEGREE[opened]
+    root = root[0] * height + root[1]
+    count = int(degree.sum(dtype=np.int64))
+    if count != 2 * (opened.size - 1):
+        return None
+    if count == 0:
+        return np.array([root], dtype=np.int32), np.zeros(1, dtype=np.int32)
+
+    # passages are numbered by cell and side, a cell's passages start at first[cell]
+    first = np.cumsum(degree, dtype=np.int32)
+    first -= degree
+    cell, side = np.nonzero(np.unpackbits(opened[:, None], axis=1, count=4, bitorder="little"))
+    deltas = np.array([-height, -1, height, 1], dtype=np.int32)
+    target = cell.astype(np.int32)
+    target += deltas[side]
+    entered = (side.astype(np.int32) ^ 2) + opened[target].astype(np.int32) * 4
+    target_first = first[target]
+    successor = target_first + _BEFORE[entered - (entered & 3) + _TURN[entered]]
+    reverse = target_first + _BEFORE[entered]
+    del cell, side, entered, target_first
+
+    # the tour leaves the root as if it had entered it from the bottom
+    start = int(first[root] + _BEFORE[opened[root] * 4 + _TURN[opened[root] * 4 + 3]])
+    # a fixed seed keeps the work, not the result, reproducible
+    splitters = np.random.default_rng(0).integers(0, count, count // _SPLITTER_SPACING + 1, dtype=np.int32)
+    splitters = np.union1d(splitters, np.int32(start))
+    splitter_id = np.full(count, -1, dtype=np.int32)
+    splitter_id[splitters] = np.arange(splitters.size, dtype=np.int32)
+    next_splitter = np.empty(splitters.size, dtype=np.int32)
+    segment_length = np.empty(splitters.size, dtype=np.int32)
+
+    # every round records the passages reached and the splitter each walker started from
+    visited, visitors = [splitters], [np.arange(splitters.size, dtype=np.int32)]
+    current, walkers, steps = visited[0], visitors[0], 0
+    while current.size:
+        steps += 1
+        current = successor[current]
+        reached = splitter_id[current]
+        done = reached >= 0
+        if done.any():
+            next_splitter[walkers[done]] = reached[done]
+            segment_length[walkers[done]] = steps
+            current, walkers = current[~done], walkers[~done]
+        visited.append(current)
+        visitors.append(walkers)
+
+    segment_start = [0] * splitters.size
+    next_list, length_list = next_splitter.tolist(), segment_length.tolist()
+    position = 0
+    splitter = first_splitter = int(splitter_id[start])
+    while True:
+        segment_start[splitter] = position
+        position += length_list[splitter]
+        splitter = next_list[splitter]
+        if splitter == first_splitter:
+            break
+    if position != count:
+        return None
+
+    # the position of a passage along the tour is where its walker's segment starts plus the round it was reached
+    positions = np.array(segment_start, dtype=np.int32)[np.concatenate(visitors)]
+    positions += np.repeat(np.arange(len(visited), dtype=np.int32), [len(round_) for round_ in visited])
+    rank = np.empty(count, dtype=np.int32)
+    rank[np.concatenate(visited)] = positions
+    del visited, visitors, positions
+    # a passage leads away from the root when it is crossed before its reverse
+    moves = np.empty(count, dtype=np.int8)
+    moves[rank] = np.where(rank < rank[reverse], np.int8(1), np.int8(-1))
+    cells = np.empty(count + 1, dtype=np.int32)
+    cells[0] = root
+    cells[1:][rank] = target
+    depths = np.zeros(count + 1, dtype=np.int32)
+    np.cumsum(moves, dtype=np.int32, out=depths[1:])
+    return cells, depths
+
+
+def _tour_diameter(grid, tour):
+    """
+    Reads the longest path from an Euler tour: the distance between the cells at tour positions i <= j is
+    depth[i] + depth[j] - 2 * min(depth[i:j + 1]), and taking any position k between them instead of the
+    minimum only shortens it, so the longest path is the best prefix maximum, middle and suffix maximum.
+    """
+    cells, depths = tour
+    prefix = np.maximum.accumulate(depths)
+    suffix = np.maximum.accumulate(depths[::-1])[::-1]
+    lengths = prefix - 2 * depths
+    lengths += suffix
+    middle = int(np.argmax(lengths))
+    start = int(np.argmax(depths[:middle + 1]))
+    end = middle + int(np.argmax(depths[middle:]))
+    height = grid.height
+    start_cell, end_cell = int(cells[start]), int(cells[end])
+    return ((start_cell // height, start_cell % height), (end_cell // height, end_cell % height),
+            int(lengths[middle]))
+
+
+def _tour_path(grid, tour, end_pos):
+    """
+    Marks the cells between the root of an Euler tour and end_pos, the ancestors of the end, which are the
+    shallowest cells from each tour position up to a visit of the end.
+    """
+    cells, depths = tour
+    visit = int(np.argmax(cells == end_pos[0] * grid.height + end_pos[1]))
+    on_path = depths[:visit + 1]
+    shallowest = np.minimum.accumulate(on_path[::-1])[::-1]
+    remaining = np.zeros(grid.walls.size, dtype=bool)
+    remaining[cells[:visit + 1][on_path == shallowest]] = True
+    return remaining.reshape(grid.walls.shape)
+
+
+def _fill_dead_ends(grid, start_pos, end_pos):
+    """
+    Dead end filling for mazes with loops: every round fills the current dead ends and the cells they leave
+    with a single open side become the next ones.
+    """
+    height = grid.height
+    opened = (~grid.sealed_walls().ravel()) & ALL_WALLS
+    degree = _DEGREE[opened].astype(np.int32)
+    remaining = np.ones(opened.size, dtype=bool)
+    kept = np.array([start_pos[0] * height + start_pos[1], end_pos[0] * height + end_pos[1]])
+    deltas = tuple(zip(DIRECTIONS, (-height, -1, height, 1)))
+
+    frontier = np.setdiff1d(np.flatnonzero(degree <= 1), kept)
+    while frontier.size:
+        remaining[frontier] = False
+        masks = opened[frontier]
+        neighbors = []
+        for direction, delta in deltas:
+            reached = frontier[(masks & direction) != 0] + delta
+            reached = reached[remaining[reached]]
+            np.subtract.at(degree, reached, 1)
+            neighbors.append(reached)
+        frontier = np.unique(np.concatenate(neighbors))
+        frontier = np.setdiff1d(frontier[degree[frontier] <= 1], kept)
+    return remaining.reshape(grid.walls.shape)
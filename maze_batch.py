@@ -0,0 +1,119 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import NamedTuple
+
+import numpy as np
+
+from MazeSolver import MazeSolver
+from maze_algorithms import generate
+
+
+class MazeJob(NamedTuple):
+    """
+    One maze to generate and solve.
+    """
+    maze_height: int
+    maze_width: int
+    seed: int
+    algorithm: str = "backtracker"
+    start_pos: tuple = (0, 0)
+    end_pos: tuple = None  # the bottom right cell when None
+    solver: str = "astar"
+
+
+class MazeResult(NamedTuple):
+    """
+    The outcome of a MazeJob.
+    """
+    job: MazeJob
+    walls: np.ndarray  # (width, height) wall masks, see MazeGrid
+    path: list  # the shortest path, empty if the end can't be reached
+    generate_time: float  # seconds
+    solve_time: float  # seconds
+
+
+# shared memory blocks already attached by this worker process, by name
+_attached = {}
+
+
+def run_job(job: MazeJob, shm_name=None, offset=0):
+    """
+    Generates and solves one maze.
+
+    Args:
+        job (MazeJob): The maze to generate and solve.
+        shm_name (str, optional): Name of a shared memory block to copy the walls into, instead of returning
+            them. Defaults to None.
+        offset (int, optional): Byte offset of the walls in the shared memory block. Defaults to 0.
+
+    Returns:
+        tuple: The walls (None when written to shared memory), the path as an (n, 2) int32 array, the
+            generation time and the solve time.
+    """
+    started = time.perf_counter()
+    maze = generate(job.maze_height, job.maze_width, job.algorithm, seed=job.seed)
+    generated = time.perf_counter()
+    end_pos = job.end_pos if job.end_pos is not None else (job.maze_width - 1, job.maze_height - 1)
+    path = MazeSolver(maze, job.start_pos, end_pos, algorithm=job.solver).solve()
+    solved = time.perf_counter()
+
+    walls = maze.walls
+    if shm_name is not None:
+        shm = _attached.get(shm_name)
+        if shm is None:
+            shm = _attached[shm_name] = shared_memory.SharedMemory(name=shm_name)
+        np.ndarray(walls.shape, dtype=np.uint8, buffer=shm.buf, offset=offset)[...] = walls
+        walls = None
+    return walls, np.array(path, dtype=np.int32).reshape(-1, 2), generated - started, solved - generated
+
+
+def _run_job(args):
+    return run_job(*args)
+
+
+def run_batch(jobs, max_workers=None, chunksize=None):
+    """
+    Generates and solves many mazes across a process pool.
+
+    The workers write the walls straight into one shared memory block allocated by this process, so only the
+    paths and timings are pickled back. The results are the same as running each job with run_job in order.
+
+    Args:
+        jobs (list[MazeJob]): The mazes to generate and solve.
+        max_workers (int, optional): Number of worker processes, 0 runs the jobs in this process.
+            Defaults to the number of CPUs.
+        chunksize (int, optional): Jobs sent to a worker at a time. Defaults to about four chunks per worker.
+
+    Returns:
+        list[MazeResult]: One result per job, in the same order. The wall arrays are views over a single
+            buffer owned by the results.
+    """
+    jobs = [MazeJob(*job) for job in jobs]
+    offsets = np.cumsum([0] + [job.maze_width * job.maze_height for job in jobs]).tolist()
+    if max_workers == 0:
+        outcomes = [run_job(job) for job in jobs]
+        buffer = None
+    else:
+        buffer = np.empty(offsets[-1], dtype=np.uint8)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, offsets[-1]))
+        try:
+            workers = max_workers or os.cpu_count() or 1
+            if chunksize is None:
+                chunksize = max(1, len(jobs) // (4 * workers))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                tasks = ((job, shm.name, offset) for job, offset in zip(jobs, offsets))
+                outcomes = list(executor.map(_run_job, tasks, chunksize=chunksize))
+            buffer[...] = np.ndarray(buffer.shape, dtype=np.uint8, buffer=shm.buf)
+        finally:
+            shm.close()
+            shm.unlink()
+
+    results = []
+    for job, offset, (walls, path, generate_time, solve_time) in zip(jobs, offsets, outcomes):
+        if walls is None:
+            walls = buffer[offset:offset + job.maze_width * job.maze_height].reshape(job.maze_width,
+                                                                                     job.maze_height)
+        results.append(MazeResult(job, walls, [tuple(pos) for pos in path.tolist()], generate_time, solve_time))
+    return results
@@ -0,0 +1,198 @@
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from MazeGenerator import MazeGenerator
+from MazeSolver import MazeSolver
+from maze_algorithms import generate
+from maze_draw import draw_maze, draw_path
+from maze_utils import new_maze
+
+SIZES = (50, 200, 500, 1000, 2000)
+SEED = 1234
+# cells redrawn per call by the incremental draw_maze benchmark, about what the render loop redraws in a frame
+# when several steps are drawn at once
+REDRAW_CELLS = 1000
+
+
+def _cases(size, cell_size):
+    """
+    Returns the benchmarks for one maze size as (name, setup, run) tuples. setup builds fresh state outside
+    the timed region and run receives it.
+    """
+    maze = generate(size, size, "backtracker", seed=SEED)
+    end_pos = (size - 1, size - 1)
+    draw_options = dict(width=cell_size, height=cell_size, border_thickness=1)
+    maze_img = draw_maze(maze, **draw_options)
+    solved = MazeSolver(maze, end_pos=end_pos)
+    solved.solve()
+    rng = random.Random(SEED)
+    redraw_list = [(rng.randrange(size), rng.randrange(size)) for _ in range(min(REDRAW_CELLS, size * size))]
+
+    def new_generator():
+        return MazeGenerator(new_maze(size, size), seed=SEED)
+
+    return [
+        ("new_maze", lambda: None, lambda _: new_maze(size, size)),
+        ("generator_run", new_generator, lambda maze_gen: maze_gen.run()),
+        ("solver_solve", lambda: MazeSolver(maze, end_pos=end_pos), lambda maze_solver: maze_solver.solve()),
+        ("draw_maze_full", lambda: None, lambda _: draw_maze(maze, **draw_options)),
+        ("draw_maze_incremental", maze_img.copy,
+         lambda frame: draw_maze(maze, last_frame=frame, redraw_list=redraw_list, **draw_options)),
+        ("draw_path", maze_img.copy, lambda frame: draw_path(frame, (0, 0, 255), solved, cell_size, cell_size)),
+    ]
+
+
+def measure(setup, run, repeat=3):
+    """
+    Times a benchmark and measures its memory use in a separate, untimed run.
+
+    Args:
+        setup (callable): Builds the state passed to run, outside the measured region.
+        run (callable): The code being measured.
+        repeat (int, optional): Number of timed runs. Defaults to 3.
+
+    Returns:
+        dict: best and mean seconds, ops_per_sec from the best time, peak_bytes traced by tracemalloc during
+            the run and allocated_blocks, the change in sys.getallocatedblocks() while the result is alive.
+    """
+    times = []
+    for _ in range(repeat):
+        state = setup()
+        gc.collect()
+        start = time.perf_counter()
+        run(state)
+        times.append(time.perf_counter() - start)
+        del state
+
+    state = setup()
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    result = run(state)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    blocks = sys.getallocatedblocks() - blocks
+    del result, state
+
+    best = min(times)
+    return {
+        "best": best,
+        "mean": sum(times) / len(times),
+        "ops_per_sec": 1 / best if best > 0 else float("inf"),
+        "peak_bytes": peak,
+        "allocated_blocks": blocks,
+    }
+
+
+def run_benchmarks(sizes=SIZES, repeat=3, cell_size=4, names=None, log=None):
+    """
+    Runs the benchmark suite.
+
+    Args:
+        sizes (iterable[int], optional): Maze sizes, each maze is size x size. Defaults to SIZES.
+        repeat (int, optional): Timed runs per benchmark. Defaults to 3.
+        cell_size (int, optional): Pixels per cell in the drawing benchmarks. Defaults to 4.
+        names (iterable[str], optional): Only run the benchmarks with these names. Defaults to all.
+        log (callable, optional): Called with each result as it is measured, e.g. print. Defaults to None.
+
+    Returns:
+        dict: The environment and parameters of the run, and a list of results.
+    """
+    results = []
+    for size in sizes:
+        for name, setup, run in _cases(size, cell_size):
+            if names is not None and name not in names:
+                continue
+            result = {"name": name, "size": size, **measure(setup, run, repeat)}
+            results.append(result)
+            if log is not None:
+                log(format_result(result))
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "seed": SEED,
+        "repeat": repeat,
+        "cell_size": cell_size,
+        "results": results,
+    }
+
+
+def format_result(result):
+    """
+    Formats one benchmark result as a table row.
+    """
+    return (f"{result['name']:<22} {result['size']:>5} {result['best'] * 1000:>11.2f} ms"
+            f" {result['ops_per_sec']:>10.2f}/s {result['peak_bytes'] / 2 ** 20:>9.2f} MiB"
+            f" {result['allocated_blocks']:>9} blocks")
+
+
+def compare(baseline, current, tolerance=0.1):
+    """
+    Compares two benchmark runs by best time.
+
+    Args:
+        baseline (dict): An earlier result of run_benchmarks, e.g. loaded from its JSON file.
+        current (dict): The result to check.
+        tolerance (float, optional): Relative slowdown allowed before a benchmark counts as a regression.
+            Defaults to 0.1.
+
+    Returns:
+        list[dict]: One entry per benchmark present in both runs with name, size, baseline and current best
+            times, their ratio and whether it is a regression.
+    """
+    previous = {(result["name"], result["size"]): result for result in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        old = previous.get((result["name"], result["size"]))
+        if old is None:
+            continue
+        ratio = result["best"] / old["best"] if old["best"] > 0 else float("inf")
+        rows.append({"name": result["name"], "size": result["size"], "baseline": old["best"],
+                     "current": result["best"], "ratio": ratio, "regression": ratio > 1 + tolerance})
+    return rows
+
+
+def main(argv=None):
+    """
+    Command line entry point, see --help.
+
+    Returns:
+        int: 1 if a comparison found regressions, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks maze construction, generation, solving and drawing.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cell-size", type=int, default=4)
+    parser.add_argument("--only", nargs="+", help="benchmark names to run")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON file of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.sizes, args.repeat, args.cell_size, args.only, log=print)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(current, file, indent=2)
+    if not args.compare:
+        return 0
+
+    with open(args.compare) as file:
+        rows = compare(json.load(file), current, args.tolerance)
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(f"{row['name']:<22} {row['size']:>5} {row['baseline'] * 1000:>11.2f} ms -> "
+              f"{row['current'] * 1000:>11.2f} ms x{row['ratio']:.2f} {flag}")
+    return int(any(row["regression"] for row in rows))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,167 @@
+import argparse
+import json
+import os
+import sys
+
+# Modules are imported inside the commands, so a generate or solve job never loads OpenCV and --help loads
+# nothing at all.
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def _add_maze_arguments(parser, with_input=True):
+    if with_input:
+        parser.add_argument("--input", "-i", help="maze file saved by the generate command, instead of generating one")
+    parser.add_argument("--width", type=int, default=50)
+    parser.add_argument("--height", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--algorithm", default="backtracker",
+                        help="backtracker, eller, binary_tree, sidewinder or kruskal (default backtracker)")
+
+
+def _add_solve_arguments(parser):
+    parser.add_argument("--start", type=int, nargs=2, metavar=("X", "Y"), default=(0, 0))
+    parser.add_argument("--end", type=int, nargs=2, metavar=("X", "Y"), help="defaults to the bottom right cell")
+    parser.add_argument("--solver", default="astar", choices=("astar", "bfs"))
+
+
+def _load(args):
+    """
+    Returns the maze of a command, read from --input or generated from the size, seed and algorithm arguments.
+    """
+    if getattr(args, "input", None):
+        from maze_io import load_maze
+        return load_maze(args.input).to_grid()
+    from maze_algorithms import generate
+    return generate(args.height, args.width, args.algorithm, seed=args.seed)
+
+
+def _solver(args, maze):
+    from MazeSolver import MazeSolver
+    width, height = len(maze), len(maze[0])
+    end = tuple(args.end) if args.end else (width - 1, height - 1)
+    for option, (x, y) in (("--start", args.start), ("--end", end)):
+        if not (0 <= x < width and 0 <= y < height):
+            args.parser.error(f"{option} {x} {y} is outside the {width}x{height} maze")
+    return MazeSolver(maze, tuple(args.start), end, algorithm=args.solver)
+
+
+def generate_command(args):
+    """
+    Generates a maze and saves it with save_maze.
+    """
+    from maze_io import save_maze
+    maze = _load(args)
+    save_maze(args.output, maze, seed=args.seed, algorithm=args.algorithm)
+    print(f"saved {maze.width}x{maze.height} {args.algorithm} maze to {args.output}")
+    return 0
+
+
+def solve_command(args):
+    """
+    Solves a maze, printing the path length and optionally writing the path as JSON.
+    """
+    maze = _load(args)
+    solver = _solver(args, maze)
+    path = solver.solve()
+    if not path:
+        print(f"no path from {solver.start_pos} to {solver.end_pos}")
+    else:
+        print(f"path from {solver.start_pos} to {solver.end_pos}: {len(path) - 1} moves")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"start": solver.start_pos, "end": solver.end_pos, "found": bool(path), "path": path}, file)
+    return 0 if path else 1
+
+
+def render_command(args):
+    """
+    Renders a solved maze to an image, or its generation and solving to a video or PNG sequence.
+    """
+    import cv2
+    from maze_draw import draw_maze, draw_path
+
+    if os.path.splitext(args.output)[1].lower() in IMAGE_EXTENSIONS:
+        maze = _load(args)
+        image = draw_maze(maze, width=args.cell_size, height=args.cell_size, border_thickness=1,
+                          bg_color=(0, 0, 0), node_color=(50, 50, 50))
+        solver = _solver(args, maze)
+        solver.solve()
+        draw_path(image, (0, 0, 255), solver, args.cell_size, args.cell_size)
+        if not cv2.imwrite(args.output, image):
+            print(f"could not write {args.output}", file=sys.stderr)
+            return 1
+        print(f"wrote {args.output}")
+        return 0
+
+    # the animation replays the generator step by step, which only the backtracker has
+    if args.input or args.algorithm != "backtracker":
+        print("animations are only available for mazes generated with the backtracker", file=sys.stderr)
+        return 2
+    from MazeGenerator import MazeGenerator
+    from maze_render import render_headless
+    from maze_utils import new_maze
+    maze = new_maze(args.height, args.width)
+    frames = render_headless(maze, MazeGenerator(maze, seed=args.seed), _solver(args, maze), args.output,
+                             total_frames=args.frames, fps=args.fps, hold_frames=args.fps,
+                             width=args.cell_size, height=args.cell_size)
+    print(f"wrote {frames} frames to {args.output}")
+    return 0
+
+
+def bench_command(args):
+    """
+    Runs maze_bench with the remaining arguments.
+    """
+    import maze_bench
+    return maze_bench.main(args.bench_args)
+
+
+def main(argv=None):
+    """
+    Command line entry point, see --help.
+
+    Returns:
+        int: The exit code.
+    """
+    parser = argparse.ArgumentParser(description="Generates, solves and renders mazes without a display.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate_parser = commands.add_parser("generate", help="generate a maze and save it")
+    _add_maze_arguments(generate_parser, with_input=False)
+    generate_parser.add_argument("--output", "-o", required=True)
+    generate_parser.set_defaults(run=generate_command)
+
+    solve_parser = commands.add_parser("solve", help="find the shortest path through a maze")
+    _add_maze_arguments(solve_parser)
+    _add_solve_arguments(solve_parser)
+    solve_parser.add_argument("--output", "-o", help="write the path to this JSON file")
+    solve_parser.set_defaults(run=solve_command, parser=solve_parser)
+
+    render_parser = commands.add_parser("render", help="render a solved maze to an image, or animate it")
+    _add_maze_arguments(render_parser)
+    _add_solve_arguments(render_parser)
+    render_parser.add_argument("--output", "-o", required=True,
+                               help="an image file, a video file or a directory for PNG frames")
+    render_parser.add_argument("--cell-size", type=int, default=18)
+    render_parser.add_argument("--frames", type=int, default=300, help="approximate length of an animation")
+    render_parser.add_argument("--fps", type=int, default=30)
+    render_parser.set_defaults(run=render_command, parser=render_parser)
+
+    # everything after bench is left to maze_bench's own parser
+    bench_parser = commands.add_parser("bench", help="run maze_bench, see bench --help", add_help=False)
+    bench_parser.set_defaults(run=bench_command)
+
+    args, rest = parser.parse_known_args(argv)
+    if args.command != "bench" and rest:
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+    args.bench_args = rest
+    try:
+        return args.run(args)
+    except (ValueError, IndexError, OSError) as error:
+        print(f"{parser.prog} {args.command}: {error}", file=sys.stderr)
+        return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,440 @@
+import time
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+import maze_jit
+from MazeGrid import MazeGrid
+from MazeNode import MazeNode
+from MazeSolver import MazeSolver
+from maze_events import PathPush
+
+
+def draw_maze(maze_input: list[list[MazeNode]], last_frame=None, redraw_list=None, width=50, height=50, border_thickness=5, cursor_pos=None,
+              cursor_color=(255, 255, 255), border_color=(0, 0, 0), bg_color=(50, 50, 50), node_color=(50, 50, 50), stats=None):
+    """
+    Draws the maze on a frame using OpenCV.
+
+    Args:
+        maze_input (list[list[MazeNode]]): The maze to draw.
+        last_frame (numpy.ndarray, optional): The previous frame. Defaults to None.
+        redraw_list (list[tuple[int, int]], optional): A list of positions to redraw in the current frame. Defaults to None.
+        width (int, optional): The width of each node in the grid. Defaults to 50.
+        height (int, optional): The height of each node in the grid. Defaults to 50.
+        border_thickness (int, optional): The thickness of the border between nodes. Defaults to 5.
+        cursor_pos (tuple[int, int], optional): The position of the cursor. Defaults to None.
+        cursor_color (tuple[int, int, int], optional): The color of the cursor. Defaults to white.
+        border_color (tuple[int, int, int], optional): The color of the borders. Defaults to black.
+        bg_color (tuple[int, int, int], optional): The background color of the frame. Defaults to dark gray.
+        node_color (tuple[int, int, int], optional): The color of the nodes. Defaults to dark gray.
+        stats (MazeStats, optional): Collects the cells redrawn and the draw time when given. Defaults to None.
+
+    Returns:
+        numpy.ndarray: The drawn maze on a frame.
+    """
+    if stats is not None:
+        started = time.perf_counter_ns()
+    if last_frame is None:
+        maze_img = np.full((height * len(maze_input[0]), width * len(maze_input), 3), bg_color, dtype=np.uint8)
+    else:
+        maze_img = last_frame
+
+    if (redraw_list is None and isinstance(maze_input, MazeGrid) and maze_img.flags.c_contiguous
+            and maze_img.shape[:2] == (height * maze_input.height, width * maze_input.width)):
+        rasterize_maze(maze_input.walls, maze_img, width, height, border_thickness, cursor_pos, cursor_color, border_color, node_color)
+    elif redraw_list is None:
+        for x, line in enumerate(maze_input):
+            for y, node in enumerate(line):
+                render_node(border_color, border_thickness, cursor_color, node_color, cursor_pos, height, maze_img, node, width, x, y)
+    else:
+        for node_pos in redraw_list:
+            node = maze_input[node_pos[0]][node_pos[1]]
+            render_node(border_color, border_thickness, cursor_color, node_color, cursor_pos, height, maze_img, node, width, node_pos[0], node_pos[1])
+    if stats is not None:
+        stats.count("draw_calls")
+        stats.count("cells_redrawn", len(maze_input) * len(maze_input[0]) if redraw_list is None else len(redraw_list))
+        stats.observe_ns("draw_maze_ns", time.perf_counter_ns() - started)
+    return maze_img
+
+
+def render_node(border_color, border_thickness, cursor_color, node_color, cursor_pos, height, maze_img, node, width, x, y):
+    """
+    Renders a single node in the maze on the given image.
+
+    Args:
+        border_color (tuple[int, int, int]): The color of the borders.
+        border_thickness (int): The thickness of the borders.
+        cursor_color (tuple[int, int, int]): The color of the cursor.
+        node_color (tuple[int, int, int]): The color of the node.
+        cursor_pos (tuple[int, int], optional): The position of the cursor. Defaults to None.
+        height (int): The height of each node in the grid.
+        maze_img (numpy.ndarray): The image to render on.
+        node (MazeNode): The node to render.
+        width (int): The width of each node in the grid.
+        x (int): The x-coordinate of the node.
+        y (int): The y-coordinate of the node.
+    """
+    pos_x, pos_y = x * width, y * height
+    top_left = (pos_x, pos_y)
+    top_right = (pos_x + width, pos_y)
+    bottom_left = (pos_x, pos_y + height)
+    bottom_right = (pos_x + width, pos_y + height)
+
+    color = cursor_color if (x, y) == cursor_pos else node_color
+    cv2.rectangle(maze_img, top_left, bottom_right, color=color, thickness=-1)
+
+    if node.left[1]:
+        cv2.line(maze_img, top_left, bottom_left, color=border_color, thickness=border_thickness)
+    if node.top[1]:
+        cv2.line(maze_img, top_left, top_right, color=border_color, thickness=border_thickness)
+    if node.right[1]:
+        cv2.line(maze_img, top_right, bottom_right, color=border_color, thickness=border_thickness)
+    if node.bottom[1]:
+        cv2.line(maze_img, bottom_left, bottom_right, color=border_color, thickness=border_thickness)
+
+
+@lru_cache(maxsize=16)
+def cell_stamps(width, height, border_thickness, cursor_color, border_color, node_color):
+    """
+    Renders every possible cell once with render_node, recording which pixels it paints and with which color.
+
+    Stamps are indexed by the wall mask, plus 16 for the cursor cell, and index 32 is an empty stamp for cells
+    outside the maze. Each stamp covers the cell and `reach` cells around it, since thick lines and the inclusive
+    rectangle spill into the neighbors. Pixels hold an index into the palette, or 255 where nothing is painted.
+
+    Args:
+        width (int): The width of each node in the grid.
+        height (int): The height of each node in the grid.
+        border_thickness (int): The thickness of the borders.
+        cursor_color (tuple[int, int, int]): The color of the cursor.
+        border_color (tuple[int, int, int]): The color of the borders.
+        node_color (tuple[int, int, int]): The color of the node.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray, int]: The stamps, a (256, 3) palette and the reach in cells.
+    """
+    reach = (border_thickness // 2 + 2) // min(width, height) + 1
+    size = (height * (2 * reach + 1), width * (2 * reach + 1))
+    stamps = np.full((33,) + size, 255, dtype=np.uint8)
+    palette = np.zeros((256, 3), dtype=np.uint8)
+    palette_colors = []
+    for key in range(32):
+        node = MazeGrid(np.array([[key & 15]], dtype=np.uint8))[0][0]
+        cursor_pos = (reach, reach) if key & 16 else None
+        # a pixel is painted if it differs from at least one of two backgrounds that differ in every channel
+        first, second = np.zeros(size + (3,), dtype=np.uint8), np.full(size + (3,), 255, dtype=np.uint8)
+        for canvas in (first, second):
+            render_node(border_color, border_thickness, cursor_color, node_color, cursor_pos, height, canvas, node, width, reach, reach)
+        painted = (first != 0).any(axis=2) | (second != 255).any(axis=2)
+        for color in np.unique(first[painted], axis=0):
+            color = tuple(int(channel) for channel in color)
+            if color not in palette_colors:
+                palette[len(palette_colors)] = color
+                palette_colors.append(color)
+            stamps[key][painted & (first == color).all(axis=2)] = palette_colors.index(color)
+    return stamps, palette, reach
+
+
+def rasterize_maze(walls, maze_img, width, height, border_thickness, cursor_pos, cursor_color, border_color, node_color):
+    """
+    Draws every cell of a wall array with NumPy, producing the same pixels as calling render_node for each cell.
+
+    Cells are drawn column by column in render_node, so where footprints overlap the later cell wins. Large mazes
+    are painted cell by cell by the compiled kernel of maze_jit when Numba is installed.
+
+    Args:
+        walls (numpy.ndarray): The (width, height) wall array of the maze.
+        maze_img (numpy.ndarray): The image to render on, exactly the size of the maze.
+        width (int): The width of each node in the grid.
+        height (int): The height of each node in the grid.
+        border_thickness (int): The thickness of the borders.
+        cursor_pos (tuple[int, int], optional): The position of the cursor.
+        cursor_color (tuple[int, int, int]): The color of the cursor.
+        border_color (tuple[int, int, int]): The color of the borders.
+        node_color (tuple[int, int, int]): The color of the node.
+    """
+    stamps, palette, reach = cell_stamps(width, height, border_thickness, tuple(cursor_color), tuple(border_color), tuple(node_color))
+    maze_width, maze_height = walls.shape
+    keys = np.full((maze_width + 2 * reach, maze_height + 2 * reach), 32, dtype=np.intp)
+    keys[reach:reach + maze_width, reach:reach + maze_height] = walls
+    if cursor_pos is not None and 0 <= cursor_pos[0] < maze_width and 0 <= cursor_pos[1] < maze_height:
+        keys[cursor_pos[0] + reach, cursor_pos[1] + reach] |= 16
+
+    if maze_jit.use_jit(maze_width * maze_height):
+        indexes = maze_jit.paint_stamps(keys, stamps, reach, width, height)
+    else:
+        indexes = _gather_stamps(keys, stamps, reach, width, height)
+    planes = [cv2.LUT(indexes, palette[:, channel].copy()) for channel in range(3)]
+    if (indexes == 255).any():
+        np.copyto(maze_img, cv2.merge(planes), where=(indexes != 255)[..., None])
+    else:
+        cv2.merge(planes, dst=maze_img)
+
+
+def _gather_stamps(keys, stamps, reach, width, height):
+    """
+    Builds the palette index image of rasterize_maze with NumPy. For each offset between a pixel's own cell and a
+    neighbor whose footprint can reach it, applied in render_node order, the part of the neighbor's stamp that
+    paints anything is gathered for the whole frame at once.
+    """
+    maze_width, maze_height = keys.shape[0] - 2 * reach, keys.shape[1] - 2 * reach
+    indexes = np.full((maze_height, height, maze_width, width), 255, dtype=np.uint8)
+    for dx in range(-reach, reach + 1):
+        for dy in range(-reach, reach + 1):
+            top, left = (reach - dy) * height, (reach - dx) * width
+            window = stamps[:, top:top + height, left:left + width]
+            rows = np.flatnonzero((window != 255).any(axis=(0, 2)))
+            columns = np.flatnonzero((window != 255).any(axis=(0, 1)))
+            if not rows.size:
+                continue
+            rows, columns = slice(rows[0], rows[-1] + 1), slice(columns[0], columns[-1] + 1)
+            neighbor_keys = keys[reach + dx:reach + dx + maze_width, reach + dy:reach + dy + maze_height].T
+            painted = window[:, rows, columns][neighbor_keys].transpose(0, 2, 1, 3)
+            np.copyto(indexes[:, rows, :, columns], painted, where=painted != 255)
+    return indexes.reshape(maze_height * height, maze_width * width)
+
+
+def draw_path(frame, color, maze_solver: MazeSolver, width=18, height=18):
+    """
+    Draws the paths of a maze solver on the given frame, both frontiers of a BidirectionalSolver.
+
+    Args:
+        frame (numpy.ndarray): The image to draw on.
+        color (tuple(int,int,int)) a color of path
+        maze_solver (MazeSolver | BidirectionalSolver | MultiTargetSolver): A maze solver to draw paths for.
+        width (int, optional): The width of each node in the grid. Defaults to 18.
+        height (int, optional): The height of each node in the grid. Defaults to 18.
+    """
+    for pos in solver_markers(maze_solver):
+        draw_marker(frame, pos, width, height)
+    for solve_points in maze_solver.paths:
+        for i in range(len(solve_points) - 1):
+            draw_segment(frame, solve_points[i], solve_points[i + 1], color, width, height)
+
+
+def solver_markers(maze_solver):
+    """
+    Returns the positions marked for a solver: its start, then its end or each of its targets.
+    """
+    targets = getattr(maze_solver, "targets", None)
+    return [maze_solver.start_pos, *(targets if targets is not None else (maze_solver.end_pos,))]
+
+
+def draw_marker(frame, pos, width, height, offset=(0, 0)):
+    """
+    Draws the circle that marks the start or end position of a path.
+
+    Args:
+        frame (numpy.ndarray): The image to draw on.
+        pos (tuple[int, int]): The marked cell.
+        width (int): The width of each node in the grid.
+        height (int): The height of each node in the grid.
+        offset (tuple[int, int], optional): Pixel position of the frame's top left corner in the full image.
+    """
+    center = (width // 2 + width * pos[0] - offset[0], height // 2 + height * pos[1] - offset[1])
+    cv2.circle(frame, center, 5, (255, 255, 255), lineType=cv2.LINE_AA, thickness=-1)
+
+
+def draw_segment(frame, pos1, pos2, color, width, height, offset=(0, 0)):
+    """
+    Draws the path segment between the centers of two cells.
+
+    Args:
+        frame (numpy.ndarray): The image to draw on.
+        pos1 (tuple[int, int]): The first cell.
+        pos2 (tuple[int, int]): The second cell.
+        color (tuple[int, int, int]): The color of the path.
+        width (int): The width of each node in the grid.
+        height (int): The height of each node in the grid.
+        offset (tuple[int, int], optional): Pixel position of the frame's top left corner in the full image.
+    """
+    pt1 = (width // 2 + width * pos1[0] - offset[0], height // 2 + height * pos1[1] - offset[1])
+    pt2 = (width // 2 + width * pos2[0] - offset[0], height // 2 + height * pos2[1] - offset[1])
+    cv2.line(frame, pt1, pt2, color, lineType=cv2.LINE_AA, thickness=2)
+
+
+class PathOverlay:
+    """
+    Keeps a frame with solver paths drawn over the maze image, drawing only what changed since the last update.
+
+    Appended segments are drawn on top of the frame. Popped segments are erased by restoring their area from the
+    maze image and redrawing, clipped to that area, the markers and remaining segments that overlap it. Segments
+    appended under a later path are redrawn the same way. The frame always matches draw_path on a fresh copy of
+    the maze image.
+    """
+
+    # pixels an anti-aliased line of thickness 2 or a marker can spread beyond its end points
+    LINE_PAD = 4
+    MARKER_PAD = 7
+
+    def __init__(self, maze_img, color, width=18, height=18, start_pos=None, end_pos=None, targets=()):
+        """
+        Initializes the overlay with the maze image it is drawn over.
+
+        Args:
+            maze_img (numpy.ndarray): The maze image, only read by the overlay.
+            color (tuple[int, int, int]): The color of the paths.
+            width (int, optional): The width of each node in the grid. Defaults to 18.
+            height (int, optional): The height of each node in the grid. Defaults to 18.
+            start_pos (tuple[int, int], optional): Start position to mark. Defaults to None.
+            end_pos (tuple[int, int], optional): End position to mark. Defaults to None.
+            targets (iterable, optional): More positions to mark after them. Defaults to ().
+        """
+        self.maze_img = maze_img
+        self.frame = maze_img.copy()
+        self.color = color
+        self.width = width
+        self.height = height
+        self.__markers = [pos for pos in (start_pos, end_pos) if pos is not None] + list(targets)
+        self.__paths = []
+        self.__indexes = []
+        for pos in self.__markers:
+            draw_marker(self.frame, pos, width, height)
+
+    @classmethod
+    def for_solver(cls, maze_img, color, maze_solver: MazeSolver, width=18, height=18):
+        """
+        Creates an overlay marking the positions draw_path marks for a solver.
+
+        Args:
+            maze_img (numpy.ndarray): The maze image.
+            color (tuple[int, int, int]): The color of the paths.
+            maze_solver (MazeSolver | BidirectionalSolver | MultiTargetSolver): The solver whose paths will be drawn.
+            width (int, optional): The width of each node in the grid. Defaults to 18.
+            height (int, optional): The height of each node in the grid. Defaults to 18.
+
+        Returns:
+            PathOverlay: The new overlay.
+        """
+        return cls(maze_img, color, width, height, targets=solver_markers(maze_solver))
+
+    def update(self, path, index=0):
+        """
+        Brings the frame up to date with a path, typically MazeSolver.path or one of a solver's paths.
+
+        Paths are expected to change at the tail only, like a solver path from a fixed start.
+
+        Args:
+            path (list[tuple[int, int]]): The positions of the path.
+            index (int, optional): Which of the solver's paths it is. Defaults to 0.
+
+        Returns:
+            numpy.ndarray: The frame with the paths drawn.
+        """
+        drawn = self.__path(index)
+        keep = min(len(drawn), len(path))
+        while keep and drawn[keep - 1] != path[keep - 1]:
+            keep -= 1
+        while len(drawn) > keep:
+            self.__erase_last(index)
+        for pos in path[len(drawn):]:
+            self.__append(index, pos)
+        return self.frame
+
+    def apply(self, events):
+        """
+        Brings the frame up to date with the PathPush and PathPop events of a solver, see MazeSolver.steps.
+
+        Args:
+            events (iterable): The events since the last update.
+
+        Returns:
+            numpy.ndarray: The frame with the paths drawn.
+        """
+        for event in events:
+            if isinstance(event, PathPush):
+                self.__append(event.path, event.pos)
+            else:
+                self.__erase_last(event.path)
+        return self.frame
+
+    def __path(self, index):
+        while len(self.__paths) <= index:
+            self.__paths.append([])
+            self.__indexes.append({})
+        return self.__paths[index]
+
+    def __append(self, index, pos):
+        drawn = self.__path(index)
+        self.__indexes[index][pos] = len(drawn)
+        drawn.append(pos)
+        if len(drawn) < 2:
+            return
+        # a segment under a later path is drawn by restoring the area, so the later path stays on top
+        area = self.__clip(self.__box((drawn[-2], pos), self.LINE_PAD))
+        if self.__segments_near(area, range(index + 1, len(self.__paths))):
+            self.__redraw(area)
+        else:
+            draw_segment(self.frame, drawn[-2], pos, self.color, self.width, self.height)
+
+    def __box(self, positions, pad):
+        xs = [self.width // 2 + self.width * x for x, _ in positions]
+        ys = [self.height // 2 + self.height * y for _, y in positions]
+        return min(xs) - pad, min(ys) - pad, max(xs) + pad + 1, max(ys) + pad + 1
+
+    def __clip(self, box):
+        frame_height, frame_width = self.frame.shape[:2]
+        return max(box[0], 0), max(box[1], 0), min(box[2], frame_width), min(box[3], frame_height)
+
+    def __segments_near(self, area, path_indexes):
+        """
+        Finds the drawn segments overlapping an area.
+
+        Returns:
+            list: (box, (path index, segment index)) pairs in drawing order, segment i joining positions i - 1 and i.
+        """
+        x0, y0, x1, y1 = area
+        near = self.LINE_PAD // min(self.width, self.height) + 2
+        cx0, cy0 = x0 // self.width - near, y0 // self.height - near
+        cx1, cy1 = x1 // self.width + near, y1 // self.height + near
+        found = []
+        for path_index in path_indexes:
+            drawn, indexes = self.__paths[path_index], self.__indexes[path_index]
+            segments = set()
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    index = indexes.get((cx, cy))
+                    if index is not None:
+                        segments.update(i for i in (index, index + 1) if 0 < i < len(drawn))
+            for i in sorted(segments):
+                box = self.__box((drawn[i - 1], drawn[i]), self.LINE_PAD)
+                if box[0] < x1 and x0 < box[2] and box[1] < y1 and y0 < box[3]:
+                    found.append((box, (path_index, i)))
+        return found
+
+    def __erase_last(self, index):
+        """
+        Removes the last position of a path and the segment leading to it.
+        """
+        drawn = self.__path(index)
+        pos = drawn.pop()
+        del self.__indexes[index][pos]
+        if drawn:
+            self.__redraw(self.__clip(self.__box((drawn[-1], pos), self.LINE_PAD)))
+
+    def __redraw(self, area):
+        """
+        Restores an area from the maze image and redraws what overlaps it, markers first, then the segments in
+        draw_path order.
+        """
+        x0, y0, x1, y1 = area
+        frame_height, frame_width = self.frame.shape[:2]
+        items = [(self.__box((marker,), self.MARKER_PAD), marker) for marker in self.__markers]
+        items = [item for item in items if item[0][0] < x1 and x0 < item[0][2] and item[0][1] < y1 and y0 < item[0][3]]
+        segments = self.__segments_near(area, range(len(self.__paths)))
+
+        # draw on a canvas large enough that nothing is clipped, then copy back only the restored area
+        boxes = [box for box, _ in items + segments]
+        bx0 = max(min([x0] + [box[0] for box in boxes]), 0)
+        by0 = max(min([y0] + [box[1] for box in boxes]), 0)
+        bx1 = min(max([x1] + [box[2] for box in boxes]), frame_width)
+        by1 = min(max([y1] + [box[3] for box in boxes]), frame_height)
+        canvas = self.frame[by0:by1, bx0:bx1].copy()
+        canvas[y0 - by0:y1 - by0, x0 - bx0:x1 - bx0] = self.maze_img[y0:y1, x0:x1]
+        for _, marker in items:
+            draw_marker(canvas, marker, self.width, self.height, offset=(bx0, by0))
+        for _, (path_index, i) in segments:
+            drawn = self.__paths[path_index]
+            draw_segment(canvas, drawn[i - 1], drawn[i], self.color, self.width, self.height, offset=(bx0, by0))
+        self.frame[y0:y1, x0:x1] = canvas[y0 - by0:y1 - by0, x0 - bx0:x1 - bx0]
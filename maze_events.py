@@ -0,0 +1,54 @@
+from typing import NamedTuple
+
+
+class Carve(NamedTuple):
+    """
+    The generator removed the wall between two cells and moved its cursor from start to end.
+    """
+    start: tuple
+    end: tuple
+
+
+class Backtrack(NamedTuple):
+    """
+    The generator cursor jumped from start back to a pending position, end.
+    """
+    start: tuple
+    end: tuple
+
+
+class PathPush(NamedTuple):
+    """
+    The solver appended a position to its path, path being its index in the solver's paths.
+    """
+    pos: tuple
+    path: int = 0
+
+
+class PathPop(NamedTuple):
+    """
+    The solver removed the last position of its path, path being its index in the solver's paths.
+    """
+    pos: tuple
+    path: int = 0
+
+
+def batched(events, batch_size):
+    """
+    Groups an event iterator into lists.
+
+    Args:
+        events (iterable): The events.
+        batch_size (int): Maximum number of events per list.
+
+    Yields:
+        list: Consecutive events, the last list may be shorter.
+    """
+    batch = []
+    for event in events:
+        batch.append(event)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
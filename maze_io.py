@@ -0,0 +1,156 @@
+import struct
+
+import numpy as np
+
+from MazeGrid import MazeGrid, LEFT, TOP, RIGHT, BOTTOM
+
+MAGIC = b"MAZE"
+VERSION = 1
+
+# magic, version, width, height, whether a seed is stored, seed, algorithm name
+HEADER = struct.Struct("<4sHxxII?7xq16s")
+
+
+def pack_walls(walls):
+    """
+    Packs a (width, height) wall array two cells per byte, keeping each column in its own row of bytes.
+
+    Args:
+        walls (numpy.ndarray): A (width, height) uint8 array of wall masks.
+
+    Returns:
+        numpy.ndarray: A (width, ceil(height / 2)) uint8 array, cell y in the low nibble when y is even.
+    """
+    width, height = walls.shape
+    packed = np.zeros((width, (height + 1) // 2), dtype=np.uint8)
+    packed |= walls[:, 0::2]
+    packed[:, :height // 2] |= walls[:, 1::2] << 4
+    return packed
+
+
+def unpack_walls(packed, height, y_start=0):
+    """
+    Inverse of pack_walls, for whole columns or a band of rows.
+
+    Args:
+        packed (numpy.ndarray): Packed columns, as returned by pack_walls or a slice of its columns.
+        height (int): Number of cells to return per column.
+        y_start (int, optional): The cell row of the first nibble read, must be even. Defaults to 0.
+
+    Returns:
+        numpy.ndarray: A new (columns, height) uint8 array of wall masks.
+    """
+    band = packed[:, y_start // 2:(y_start + height + 1) // 2]
+    walls = np.empty((band.shape[0], 2 * band.shape[1]), dtype=np.uint8)
+    np.bitwise_and(band, 15, out=walls[:, 0::2])
+    np.right_shift(band, 4, out=walls[:, 1::2])
+    return np.ascontiguousarray(walls[:, :height])
+
+
+def save_maze(path, maze, seed=None, algorithm=""):
+    """
+    Saves a maze to a compact binary file, 4 wall bits per cell.
+
+    Args:
+        path (str | BinaryIO): The file path, or a binary file object to write to.
+        maze (MazeGrid | list[list[MazeNode]]): The maze.
+        seed (int, optional): The seed the maze was generated with, stored for reference. Defaults to None.
+        algorithm (str, optional): The name of the algorithm that generated it, up to 16 characters.
+            Defaults to "".
+
+    Raises:
+        ValueError: If the algorithm name is too long or the seed doesn't fit in a signed 64-bit integer.
+    """
+    walls = MazeGrid.from_nodes(maze).walls
+    name = algorithm.encode("ascii")
+    if len(name) > 16:
+        raise ValueError(f"algorithm name {algorithm!r} is longer than 16 characters")
+    if seed is not None and not -2 ** 63 <= seed < 2 ** 63:
+        raise ValueError(f"seed {seed} does not fit in the 64-bit signed field of the maze format")
+    header = HEADER.pack(MAGIC, VERSION, walls.shape[0], walls.shape[1], seed is not None, 0 if seed is None else seed,
+                         name)
+    if hasattr(path, "write"):
+        path.write(header)
+        path.write(pack_walls(walls).tobytes())
+        return
+    with open(path, "wb") as file:
+        file.write(header)
+        pack_walls(walls).tofile(file)
+
+
+class MazeFile:
+    """
+    A maze file opened with load_maze. The packed walls are memory mapped, so reading a region only touches
+    the pages of the columns it spans.
+    """
+
+    def __init__(self, path):
+        """
+        Opens a maze file.
+
+        Args:
+            path (str): The file path.
+
+        Raises:
+            ValueError: If the file is not a maze file or was written by an unsupported version.
+        """
+        with open(path, "rb") as file:
+            header = file.read(HEADER.size)
+        if len(header) < HEADER.size or header[:4] != MAGIC:
+            raise ValueError(f"{path} is not a maze file")
+        _, version, self.width, self.height, has_seed, seed, name = HEADER.unpack(header)
+        if version != VERSION:
+            raise ValueError(f"unsupported maze file version {version}")
+        self.path = path
+        self.seed = seed if has_seed else None
+        self.algorithm = name.rstrip(b"\0").decode("ascii")
+        self.packed = np.memmap(path, dtype=np.uint8, mode="r", offset=HEADER.size,
+                                shape=(self.width, (self.height + 1) // 2))
+
+    def to_grid(self):
+        """
+        Reads the whole maze.
+
+        Returns:
+            MazeGrid: A new grid with the maze.
+        """
+        return MazeGrid(unpack_walls(self.packed, self.height))
+
+    def region(self, x, y, width, height, seal=True):
+        """
+        Reads a rectangle of the maze, position (x, y) in the file becomes (0, 0) in the returned grid.
+
+        Args:
+            x (int): The first column.
+            y (int): The first row.
+            width (int): Number of columns.
+            height (int): Number of rows.
+            seal (bool, optional): Whether to close the openings on the border of the rectangle, so solvers
+                and generators can't step outside it. Defaults to True.
+
+        Returns:
+            MazeGrid: A new grid with the region.
+        """
+        if not (0 <= x and 0 <= y and 0 < width and 0 < height
+                and x + width <= self.width and y + height <= self.height):
+            raise IndexError(f"region ({x}, {y}, {width}, {height}) is outside the {self.width}x{self.height} maze")
+        walls = np.ascontiguousarray(unpack_walls(self.packed[x:x + width], height + y % 2, y - y % 2)[:, y % 2:])
+        if seal:
+            walls[0, :] |= LEFT
+            walls[-1, :] |= RIGHT
+            walls[:, 0] |= TOP
+            walls[:, -1] |= BOTTOM
+        return MazeGrid(walls)
+
+
+def load_maze(path):
+    """
+    Opens a maze file saved with save_maze without reading the walls yet.
+
+    Args:
+        path (str): The file path.
+
+    Returns:
+        MazeFile: The opened file, use to_grid() for the whole maze or region() for a part of it.
+    """
+    return MazeFile(path)
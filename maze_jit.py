@@ -0,0 +1,594 @@
+import importlib.util
+import os
+
+import numpy as np
+
+# Optional Numba kernels for the one-shot loops: MazeGenerator.run, MazeSolver.solve, BidirectionalSolver.solve,
+# distance_field and rasterize_maze.
+# The kernels are plain Python over flat arrays, compiled with numba.njit the first time one is needed, so
+# importing this module never loads Numba. Without Numba the callers keep their own interpreted fast paths.
+AVAILABLE = importlib.util.find_spec("numba") is not None
+# MAZE_JIT=0 turns the kernels off even when Numba is installed
+ENABLED = AVAILABLE and os.environ.get("MAZE_JIT", "1") != "0"
+# importing Numba and loading the cached kernels takes about half a second, more than smaller mazes take to run
+MIN_CELLS = 1 << 18
+
+# Mersenne Twister constants, the generator behind Python's random module
+_N, _M = 624, 397
+_MASK = 0xFFFFFFFF
+
+_compiled = False
+
+
+def use_jit(cells):
+    """
+    Indicates if a maze of the given size should run on the compiled kernels.
+
+    Args:
+        cells (int): Number of cells of the maze.
+
+    Returns:
+        bool: True when the kernels are enabled and the maze is at least MIN_CELLS large.
+    """
+    return ENABLED and cells >= MIN_CELLS
+
+
+def _compile():
+    """
+    Replaces the kernels of this module by their compiled versions, loaded from Numba's cache after the first run.
+
+    Helpers are compiled before the kernels calling them, since Numba resolves them from the module globals.
+    """
+    global _compiled
+    if _compiled or not AVAILABLE:
+        return
+    import numba
+    module = globals()
+    for name in ("_twist", "_genrand", "_randbelow", "_seed", "_moves_from", "_backtracker", "_bfs", "_heap_push",
+                 "_heap_pop", "_astar", "_meet_step", "_meet", "_trace", "_paint_stamps"):
+        module[name] = numba.njit(cache=True, nogil=True)(module[name])
+    _compiled = True
+
+
+def _twist(mt):
+    for i in range(_N):
+        y = (mt[i] & 0x80000000) | (mt[(i + 1) % _N] & 0x7FFFFFFF)
+        mt[i] = mt[(i + _M) % _N] ^ (y >> 1) ^ (0x9908B0DF if y & 1 else 0)
+
+
+def _genrand(mt, pos):
+    """
+    Returns the next 32-bit output of the generator, pos[0] being its index in the state like in getstate().
+    """
+    if pos[0] >= _N:
+        _twist(mt)
+        pos[0] = 0
+    y = mt[pos[0]]
+    pos[0] += 1
+    y ^= y >> 11
+    y ^= (y << 7) & 0x9D2C5680
+    y ^= (y << 15) & 0xEFC60000
+    y ^= y >> 18
+    return y & _MASK
+
+
+def _randbelow(mt, pos, n):
+    """
+    random.Random._randbelow for n <= 2 ** 32: rejection sampling on getrandbits(n.bit_length()).
+    """
+    bits = 0
+    while n >> bits:
+        bits += 1
+    r = _genrand(mt, pos) >> (32 - bits)
+    while r >= n:
+        r = _genrand(mt, pos) >> (32 - bits)
+    return r
+
+
+def _seed(mt, pos, seed):
+    """
+    random.Random.seed for an int below 2 ** 63 in absolute value, init_by_array over its 32-bit words.
+    """
+    seed = abs(seed)
+    key = np.empty(2, dtype=np.int64)
+    key[0], key[1] = seed & _MASK, seed >> 32
+    key_length = 2 if key[1] else 1
+
+    mt[0] = 19650218
+    for i in range(1, _N):
+        mt[i] = (1812433253 * (mt[i - 1] ^ (mt[i - 1] >> 30)) + i) & _MASK
+    i, j = 1, 0
+    for _ in range(max(_N, key_length)):
+        mt[i] = ((mt[i] ^ ((mt[i - 1] ^ (mt[i - 1] >> 30)) * 1664525)) + key[j] + j) & _MASK
+        i += 1
+        j += 1
+        if i >= _N:
+            mt[0] = mt[_N - 1]
+            i = 1
+        if j >= key_length:
+            j = 0
+    for _ in range(_N - 1):
+        mt[i] = ((mt[i] ^ ((mt[i - 1] ^ (mt[i - 1] >> 30)) * 1566083941)) - i) & _MASK
+        i += 1
+        if i >= _N:
+            mt[0] = mt[_N - 1]
+            i = 1
+    mt[0] = 0x80000000
+    pos[0] = _N
+
+
+def _moves_from(visited, index, width, height, moves):
+    """
+    Writes the unvisited neighbor directions of a cell to moves, in neighbor order, returning how many there are.
+    """
+    x, y = index // height, index % height
+    count = 0
+    if x > 0 and not visited[index - height]:
+        moves[count] = 0
+        count += 1
+    if y > 0 and not visited[index - 1]:
+        moves[count] = 1
+        count += 1
+    if x + 1 < width and not visited[index + height]:
+        moves[count] = 2
+        count += 1
+    if y + 1 < height and not visited[index + 1]:
+        moves[count] = 3
+        count += 1
+    return count
+
+
+def _backtracker(walls, visited, remain, head, tail, current, first, width, height, pop_first, mt, pos,
+                 steps_per_seed, step_counter, seed):
+    """
+    The loop of MazeGenerator.run over flat arrays, remain[head:tail] holding the pending cells.
+    """
+    deltas = np.array([-height, -1, height, 1], dtype=np.int64)
+    moves = np.empty(4, dtype=np.int64)
+    carves = backtracks = pops = 0
+    remain_peak = tail - head
+    while True:
+        count = _moves_from(visited, current, width, height, moves)
+        if not (tail > head or first or count):
+            break
+        if steps_per_seed >= 0:
+            if step_counter >= steps_per_seed:
+                seed += 1
+                step_counter = 0
+            _seed(mt, pos, seed)
+            step_counter += 1
+
+        if count:
+            direction = moves[_randbelow(mt, pos, count)]
+            if count > 1:
+                remain[tail] = current
+                tail += 1
+                remain_peak = max(remain_peak, tail - head)
+            next_index = current + deltas[direction]
+            visited[next_index] = 1
+            carves += 1
+            walls[current] &= 15 ^ (1 << direction)
+            walls[next_index] &= 15 ^ (1 << ((direction + 2) % 4))
+            current = next_index
+        else:
+            backtracks += 1
+            while tail > head:
+                if pop_first:
+                    current = remain[head]
+                    head += 1
+                else:
+                    tail -= 1
+                    current = remain[tail]
+                pops += 1
+                if _moves_from(visited, current, width, height, moves):
+                    break
+        first = False
+    return current, head, tail, first, step_counter, seed, carves, backtracks, pops, remain_peak
+
+
+def run_backtracker(walls, visited, remain, cursor, first, pop_first, rng, steps_per_seed, step_counter, seed):
+    """
+    Runs the backtracker of MazeGenerator.run to completion, drawing the same numbers from rng.
+
+    Args:
+        walls (numpy.ndarray): The (width, height) wall array, updated in place.
+        visited (bytearray): The generator's visited flags by flat index, updated in place.
+        remain (collections.deque): The generator's pending positions, updated in place.
+        cursor (tuple): The cursor position.
+        first (bool): Whether the generator hasn't taken its first step yet.
+        pop_first (bool): Same as in MazeGenerator.next_step.
+        rng (random.Random): The generator's random stream, left in the state the interpreted loop would leave it.
+        steps_per_seed (int): MazeGenerator.step_to_next_random, or None.
+        step_counter (int): Steps since the last reseed, in compatibility mode.
+        seed (int): The current seed, in compatibility mode.
+
+    Returns:
+        tuple: The new cursor, first, step_counter and seed, then the carves, backtracks, pending pops and the
+            largest number of pending positions, for the stats.
+    """
+    _compile()
+    width, height = walls.shape
+    flat = np.ascontiguousarray(walls).reshape(-1).copy()
+    pending = np.empty(len(remain) + width * height, dtype=np.int64)
+    pending[:len(remain)] = [x * height + y for x, y in remain]
+    version, state, gauss = rng.getstate()
+    mt = np.array(state[:_N], dtype=np.int64)
+    pos = np.array([state[_N]], dtype=np.int64)
+
+    current, head, tail, first, step_counter, seed, carves, backtracks, pops, remain_peak = _backtracker(
+        flat, np.frombuffer(visited, dtype=np.uint8), pending, 0, len(remain), cursor[0] * height + cursor[1], first,
+        width, height, pop_first, mt, pos, -1 if steps_per_seed is None else steps_per_seed, step_counter, seed)
+
+    walls[...] = flat.reshape(walls.shape)
+    remain.clear()
+    remain.extend(divmod(int(index), height) for index in pending[head:tail])
+    rng.setstate((version, tuple(int(value) for value in mt) + (int(pos[0]),), gauss))
+    return divmod(int(current), height), bool(first), int(step_counter), int(seed), int(carves), int(backtracks), \
+        int(pops), int(remain_peak)
+
+
+def _bfs(walls, closed, parent, depth, queue, head, tail, end, height):
+    """
+    The breadth-first loop of MazeSolver.solve, queue[head:tail] holding the frontier.
+    """
+    deltas = np.array([-height, -1, height, 1], dtype=np.int64)
+    index, found, expanded = -1, False, 0
+    while head < tail:
+        cell = queue[head]
+        head += 1
+        if closed[cell]:
+            continue
+        index = cell
+        closed[index] = 1
+        expanded += 1
+        if index == end:
+            found = True
+            break
+        next_depth = depth[index] + 1
+        mask = walls[index]
+        for direction in range(4):
+            if mask & (1 << direction):
+                continue
+            neighbor = index + deltas[direction]
+            if closed[neighbor] or 0 <= depth[neighbor] <= next_depth:
+                continue
+            depth[neighbor] = next_depth
+            parent[neighbor] = index
+            queue[tail] = neighbor
+            tail += 1
+    return index, found, expanded
+
+
+def distances_from(walls, source):
+    """
+    Returns the number of moves from source to every cell, the breadth-first search of distance_field run to
+    exhaustion.
+
+    Args:
+        walls (numpy.ndarray): The (width, height) wall array.
+        source (tuple): The position distances are measured from.
+
+    Returns:
+        numpy.ndarray: The (width * height,) int32 distances by flat index, -1 for cells that can't be reached.
+    """
+    _compile()
+    width, height = walls.shape
+    size = width * height
+    depth = np.full(size, -1, dtype=np.int32)
+    start = source[0] * height + source[1]
+    depth[start] = 0
+    queue = np.empty(size, dtype=np.int64)
+    queue[0] = start
+    # no cell has index -1, so the search only stops once every reachable cell is closed
+    _bfs(np.ascontiguousarray(walls).reshape(-1), np.zeros(size, dtype=np.uint8), np.zeros(size, dtype=np.int32),
+         depth, queue, 0, 1, -1, height)
+    return depth
+
+
+def _heap_push(keys, items, size, key, item):
+    """
+    Pushes onto a binary min-heap of int64 keys, growing its arrays when full.
+    """
+    if size == keys.size:
+        keys, items = np.concatenate((keys, keys)), np.concatenate((items, items))
+    i = size
+    while i > 0:
+        up = (i - 1) // 2
+        if keys[up] < key:
+            break
+        keys[i], items[i] = keys[up], items[up]
+        i = up
+    keys[i], items[i] = key, item
+    return keys, items, size + 1
+
+
+def _heap_pop(keys, items, size):
+    """
+    Removes the smallest entry of a heap built by _heap_push, returning its item and the new size.
+    """
+    top = items[0]
+    size -= 1
+    key, item = keys[size], items[size]
+    i = 0
+    while True:
+        child = 2 * i + 1
+        if child >= size:
+            break
+        if child + 1 < size and keys[child + 1] < keys[child]:
+            child += 1
+        if key < keys[child]:
+            break
+        keys[i], items[i] = keys[child], items[child]
+        i = child
+    if size:
+        keys[i], items[i] = key, item
+    return top, size
+
+
+def _astar(walls, closed, parent, depth, keys, items, size, counter, end, end_x, end_y, height):
+    """
+    The A* loop of MazeSolver.solve. Keys pack the (f, counter) of the heapq tuples as f << 32 | counter, so
+    cells are expanded in exactly the same order.
+    """
+    deltas = np.array([-height, -1, height, 1], dtype=np.int64)
+    index, found, expanded = -1, False, 0
+    while size:
+        cell, size = _heap_pop(keys, items, size)
+        if closed[cell]:
+            continue
+        index = cell
+        closed[index] = 1
+        expanded += 1
+        if index == end:
+            found = True
+            break
+        next_depth = depth[index] + 1
+        mask = walls[index]
+        for direction in range(4):
+            if mask & (1 << direction):
+                continue
+            neighbor = index + deltas[direction]
+            if closed[neighbor] or 0 <= depth[neighbor] <= next_depth:
+                continue
+            depth[neighbor] = next_depth
+            parent[neighbor] = index
+            counter += 1
+            x, y = neighbor // height, neighbor % height
+            f = next_depth + abs(x - end_x) + abs(y - end_y)
+            keys, items, size = _heap_push(keys, items, size, (f << 32) | counter, neighbor)
+    return index, found, expanded, counter
+
+
+def search(walls, height, closed, parent, depth, frontier, astar, counter, end_pos):
+    """
+    Runs the search of MazeSolver.solve to completion.
+
+    Args:
+        walls (bytes): The wall masks by flat index.
+        height (int): The height of the maze.
+        closed (bytearray): The solver's expanded flags, updated in place.
+        parent (array.array): The solver's parent indexes, updated in place.
+        depth (array.array): The solver's depths, updated in place.
+        frontier (collections.deque | list): The solver's BFS queue or A* heap of (f, counter, index) tuples.
+        astar (bool): Whether frontier is an A* heap.
+        counter (int): The solver's A* tie-break counter.
+        end_pos (tuple): The end position.
+
+    Returns:
+        tuple: The last cell index expanded or None, whether it is the end, the number of cells expanded and the
+            new counter.
+    """
+    _compile()
+    size = len(walls)
+    flat = np.frombuffer(walls, dtype=np.uint8)
+    closed = np.frombuffer(closed, dtype=np.uint8)
+    parent, depth = np.frombuffer(parent, dtype=np.int32), np.frombuffer(depth, dtype=np.int32)
+    end = end_pos[0] * height + end_pos[1]
+    if astar:
+        capacity = len(frontier) + size // 4 + 16
+        keys, items = np.empty(capacity, dtype=np.int64), np.empty(capacity, dtype=np.int64)
+        # a heapq list already satisfies the heap property, and packing keeps its ordering
+        for i, (f, rank, item) in enumerate(frontier):
+            keys[i], items[i] = f << 32 | rank, item
+        index, found, expanded, counter = _astar(flat, closed, parent, depth, keys, items, len(frontier), counter,
+                                                 end, end_pos[0], end_pos[1], height)
+    else:
+        queue = np.empty(len(frontier) + size, dtype=np.int64)
+        queue[:len(frontier)] = list(frontier)
+        index, found, expanded = _bfs(flat, closed, parent, depth, queue, 0, len(frontier), end, height)
+    frontier.clear()
+    return (None if index < 0 else int(index)), bool(found), int(expanded), int(counter)
+
+
+def _meet_step(walls, deltas, closed, parent, depth, other_depth, keys, items, head, size, counter, astar, target_x,
+               target_y, root_x, root_y, offset, height, best, near, far):
+    """
+    Expands the next cell of one side of BidirectionalSolver.solve, recording the shortest meeting as the cell
+    near of this side next to the cell far reached by the other one.
+    """
+    if astar:
+        index, size = _heap_pop(keys, items, size)
+    else:
+        index = items[head]
+        head += 1
+    closed[index] = 1
+    next_depth = depth[index] + 1
+    mask = walls[index]
+    for direction in range(4):
+        if mask & (1 << direction):
+            continue
+        neighbor = index + deltas[direction]
+        if other_depth[neighbor] >= 0 and (best < 0 or next_depth + other_depth[neighbor] < best):
+            best = next_depth + other_depth[neighbor]
+            near, far = index, neighbor
+        if closed[neighbor] or 0 <= depth[neighbor] <= next_depth:
+            continue
+        depth[neighbor] = next_depth
+        parent[neighbor] = index
+        if astar:
+            counter += 1
+            x, y = neighbor // height, neighbor % height
+            # twice the key of the interpreted heap, whose potential is a multiple of 1/2, made non-negative
+            f = 2 * next_depth + abs(x - target_x) + abs(y - target_y) - abs(x - root_x) - abs(y - root_y) + offset
+            keys, items, size = _heap_push(keys, items, size, (f << 32) | counter, neighbor)
+        else:
+            items[size] = neighbor
+            size += 1
+    return keys, items, head, size, counter, best, near, far
+
+
+def _meet(walls, astar, height, offset, start_x, start_y, end_x, end_y, best, meet0, meet1,
+          closed0, parent0, depth0, keys0, items0, head0, size0, counter0,
+          closed1, parent1, depth1, keys1, items1, head1, size1, counter1):
+    """
+    The loop of BidirectionalSolver.solve, side 0 searching from the start and side 1 from the end. The frontier of
+    a side is the heap keys and items[:size] for A*, the queue items[head:size] for BFS. The shortest meeting
+    found is the cell meet0 of side 0 next to the cell meet1 of side 1.
+    """
+    deltas = np.array([-height, -1, height, 1], dtype=np.int64)
+    expanded = 0
+    while True:
+        if astar:
+            while size0 and closed0[items0[0]]:
+                _, size0 = _heap_pop(keys0, items0, size0)
+            while size1 and closed1[items1[0]]:
+                _, size1 = _heap_pop(keys1, items1, size1)
+            if not size0 or not size1:
+                break
+            if best >= 0 and (keys0[0] >> 32) + (keys1[0] >> 32) - 2 * offset >= 2 * best:
+                break
+        else:
+            if head0 == size0 or head1 == size1:
+                break
+            if best >= 0 and depth0[items0[head0]] + depth1[items1[head1]] >= best:
+                break
+
+        expanded += 1
+        if size0 - head0 <= size1 - head1:
+            keys0, items0, head0, size0, counter0, best, meet0, meet1 = _meet_step(
+                walls, deltas, closed0, parent0, depth0, depth1, keys0, items0, head0, size0, counter0, astar, end_x,
+                end_y, start_x, start_y, offset, height, best, meet0, meet1)
+        else:
+            keys1, items1, head1, size1, counter1, best, meet1, meet0 = _meet_step(
+                walls, deltas, closed1, parent1, depth1, depth0, keys1, items1, head1, size1, counter1, astar, start_x,
+                start_y, end_x, end_y, offset, height, best, meet1, meet0)
+    return best, meet0, meet1, expanded, counter0, counter1
+
+
+def meet(walls, height, sides, astar, start_pos, end_pos, best, meeting):
+    """
+    Runs the search of BidirectionalSolver.solve until no shorter meeting can remain.
+
+    Args:
+        walls (bytes): The wall masks by flat index.
+        height (int): The height of the maze.
+        sides (tuple): For the side from the start, then the one from the end: its expanded flags (bytearray),
+            parent indexes and depths (array.array), all updated in place, its BFS queue or A* heap of
+            (f, counter, index) tuples, emptied, and its A* tie-break counter.
+        astar (bool): Whether the frontiers are A* heaps.
+        start_pos (tuple): The start position.
+        end_pos (tuple): The end position.
+        best (int): The length of the shortest meeting found so far, or None.
+        meeting (tuple): Its cell on each side, or None.
+
+    Returns:
+        tuple: The new best and meeting, the number of cells expanded and the new counter of each side.
+    """
+    _compile()
+    size = len(walls)
+    # twice the potential of a cell is at least minus the width plus the height, this keeps the heap keys positive
+    offset = size // height + height
+    arguments = []
+    for closed, parent, depth, frontier, counter in sides:
+        if astar:
+            capacity = len(frontier) + size // 4 + 16
+            keys, items = np.empty(capacity, dtype=np.int64), np.empty(capacity, dtype=np.int64)
+            for i, (f, rank, item) in enumerate(frontier):
+                keys[i], items[i] = (round(2 * f) + offset) << 32 | rank, item
+            head, tail = 0, len(frontier)
+        else:
+            keys, items = np.empty(1, dtype=np.int64), np.empty(len(frontier) + size, dtype=np.int64)
+            items[:len(frontier)] = list(frontier)
+            head, tail = 0, len(frontier)
+        frontier.clear()
+        arguments += [np.frombuffer(closed, dtype=np.uint8), np.frombuffer(parent, dtype=np.int32),
+                      np.frombuffer(depth, dtype=np.int32), keys, items, head, tail, counter]
+    meet0, meet1 = (-1, -1) if meeting is None else meeting
+    best, meet0, meet1, expanded, counter0, counter1 = _meet(
+        np.frombuffer(walls, dtype=np.uint8), astar, height, offset, start_pos[0], start_pos[1], end_pos[0],
+        end_pos[1], -1 if best is None else best, meet0, meet1, *arguments)
+    if best < 0:
+        return None, None, int(expanded), int(counter0), int(counter1)
+    return int(best), (int(meet0), int(meet1)), int(expanded), int(counter0), int(counter1)
+
+
+def _trace(parent, index, length):
+    """
+    Returns the cell indexes from the root down to index, following length - 1 parent pointers.
+    """
+    path = np.empty(length, dtype=np.int64)
+    for i in range(length - 1, -1, -1):
+        path[i] = index
+        index = parent[index]
+    return path
+
+
+def trace_path(parent, depth, index, height):
+    """
+    Returns the positions from the start of a search down to an expanded cell.
+
+    Args:
+        parent (array.array): The solver's parent indexes.
+        depth (array.array): The solver's depths.
+        index (int): The cell to trace back from.
+        height (int): The height of the maze.
+
+    Returns:
+        list: The (x, y) positions of the path.
+    """
+    _compile()
+    path = _trace(np.frombuffer(parent, dtype=np.int32), index, depth[index] + 1)
+    return list(zip((path // height).tolist(), (path % height).tolist()))
+
+
+def _paint_stamps(keys, starts, rows, columns, values, reach, width, height, indexes):
+    """
+    Paints the stamp of every cell in render_node order, column by column, later cells winning where they overlap.
+    The painted pixels of stamp k are rows, columns and values[starts[k]:starts[k + 1]].
+    """
+    maze_width, maze_height = keys.shape[0] - 2 * reach, keys.shape[1] - 2 * reach
+    image_height, image_width = indexes.shape
+    for x in range(maze_width):
+        for y in range(maze_height):
+            key = keys[x + reach, y + reach]
+            top, left = (y - reach) * height, (x - reach) * width
+            for i in range(starts[key], starts[key + 1]):
+                row, column = top + rows[i], left + columns[i]
+                if 0 <= row < image_height and 0 <= column < image_width:
+                    indexes[row, column] = values[i]
+
+
+def paint_stamps(keys, stamps, reach, width, height):
+    """
+    Draws the palette index image of rasterize_maze cell by cell.
+
+    Args:
+        keys (numpy.ndarray): The stamp index of every cell, padded by reach cells on each side.
+        stamps (numpy.ndarray): The stamps from cell_stamps.
+        reach (int): The reach from cell_stamps.
+        width (int): The width of each node in the grid.
+        height (int): The height of each node in the grid.
+
+    Returns:
+        numpy.ndarray: The (image height, image width) palette indexes, 255 where nothing is painted.
+    """
+    _compile()
+    maze_width, maze_height = keys.shape[0] - 2 * reach, keys.shape[1] - 2 * reach
+    painted = stamps != 255
+    starts = np.zeros(len(stamps) + 1, dtype=np.int64)
+    np.cumsum(painted.reshape(len(stamps), -1).sum(axis=1), out=starts[1:])
+    _, rows, columns = np.nonzero(painted)
+    indexes = np.full((maze_height * height, maze_width * width), 255, dtype=np.uint8)
+    _paint_stamps(keys, starts, rows.astype(np.int64), columns.astype(np.int64), stamps[painted], reach, width,
+                  height, indexes)
+    return indexes
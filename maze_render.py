@@ -0,0 +1,131 @@
+import math
+import os
+
+import cv2
+
+from MazeGenerator import MazeGenerator
+from MazeSolver import MazeSolver
+from maze_draw import draw_maze, PathOverlay
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mkv", ".mov")
+
+
+class FrameWriter:
+    """
+    Writes frames either to a video file with cv2.VideoWriter or to a directory as a PNG sequence.
+    """
+
+    def __init__(self, output, fps=30, fourcc="mp4v"):
+        """
+        Initializes the writer.
+
+        Args:
+            output (str): A video file path (.mp4, .avi, .mkv or .mov), or a directory for PNG frames.
+            fps (int, optional): Frames per second of the video. Defaults to 30.
+            fourcc (str, optional): The video codec. Defaults to "mp4v".
+        """
+        self.output = output
+        self.fps = fps
+        self.fourcc = fourcc
+        self.frame_count = 0
+        self.__video = None
+        self.__is_video = os.path.splitext(output)[1].lower() in VIDEO_EXTENSIONS
+        if not self.__is_video:
+            os.makedirs(output, exist_ok=True)
+
+    def write(self, frame):
+        """
+        Writes one frame.
+
+        Args:
+            frame (numpy.ndarray): A BGR image, every frame must have the same size.
+        """
+        if self.__is_video:
+            if self.__video is None:
+                self.__video = cv2.VideoWriter(self.output, cv2.VideoWriter_fourcc(*self.fourcc), self.fps,
+                                               (frame.shape[1], frame.shape[0]))
+                if not self.__video.isOpened():
+                    raise IOError(f"could not open video writer for {self.output}")
+            self.__video.write(frame)
+        else:
+            cv2.imwrite(os.path.join(self.output, f"frame_{self.frame_count:06d}.png"), frame)
+        self.frame_count += 1
+
+    def close(self):
+        """
+        Finishes the video file, if any.
+        """
+        if self.__video is not None:
+            self.__video.release()
+            self.__video = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def render_headless(maze, maze_gen: MazeGenerator, maze_solver: MazeSolver, output, steps_per_frame=1,
+                    total_frames=None, fps=30, hold_frames=0, width=18, height=18, border_thickness=1,
+                    bg_color=(0, 0, 0), node_color=(50, 50, 50), path_color=(0, 0, 255), fourcc="mp4v"):
+    """
+    Renders the maze generation and solving process to a video file or PNG sequence, without a display.
+
+    Each frame advances the generator or solver by several steps. Only the cells named by the generator's events
+    are redrawn on the frame already in memory, and the solver's path events are applied to a PathOverlay.
+
+    Args:
+        maze (MazeGrid): The maze being generated.
+        maze_gen (MazeGenerator): The current state of the maze generation process.
+        maze_solver (MazeSolver | BidirectionalSolver | MultiTargetSolver): The maze solver to animate once the
+            maze is generated.
+        output (str): A video file path, or a directory for PNG frames.
+        steps_per_frame (int, optional): Generator or solver steps per frame. Defaults to 1.
+        total_frames (int, optional): Approximate number of frames to produce, overrides steps_per_frame.
+            Assumes at most two generator steps per unvisited cell and one solver step per cell.
+        fps (int, optional): Frames per second of the video. Defaults to 30.
+        hold_frames (int, optional): Extra copies of the last frame, to pause on the solution. Defaults to 0.
+        width (int, optional): The width of each node in the grid. Defaults to 18.
+        height (int, optional): The height of each node in the grid. Defaults to 18.
+        border_thickness (int, optional): The thickness of the border between nodes. Defaults to 1.
+        bg_color (tuple[int, int, int], optional): The background color of the frame. Defaults to black.
+        node_color (tuple[int, int, int], optional): The color of the nodes. Defaults to dark gray.
+        path_color (tuple[int, int, int], optional): The color of the solver path. Defaults to red.
+        fourcc (str, optional): The video codec. Defaults to "mp4v".
+
+    Returns:
+        int: The number of frames written.
+    """
+    if total_frames is not None:
+        cells = maze.width * maze.height
+        estimated_steps = 2 * (cells - maze_gen.visited_count) + cells
+        steps_per_frame = max(1, math.ceil(estimated_steps / total_frames))
+
+    draw_options = dict(width=width, height=height, border_thickness=border_thickness,
+                        bg_color=bg_color, node_color=node_color)
+    maze_img = draw_maze(maze, cursor_pos=maze_gen.cursor_pos if maze_gen.has_next else None, **draw_options)
+
+    with FrameWriter(output, fps=fps, fourcc=fourcc) as writer:
+        frame = maze_img
+        writer.write(frame)
+        for events in maze_gen.steps(batch_size=steps_per_frame):
+            redraw_list = [pos for event in events for pos in event]
+            cursor_pos = maze_gen.cursor_pos if maze_gen.has_next else None
+            frame = draw_maze(maze, last_frame=maze_img, redraw_list=list(dict.fromkeys(redraw_list)),
+                              cursor_pos=cursor_pos, **draw_options)
+            writer.write(frame)
+
+        path_overlay = PathOverlay.for_solver(maze_img, path_color, maze_solver, width, height)
+        for index, path in enumerate(maze_solver.paths):
+            frame = path_overlay.update(path, index)
+        while maze_solver.has_next:
+            for _ in range(steps_per_frame):
+                if not maze_solver.has_next:
+                    break
+                frame = path_overlay.apply(maze_solver.next_step())
+            writer.write(frame)
+
+        for _ in range(hold_frames):
+            writer.write(frame)
+        return writer.frame_count
@@ -0,0 +1,338 @@
+import argparse
+import asyncio
+import io
+import json
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+
+from MazeSolver import MazeSolver
+from maze_algorithms import generate, ALGORITHMS
+from maze_io import save_maze
+
+MAX_HEADER_BYTES = 16384
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+# a path position held by a cached solve result: the tuple and its two ints
+_POSITION_BYTES = sys.getsizeof((0, 0)) + 2 * sys.getsizeof(1 << 16)
+
+
+def _generate_job(maze_height, maze_width, algorithm, seed):
+    """
+    Generates a maze in a worker process.
+
+    Returns:
+        tuple: The wall array and the maze in the save_maze format.
+    """
+    maze = generate(maze_height, maze_width, algorithm, seed=seed)
+    file = io.BytesIO()
+    save_maze(file, maze, seed=seed, algorithm=algorithm)
+    return maze.walls, file.getvalue()
+
+
+def _solve_job(walls, start_pos, end_pos, algorithm):
+    """
+    Solves a maze in a worker process.
+
+    Returns:
+        list: The shortest path, empty if the end can't be reached.
+    """
+    from MazeGrid import MazeGrid
+    return MazeSolver(MazeGrid(walls), start_pos, end_pos, algorithm=algorithm).solve()
+
+
+def _render_job(walls, path, cell_size):
+    """
+    Draws a maze and its path in a worker process.
+
+    Returns:
+        bytes: The PNG image.
+    """
+    import cv2
+    from MazeGrid import MazeGrid
+    from maze_draw import draw_maze, draw_marker, draw_segment
+
+    image = draw_maze(MazeGrid(walls), width=cell_size, height=cell_size, border_thickness=1,
+                      bg_color=(0, 0, 0), node_color=(50, 50, 50))
+    if path:
+        for pos in (path[0], path[-1]):
+            draw_marker(image, pos, cell_size, cell_size)
+        for pos1, pos2 in zip(path, path[1:]):
+            draw_segment(image, pos1, pos2, (0, 0, 255), cell_size, cell_size)
+    return cv2.imencode(".png", image)[1].tobytes()
+
+
+class RequestError(Exception):
+    """
+    A request that can't be served, answered with the given HTTP status.
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class MazeService:
+    """
+    Serves generate, solve and render requests over HTTP, on a TCP port or a Unix socket.
+
+    Generation, solving and drawing run in an executor, never on the event loop. Results are kept in an LRU cache
+    keyed by the request parameters and bounded by the bytes they hold, and concurrent requests for the same key
+    wait for a single computation. A repeated request is answered from the cache without leaving the event loop.
+
+    Endpoints, all GET, with query parameters width, height, seed and algorithm:
+        /generate: the maze in the save_maze format.
+        /solve: JSON with the path, also takes start=x,y, end=x,y and solver.
+        /render: a PNG of the maze and its path, also takes the solve parameters and cell_size.
+    """
+
+    def __init__(self, executor=None, cache_bytes=512 * 2 ** 20, max_cells=4000 * 4000):
+        """
+        Initializes the service.
+
+        Args:
+            executor (concurrent.futures.Executor, optional): Where the work runs. Defaults to a new
+                ProcessPoolExecutor.
+            cache_bytes (int, optional): Memory budget of the cached results, mazes, paths and images together.
+                The least recently used ones are dropped until it fits, and a result larger than the whole budget
+                isn't kept. Defaults to 512 MiB.
+            max_cells (int, optional): Largest maze a request may ask for. Defaults to 4000 * 4000.
+        """
+        self.executor = executor if executor is not None else ProcessPoolExecutor()
+        self.cache_bytes = cache_bytes
+        self.max_cells = max_cells
+        self.hits = 0
+        self.misses = 0
+        self.cached_bytes = 0
+        # result and size by key, least recently used first
+        self.__cache = OrderedDict()
+        self.__pending = {}
+
+    async def __cached(self, key, compute):
+        """
+        Returns the cached result for key, or computes it once for every concurrent caller.
+        """
+        if key in self.__cache:
+            self.hits += 1
+            self.__cache.move_to_end(key)
+            return self.__cache[key][0]
+        pending = self.__pending.get(key)
+        if pending is None:
+            self.misses += 1
+            pending = self.__pending[key] = asyncio.ensure_future(compute())
+            pending.add_done_callback(lambda future: self.__store(key, future))
+        return await asyncio.shield(pending)
+
+    def __store(self, key, future):
+        del self.__pending[key]
+        if future.cancelled() or future.exception() is not None:
+            return
+        result = future.result()
+        size = _nbytes(result)
+        if size > self.cache_bytes:
+            return
+        self.__cache[key] = result, size
+        self.cached_bytes += size
+        while self.cached_bytes > self.cache_bytes:
+            _, (_, evicted) = self.__cache.popitem(last=False)
+            self.cached_bytes -= evicted
+
+    async def __run(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    def __maze_key(self, query):
+        width, height = _int(query, "width", 50), _int(query, "height", 50)
+        if width < 1 or height < 1 or width * height > self.max_cells:
+            raise RequestError(400, f"maze size must be between 1 and {self.max_cells} cells")
+        algorithm = query.get("algorithm", "backtracker")
+        if algorithm not in ALGORITHMS:
+            raise RequestError(400, f"unknown algorithm {algorithm!r}")
+        seed = _int(query, "seed", 0)
+        # NumPy seeded generators reject negative seeds, and save_maze stores them as signed 64-bit integers
+        if not 0 <= seed < 2 ** 63:
+            raise RequestError(400, f"seed must be between 0 and {2 ** 63 - 1}")
+        return height, width, algorithm, seed
+
+    def __solve_key(self, query):
+        maze_key = self.__maze_key(query)
+        height, width = maze_key[:2]
+        start = _pos(query, "start", (0, 0))
+        end = _pos(query, "end", (width - 1, height - 1))
+        if not all(0 <= x < width and 0 <= y < height for x, y in (start, end)):
+            raise RequestError(400, "start and end must be inside the maze")
+        solver = query.get("solver", "astar")
+        if solver not in ("astar", "bfs"):
+            raise RequestError(400, f"unknown solver {solver!r}")
+        return maze_key, start, end, solver
+
+    async def maze(self, query):
+        """
+        Returns the wall array and the save_maze bytes of a maze.
+        """
+        key = self.__maze_key(query)
+        return await self.__cached(("maze",) + key, lambda: self.__run(_generate_job, *key))
+
+    async def solve(self, query):
+        """
+        Returns the JSON body of a solve request.
+        """
+        maze_key, start, end, solver = self.__solve_key(query)
+
+        async def compute():
+            walls, _ = await self.maze(query)
+            path = await self.__run(_solve_job, walls, start, end, solver)
+            return path, json.dumps({"start": start, "end": end, "found": bool(path), "path": path}).encode()
+
+        return await self.__cached(("solve", maze_key, start, end, solver), compute)
+
+    async def render(self, query):
+        """
+        Returns the PNG body of a render request.
+        """
+        maze_key, start, end, solver = self.__solve_key(query)
+        cell_size = _int(query, "cell_size", 8)
+        if not 1 <= cell_size <= 64 or maze_key[0] * maze_key[1] * cell_size ** 2 > 4 * self.max_cells:
+            raise RequestError(400, "cell_size is out of range for this maze size")
+
+        async def compute():
+            walls, _ = await self.maze(query)
+            path, _ = await self.solve(query)
+            return await self.__run(_render_job, walls, path, cell_size)
+
+        return await self.__cached(("render", maze_key, start, end, solver, cell_size), compute)
+
+    async def respond(self, method, target):
+        """
+        Serves one request.
+
+        Args:
+            method (str): The HTTP method.
+            target (str): The request target, path and query string.
+
+        Returns:
+            tuple[int, str, bytes]: The status, content type and body.
+        """
+        url = urlsplit(target)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            if url.path not in ("/generate", "/solve", "/render"):
+                raise RequestError(404, f"no such endpoint {url.path}")
+            if method != "GET":
+                raise RequestError(405, "only GET is supported")
+            if url.path == "/generate":
+                return 200, "application/octet-stream", (await self.maze(query))[1]
+            if url.path == "/solve":
+                return 200, "application/json", (await self.solve(query))[1]
+            return 200, "image/png", await self.render(query)
+        except RequestError as error:
+            return error.status, "application/json", json.dumps({"error": str(error)}).encode()
+
+    async def handle(self, reader, writer):
+        """
+        Serves the HTTP/1.1 requests of one connection until the client closes it.
+        """
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                parts = lines[0].split()
+                headers = dict(line.lower().split(":", 1) for line in lines[1:] if ":" in line)
+                keep_alive = headers.get("connection", "").strip() != "close"
+                try:
+                    await reader.readexactly(int(headers.get("content-length", 0)))
+                except (ValueError, asyncio.IncompleteReadError):
+                    break
+                if len(parts) != 3:
+                    status, content_type, body = 400, "application/json", b'{"error": "bad request line"}'
+                    keep_alive = False
+                else:
+                    try:
+                        status, content_type, body = await self.respond(parts[0], parts[1])
+                    except Exception as error:
+                        status, content_type, body = 500, "application/json", json.dumps(
+                            {"error": f"{type(error).__name__}: {error}"}).encode()
+                writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: {content_type}\r\n"
+                             f"Content-Length: {len(body)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8080, unix_path=None):
+        """
+        Serves requests until cancelled.
+
+        Args:
+            host (str, optional): The address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): The TCP port. Defaults to 8080.
+            unix_path (str, optional): Listen on this Unix socket instead of TCP. Defaults to None.
+        """
+        if unix_path is not None:
+            server = await asyncio.start_unix_server(self.handle, unix_path, limit=MAX_HEADER_BYTES)
+        else:
+            server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES)
+        async with server:
+            await server.serve_forever()
+
+
+def _nbytes(result):
+    """
+    Returns the memory held by a cached result, counting its arrays, its bytes and the positions of its path.
+    """
+    size = 0
+    for part in result if isinstance(result, tuple) else (result,):
+        if isinstance(part, np.ndarray):
+            size += part.nbytes
+        elif isinstance(part, list):
+            size += sys.getsizeof(part) + len(part) * _POSITION_BYTES
+        else:
+            size += len(part)
+    return size
+
+
+def _int(query, name, default):
+    try:
+        return int(query.get(name, default))
+    except ValueError:
+        raise RequestError(400, f"{name} must be an integer") from None
+
+
+def _pos(query, name, default):
+    if name not in query:
+        return default
+    try:
+        x, y = (int(value) for value in query[name].split(","))
+    except ValueError:
+        raise RequestError(400, f"{name} must be x,y") from None
+    return x, y
+
+
+def main(argv=None):
+    """
+    Command line entry point, see --help.
+    """
+    parser = argparse.ArgumentParser(description="Serves maze generate, solve and render requests over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--workers", type=int, help="worker processes, defaults to the number of CPUs")
+    parser.add_argument("--cache-mb", type=int, default=512, help="memory budget of the result cache in MiB")
+    args = parser.parse_args(argv)
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        service = MazeService(executor, cache_bytes=args.cache_mb * 2 ** 20)
+        try:
+            asyncio.run(service.serve(args.host, args.port, args.unix))
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
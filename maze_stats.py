@@ -0,0 +1,133 @@
+import json
+import time
+from contextlib import contextmanager
+
+# histogram bucket i counts durations of i bits, i.e. below 2 ** i nanoseconds
+HISTOGRAM_BUCKETS = 64
+
+
+class MazeStats:
+    """
+    Collects counters, high-water marks and duration histograms from the generator, solver and renderer.
+
+    Pass an instance as the stats argument of MazeGenerator, MazeSolver, draw_maze or render_loop; with the
+    default stats=None nothing is measured. Step by step calls record every step, while the one-shot fast
+    paths (MazeGenerator.run, MazeSolver.solve) keep plain local counters and record them once at the end.
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.maxima = {}
+        self.histograms = {}
+
+    def count(self, name, value=1):
+        """
+        Adds to a counter.
+
+        Args:
+            name (str): The counter name.
+            value (int, optional): The amount to add. Defaults to 1.
+        """
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def high_water(self, name, value):
+        """
+        Keeps the largest value seen for a name.
+
+        Args:
+            name (str): The name of the mark.
+            value (int): The current value.
+        """
+        if value > self.maxima.get(name, value - 1):
+            self.maxima[name] = value
+
+    def observe_ns(self, name, duration):
+        """
+        Adds a duration to a log2 histogram.
+
+        Args:
+            name (str): The histogram name.
+            duration (int): The duration in nanoseconds, e.g. a time.perf_counter_ns() difference.
+        """
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = {"buckets": [0] * HISTOGRAM_BUCKETS, "count": 0, "sum": 0}
+        histogram["buckets"][min(duration.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+        histogram["count"] += 1
+        histogram["sum"] += duration
+
+    @contextmanager
+    def timer(self, name):
+        """
+        Times the body of a with statement into a histogram.
+
+        Args:
+            name (str): The histogram name.
+        """
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.observe_ns(name, time.perf_counter_ns() - start)
+
+    def reset(self):
+        """
+        Clears everything collected so far.
+        """
+        self.counters.clear()
+        self.maxima.clear()
+        self.histograms.clear()
+
+    def to_dict(self):
+        """
+        Returns the collected values as plain dicts and lists.
+
+        Returns:
+            dict: counters, maxima and histograms, each histogram with its bucket counts, count and sum.
+        """
+        return {
+            "counters": dict(self.counters),
+            "maxima": dict(self.maxima),
+            "histograms": {name: {"buckets": list(histogram["buckets"]), "count": histogram["count"],
+                                  "sum": histogram["sum"]}
+                           for name, histogram in self.histograms.items()},
+        }
+
+    def to_json(self, **kwargs):
+        """
+        Returns the collected values as a JSON string, kwargs are passed to json.dumps.
+        """
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_prometheus(self, prefix="maze_"):
+        """
+        Returns the collected values in the Prometheus text exposition format.
+
+        Counters get a _total suffix, high-water marks are exported as gauges with a _max suffix and histograms
+        keep their nanosecond unit, with cumulative buckets up to 2 ** i - 1, from the first one holding a
+        duration to the last.
+
+        Args:
+            prefix (str, optional): Prepended to every metric name. Defaults to "maze_".
+
+        Returns:
+            str: The metrics, one per line.
+        """
+        lines = []
+        for name, value in sorted(self.counters.items()):
+            lines += [f"# TYPE {prefix}{name}_total counter", f"{prefix}{name}_total {value}"]
+        for name, value in sorted(self.maxima.items()):
+            lines += [f"# TYPE {prefix}{name}_max gauge", f"{prefix}{name}_max {value}"]
+        for name, histogram in sorted(self.histograms.items()):
+            metric = prefix + name
+            lines.append(f"# TYPE {metric} histogram")
+            buckets = histogram["buckets"]
+            used = [i for i, count in enumerate(buckets) if count]
+            cumulative = 0
+            # durations are whole nanoseconds, and bucket i holds those below 2 ** i
+            for i in range(used[0], used[-1] + 1) if used else ():
+                cumulative += buckets[i]
+                lines.append(f'{metric}_bucket{{le="{2 ** i - 1}"}} {cumulative}')
+            lines += [f'{metric}_bucket{{le="+Inf"}} {histogram["count"]}', f"{metric}_sum {histogram['sum']}",
+                      f"{metric}_count {histogram['count']}"]
+        return "\n".join(lines) + "\n"
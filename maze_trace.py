@@ -0,0 +1,256 @@
+import struct
+
+import numpy as np
+
+from MazeGenerator import MazeGenerator
+from MazeGrid import MazeGrid, DIRECTIONS
+from MazeSolver import MazeSolver
+from maze_events import Carve, Backtrack
+from maze_io import pack_walls, unpack_walls
+
+MAGIC = b"MZTR"
+VERSION = 1
+
+# magic, version, width, height, checkpoint interval, generator steps, solver steps, generator cursor,
+# solver start and end positions
+HEADER = struct.Struct("<4sHxxIIIQQIIIIII")
+
+# one record per step: generator steps store the cell the cursor moved to and the cell it left, solver steps
+# store the expanded cell and the cell it was reached from
+STEP_DTYPE = np.dtype([("kind", "u1"), ("cell", "<u4"), ("origin", "<u4")])
+CARVE, BACKTRACK, EXPAND = range(3)
+NO_ORIGIN = 0xFFFFFFFF
+
+
+def record_trace(output, maze_gen: MazeGenerator, maze_solver: MazeSolver, checkpoint_interval=65536):
+    """
+    Runs a generator and then a solver to completion, recording every step to a binary trace file.
+
+    The trace holds a header, one packed record per step and, every checkpoint_interval generator steps, a
+    snapshot of the walls, so TracePlayer can seek without replaying from the start. Solver steps only record
+    the expanded cell and its parent, the path at any step is rebuilt from them.
+
+    Args:
+        output (str): The trace file path.
+        maze_gen (MazeGenerator): The generator, its current maze state is the start of the trace.
+        maze_solver (MazeSolver): The solver to run on the generated maze, not stepped yet.
+        checkpoint_interval (int, optional): Generator steps between wall snapshots, the most a seek has to
+            replay. Defaults to 65536.
+
+    Returns:
+        int: The number of steps recorded.
+    """
+    height = len(maze_gen.maze[0])
+    width = len(maze_gen.maze)
+    cursor = maze_gen.cursor_pos
+    kinds, cells, origins = [], [], []
+
+    wall_checkpoints = [pack_walls(MazeGrid.from_nodes(maze_gen.maze).walls)]
+    while maze_gen.has_next:
+        if kinds and len(kinds) % checkpoint_interval == 0:
+            wall_checkpoints.append(pack_walls(MazeGrid.from_nodes(maze_gen.maze).walls))
+        event = maze_gen.next_step()
+        kinds.append(CARVE if isinstance(event, Carve) else BACKTRACK)
+        cells.append(event.end[0] * height + event.end[1])
+        origins.append(event.start[0] * height + event.start[1])
+    gen_count = len(kinds)
+    if gen_count:
+        wall_checkpoints.append(pack_walls(MazeGrid.from_nodes(maze_gen.maze).walls))
+
+    # a step expands the last cell of the solver path, the start is expanded first without changing it
+    path = maze_solver.path
+    first = True
+    while maze_solver.has_next:
+        last = path[-1]
+        maze_solver.next_step()
+        if first or path[-1] != last:
+            x, y = path[-1]
+            kinds.append(EXPAND)
+            cells.append(x * height + y)
+            origins.append(path[-2][0] * height + path[-2][1] if len(path) > 1 else NO_ORIGIN)
+        first = False
+
+    steps = np.empty(len(kinds), dtype=STEP_DTYPE)
+    steps["kind"], steps["cell"], steps["origin"] = kinds, cells, origins
+    with open(output, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, width, height, checkpoint_interval, gen_count,
+                               len(kinds) - gen_count, *cursor, *maze_solver.start_pos, *maze_solver.end_pos))
+        file.write(steps.tobytes())
+        for packed in wall_checkpoints:
+            file.write(packed.tobytes())
+    return len(kinds)
+
+
+class TracePlayer:
+    """
+    Plays back a trace written by record_trace, without running the generator or solver again.
+
+    The file is memory mapped, so only the records and snapshots a seek touches are read. Seeking into the
+    generation restores the nearest wall snapshot at or before the target and replays at most
+    checkpoint_interval carves from it with array operations. Seeking into the solve only follows the parent
+    links of the cell expanded at that step.
+    """
+
+    def __init__(self, path):
+        """
+        Opens a trace file at step 0.
+
+        Args:
+            path (str): The trace file path.
+
+        Raises:
+            ValueError: If the file is not a trace or was written by an unsupported version.
+        """
+        with open(path, "rb") as file:
+            header = file.read(HEADER.size)
+        if len(header) < HEADER.size or header[:4] != MAGIC:
+            raise ValueError(f"{path} is not a maze trace")
+        (_, version, self.width, self.height, self.checkpoint_interval, self.gen_count, self.solve_count,
+         cursor_x, cursor_y, start_x, start_y, end_x, end_y) = HEADER.unpack(header)
+        if version != VERSION:
+            raise ValueError(f"unsupported trace version {version}")
+        self.start_pos = (start_x, start_y)
+        self.end_pos = (end_x, end_y)
+        self.__initial_cursor = (cursor_x, cursor_y)
+
+        total = len(self)
+        # record_trace writes the initial walls, one snapshot per checkpoint interval and the final walls, or only
+        # the initial walls when the trace has no generator steps
+        wall_count = -(-self.gen_count // self.checkpoint_interval) + 1
+        self.__steps = np.memmap(path, dtype=STEP_DTYPE, mode="r", offset=HEADER.size, shape=(total,))
+        self.__wall_checkpoints = np.memmap(path, dtype=np.uint8, mode="r",
+                                            offset=HEADER.size + total * STEP_DTYPE.itemsize,
+                                            shape=(wall_count, self.width, (self.height + 1) // 2))
+        self.__parent = None
+        self.__path = None
+        self.__restore(0)
+
+    def __len__(self):
+        return self.gen_count + self.solve_count
+
+    def __pos(self, index):
+        return divmod(int(index), self.height)
+
+    def record(self, step):
+        """
+        Returns what a recorded step did.
+
+        Args:
+            step (int): The step index, generator steps come first.
+
+        Returns:
+            Carve | Backtrack | tuple: The generator event, or the position expanded by the solver.
+        """
+        kind, cell, origin = self.__steps[step].item()
+        if kind == EXPAND:
+            return self.__pos(cell)
+        return (Carve if kind == CARVE else Backtrack)(self.__pos(origin), self.__pos(cell))
+
+    def __restore(self, step):
+        """
+        Loads the wall snapshot at or before step and moves the playback position there.
+        """
+        checkpoint = min(step, self.gen_count) // self.checkpoint_interval
+        self.__walls = unpack_walls(self.__wall_checkpoints[checkpoint], self.height)
+        self.__grid = MazeGrid(self.__walls)
+        self.__position = checkpoint * self.checkpoint_interval
+
+    def __replay(self, step):
+        """
+        Applies the carves from the playback position up to step.
+        """
+        stop = min(step, self.gen_count)
+        if self.__position < stop:
+            steps = self.__steps[self.__position:stop]
+            carves = steps[steps["kind"] == CARVE]
+            start = carves["origin"].astype(np.intp)
+            end = carves["cell"].astype(np.intp)
+            delta = end - start
+            height = self.height
+            direction = np.select([delta == -height, delta == -1, delta == height], list(DIRECTIONS[:3]),
+                                  DIRECTIONS[3]).astype(np.uint8)
+            opposite = ((direction << 2) | (direction >> 2)) & 15
+            walls = self.__walls.ravel()
+            np.bitwise_and.at(walls, start, ~direction)
+            np.bitwise_and.at(walls, end, ~opposite)
+        self.__position = step
+
+    def seek(self, step):
+        """
+        Moves the playback to the state after the given number of steps.
+
+        Args:
+            step (int): The number of steps applied, from 0 to len(player).
+
+        Returns:
+            TracePlayer: The player itself.
+        """
+        if not 0 <= step <= len(self):
+            raise IndexError(f"step {step} out of range 0..{len(self)}")
+        position = min(self.__position, self.gen_count)
+        if step < position or min(step, self.gen_count) - position > self.checkpoint_interval:
+            self.__restore(step)
+        self.__replay(step)
+        self.__path = None
+        return self
+
+    def step(self, count=1):
+        """
+        Moves the playback forward.
+
+        Args:
+            count (int, optional): Number of steps to apply. Defaults to 1.
+
+        Returns:
+            list: The records of the steps applied, fewer than count at the end of the trace.
+        """
+        stop = min(self.__position + count, len(self))
+        records = [self.record(step) for step in range(self.__position, stop)]
+        self.seek(stop)
+        return records
+
+    @property
+    def position(self):
+        """
+        Returns the number of steps applied to the current state.
+        """
+        return self.__position
+
+    @property
+    def maze(self):
+        """
+        Returns the maze at the current position, a MazeGrid that can be passed to draw_maze.
+        """
+        return self.__grid
+
+    @property
+    def path(self):
+        """
+        Returns the solver path at the current position, empty while the maze is being generated.
+        """
+        if self.__position <= self.gen_count:
+            return []
+        if self.__path is None:
+            if self.__parent is None:
+                solve = self.__steps[self.gen_count:]
+                self.__parent = dict(zip(solve["cell"].tolist(), solve["origin"].tolist()))
+            parent = self.__parent
+            index = int(self.__steps["cell"][self.__position - 1])
+            path = []
+            while index != NO_ORIGIN:
+                path.append(divmod(index, self.height))
+                index = parent[index]
+            path.reverse()
+            self.__path = path
+        return self.__path
+
+    @property
+    def cursor_pos(self):
+        """
+        Returns the generator cursor at the current position, or None once the maze is generated.
+        """
+        if self.__position >= self.gen_count:
+            return None
+        if self.__position == 0:
+            return self.__initial_cursor
+        return self.__pos(self.__steps["cell"][self.__position - 1])
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from MazeGrid import ALL_WALLS, LEFT, TOP, RIGHT, BOTTOM
+from maze_algorithms import ALGORITHMS, generate
+from maze_distance import distance_field
+
+SIZES = [(1, 1), (1, 17), (17, 1), (2, 2), (9, 14), (32, 31)]
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+@pytest.mark.parametrize("maze_height, maze_width", SIZES)
+def test_generates_a_perfect_maze(algorithm, maze_height, maze_width):
+    maze = generate(maze_height, maze_width, algorithm, seed=21)
+    walls = maze.walls
+    assert walls.shape == (maze_width, maze_height) and walls.dtype == np.uint8
+    assert (walls <= ALL_WALLS).all()
+    # sealed border, and every wall shared by both cells it separates
+    assert (walls[0, :] & LEFT).all() and (walls[-1, :] & RIGHT).all()
+    assert (walls[:, 0] & TOP).all() and (walls[:, -1] & BOTTOM).all()
+    assert ((walls[:-1, :] & RIGHT != 0) == (walls[1:, :] & LEFT != 0)).all()
+    assert ((walls[:, :-1] & BOTTOM != 0) == (walls[:, 1:] & TOP != 0)).all()
+    # connected, and a spanning tree has exactly one passage less than cells
+    assert (distance_field(maze) >= 0).all()
+    passages = np.count_nonzero(walls[:-1, :] & RIGHT == 0) + np.count_nonzero(walls[:, :-1] & BOTTOM == 0)
+    assert passages == maze_width * maze_height - 1
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_same_seed_same_maze(algorithm):
+    for maze_height, maze_width in SIZES:
+        first = generate(maze_height, maze_width, algorithm, seed=5)
+        assert (generate(maze_height, maze_width, algorithm, seed=5).walls == first.walls).all()
+    others = [generate(32, 31, algorithm, seed=seed).walls for seed in (5, 6, 7)]
+    assert not (others[0] == others[1]).all() or not (others[0] == others[2]).all()
+
+
+def test_unknown_algorithm():
+    with pytest.raises(ValueError):
+        generate(4, 4, "prim")
@@ -0,0 +1,50 @@
+import pytest
+
+import maze_jit
+from MazeGrid import RIGHT
+from maze_algorithms import ALGORITHMS, generate
+from maze_analytics import analyze, dead_end_filling, longest_path
+from maze_distance import distance_field
+
+
+def loopy(maze):
+    """
+    Opens a few walls of a generated maze so it has loops.
+    """
+    for x in range(0, maze.width - 1, 3):
+        maze.set_wall(x, maze.height // 2, RIGHT, False)
+    return maze
+
+
+def both(monkeypatch, run):
+    """
+    Returns the result of run with the Euler tour, then with the distance fields used for large mazes.
+    """
+    results = []
+    for jit in (False, True):
+        monkeypatch.setattr(maze_jit, "use_jit", lambda cells: jit)
+        results.append(run())
+    return results
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+@pytest.mark.parametrize("maze_height, maze_width", [(1, 1), (1, 9), (9, 1), (17, 12)])
+@pytest.mark.parametrize("make_loops", [False, True])
+def test_distance_fields_agree_with_euler_tour(monkeypatch, algorithm, maze_height, maze_width, make_loops):
+    maze = generate(maze_height, maze_width, algorithm, seed=4)
+    if make_loops:
+        maze = loopy(maze)
+    end_pos = (maze_width // 2, maze_height - 1)
+
+    tour, fields = both(monkeypatch, lambda: analyze(maze, (0, 0), end_pos))
+    assert tour._replace(longest_path_ends=None, corridor_runs=None) == \
+        fields._replace(longest_path_ends=None, corridor_runs=None)
+    for analysis in (tour, fields):
+        start, end = analysis.longest_path_ends
+        assert distance_field(maze, start)[end] == analysis.longest_path
+
+    tour, fields = both(monkeypatch, lambda: dead_end_filling(maze, (0, 0), end_pos))
+    assert (tour == fields).all()
+
+    tour, fields = both(monkeypatch, lambda: longest_path(maze))
+    assert tour[2] == fields[2]
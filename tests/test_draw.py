@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+import maze_jit
+from MazeGrid import RIGHT
+from MazeSolver import MazeSolver, BidirectionalSolver, MultiTargetSolver
+from maze_algorithms import generate
+from maze_draw import draw_maze, render_node, draw_path, PathOverlay
+
+COLORS = dict(cursor_color=(255, 255, 255), border_color=(0, 0, 0), node_color=(50, 50, 50))
+
+
+def draw_per_cell(maze, width, height, border_thickness, cursor_pos, bg_color=(20, 30, 40)):
+    """
+    Draws a maze the way draw_maze did before the rasterizer, with render_node for every cell.
+    """
+    image = np.full((height * maze.height, width * maze.width, 3), bg_color, dtype=np.uint8)
+    for x in range(maze.width):
+        for y in range(maze.height):
+            render_node(COLORS["border_color"], border_thickness, COLORS["cursor_color"], COLORS["node_color"],
+                        cursor_pos, height, image, maze[x][y], width, x, y)
+    return image
+
+
+@pytest.mark.parametrize("width, height", [(1, 1), (3, 5), (8, 8), (18, 18), (30, 11)])
+@pytest.mark.parametrize("border_thickness", [1, 2, 5, 12])
+@pytest.mark.parametrize("jit", [False, True])
+def test_rasterizer_matches_render_node(monkeypatch, width, height, border_thickness, jit):
+    # the kernels are plain Python without Numba, so both paths run everywhere
+    monkeypatch.setattr(maze_jit, "use_jit", lambda cells: jit)
+    maze = generate(9, 13, "kruskal", seed=8)
+    for cursor_pos in (None, (0, 0), (6, 4), (12, 8)):
+        image = draw_maze(maze, width=width, height=height, border_thickness=border_thickness, cursor_pos=cursor_pos,
+                          bg_color=(20, 30, 40), **COLORS)
+        assert (image == draw_per_cell(maze, width, height, border_thickness, cursor_pos)).all()
+
+
+def solvers(maze):
+    end = (maze.width - 1, maze.height - 1)
+    return [MazeSolver(maze, (0, 0), end, algorithm="bfs"),
+            BidirectionalSolver(maze, (0, 0), end, algorithm="astar"),
+            MultiTargetSolver(maze, (3, 2), [end, (0, maze.height - 1)], all_targets=True)]
+
+
+@pytest.mark.parametrize("cell_size", [(5, 5), (9, 7), (18, 18)])
+@pytest.mark.parametrize("solver_index", [0, 1, 2])
+def test_path_overlay_matches_draw_path(cell_size, solver_index):
+    width, height = cell_size
+    # loops make the search paths branch and retreat
+    maze = generate(8, 11, "kruskal", seed=6)
+    for x in range(1, 10, 2):
+        maze.set_wall(x, 4, RIGHT, False)
+    maze_img = draw_maze(maze, width=width, height=height, border_thickness=2)
+    solver = solvers(maze)[solver_index]
+    overlay = PathOverlay.for_solver(maze_img, (0, 0, 255), solver, width, height)
+    # the events only describe changes, the paths the solver starts with are drawn first, as in maze_render
+    for index, path in enumerate(solver.paths):
+        overlay.update(path, index)
+
+    while solver.has_next:
+        frame = overlay.apply(solver.next_step())
+        expected = maze_img.copy()
+        draw_path(expected, (0, 0, 255), solver, width, height)
+        assert (frame == expected).all()
+    assert (maze_img == draw_maze(maze, width=width, height=height, border_thickness=2)).all()
+
+
+@pytest.mark.parametrize("cell_size", [(5, 5), (18, 18)])
+def test_path_overlay_update_matches_draw_path(cell_size):
+    width, height = cell_size
+    maze = generate(8, 11, "backtracker", seed=2)
+    maze_img = draw_maze(maze, width=width, height=height, border_thickness=3)
+    solver = BidirectionalSolver(maze, (0, 0), (10, 7), algorithm="bfs")
+    overlay = PathOverlay.for_solver(maze_img, (0, 255, 0), solver, width, height)
+
+    while solver.has_next:
+        solver.next_step()
+        for index, path in enumerate(solver.paths):
+            frame = overlay.update(path, index)
+        expected = maze_img.copy()
+        draw_path(expected, (0, 255, 0), solver, width, height)
+        assert (frame == expected).all()
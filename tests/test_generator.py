@@ -0,0 +1,44 @@
+import hashlib
+
+import pytest
+
+from MazeGenerator import MazeGenerator
+from maze_utils import new_maze
+
+
+@pytest.mark.parametrize("maze_height, maze_width", [(1, 1), (1, 12), (12, 1), (2, 9), (9, 2), (7, 5)])
+@pytest.mark.parametrize("pop_first", [False, True])
+def test_generation_visits_every_cell(maze_height, maze_width, pop_first):
+    stepped = new_maze(maze_height, maze_width)
+    maze_gen = MazeGenerator(stepped, seed=11)
+    while maze_gen.has_next:
+        maze_gen.next_step(pop_first)
+    assert maze_gen.visited_count == maze_height * maze_width
+
+    run = new_maze(maze_height, maze_width)
+    run_gen = MazeGenerator(run, seed=11)
+    run_gen.run(pop_first)
+    assert run_gen.visited_count == maze_height * maze_width
+    assert not run_gen.has_next
+    assert (run.walls == stepped.walls).all()
+
+
+# sha256 of the wall bytes of a 12x9 maze generated with seed 42. The compatibility mode values are the mazes of
+# the original generator, which reseeded the global random module from time.time_ns(), with that returning 42.
+FROZEN_WALLS = {
+    None: "1484e91bb541d74122e702454b8995d7d6a41f71d076e647490b02188ee58b5d",
+    1: "24f379a98cf5ff62c604ac7301b6a7c84ffb60956042d70360da8d321490ed76",
+    5: "6536cbdf06f18295e12bbf988671a790e88d952f471c061cde0942320028dcf4",
+}
+
+
+@pytest.mark.parametrize("step_to_next_random", list(FROZEN_WALLS))
+@pytest.mark.parametrize("use_run", [False, True])
+def test_seed_gives_frozen_maze(step_to_next_random, use_run):
+    maze = new_maze(9, 12)
+    maze_gen = MazeGenerator(maze, seed=42, step_to_next_random=step_to_next_random)
+    if use_run:
+        maze_gen.run()
+    while maze_gen.has_next:
+        maze_gen.next_step()
+    assert hashlib.sha256(maze.walls.tobytes()).hexdigest() == FROZEN_WALLS[step_to_next_random]
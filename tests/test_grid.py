@@ -0,0 +1,60 @@
+import pytest
+
+import maze_jit
+from MazeGrid import MazeGrid, ALL_WALLS, LEFT, TOP, RIGHT, BOTTOM
+from MazePathIndex import MazePathIndex
+from MazeSolver import MazeSolver, BidirectionalSolver, MultiTargetSolver
+from maze_algorithms import generate
+from maze_analytics import analyze, dead_end_filling
+from maze_distance import distance_field, descend_path
+
+
+def unsealed(maze):
+    """
+    Returns a copy of a maze with every side on its border opened.
+    """
+    walls = maze.walls.copy()
+    walls[0, :] &= ALL_WALLS ^ LEFT
+    walls[-1, :] &= ALL_WALLS ^ RIGHT
+    walls[:, 0] &= ALL_WALLS ^ TOP
+    walls[:, -1] &= ALL_WALLS ^ BOTTOM
+    return MazeGrid(walls)
+
+
+def test_sealed_walls_closes_the_border():
+    maze = unsealed(generate(6, 9, "kruskal", seed=2))
+    assert (maze.sealed_walls() == generate(6, 9, "kruskal", seed=2).walls).all()
+
+
+@pytest.mark.parametrize("call", [
+    lambda maze: distance_field(maze, (0, 20)),
+    lambda maze: distance_field(maze, (-1, 0)),
+    lambda maze: descend_path(maze, distance_field(maze), (30, 0)),
+    lambda maze: MazePathIndex(maze, (0, 20)),
+    lambda maze: MazePathIndex(maze).path((0, 0), (0, 20)),
+    lambda maze: MazePathIndex(maze).distance((30, 0), (0, 0)),
+    lambda maze: dead_end_filling(maze, (0, 0), (0, 20)),
+    lambda maze: analyze(maze, (30, 19)),
+    lambda maze: MazeSolver(maze, (0, 0), (0, 20)).solve(),
+    lambda maze: BidirectionalSolver(maze, (0, 20), (0, 0)).solve(),
+    lambda maze: MultiTargetSolver(maze, (0, 0), [(1, 1), (0, 20)]).solve(),
+])
+def test_positions_outside_the_maze_are_rejected(call):
+    with pytest.raises(ValueError, match="outside the 30x20 maze"):
+        call(generate(20, 30, "backtracker", seed=1))
+
+
+@pytest.mark.parametrize("jit", [False, True])
+def test_open_border_sides_lead_nowhere(monkeypatch, jit):
+    monkeypatch.setattr(maze_jit, "MIN_CELLS", 1)
+    monkeypatch.setattr(maze_jit, "ENABLED", jit and maze_jit.AVAILABLE)
+    sealed = generate(20, 30, "eller", seed=3)
+    maze = unsealed(sealed)
+
+    assert (distance_field(maze, (0, 19)) == distance_field(sealed, (0, 19))).all()
+    assert MazePathIndex(maze).distance((29, 0), (0, 19)) == MazePathIndex(sealed).distance((29, 0), (0, 19))
+    assert (dead_end_filling(maze) == dead_end_filling(sealed)).all()
+    for solver in (MazeSolver, BidirectionalSolver):
+        for algorithm in ("astar", "bfs"):
+            path = solver(maze, (0, 0), (29, 19), algorithm=algorithm).solve()
+            assert path == solver(sealed, (0, 0), (29, 19), algorithm=algorithm).solve()
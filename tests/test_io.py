@@ -0,0 +1,78 @@
+import io
+
+import numpy as np
+import pytest
+
+from MazeGrid import LEFT, TOP, RIGHT, BOTTOM
+from maze_algorithms import generate
+from maze_io import HEADER, load_maze, save_maze, pack_walls, unpack_walls
+
+
+@pytest.mark.parametrize("maze_height, maze_width", [(1, 1), (1, 6), (7, 1), (8, 10), (9, 13), (13, 9)])
+def test_save_and_load_round_trip(tmp_path, maze_height, maze_width):
+    maze = generate(maze_height, maze_width, "kruskal", seed=3)
+    # the seed field is signed, a seed from another source may be negative
+    save_maze(tmp_path / "maze.bin", maze, seed=-2 ** 63, algorithm="kruskal")
+    maze_file = load_maze(tmp_path / "maze.bin")
+    assert (maze_file.width, maze_file.height) == (maze_width, maze_height)
+    assert (maze_file.seed, maze_file.algorithm) == (-2 ** 63, "kruskal")
+    assert (maze_file.to_grid().walls == maze.walls).all()
+    # two cells per byte, odd heights round up
+    assert (tmp_path / "maze.bin").stat().st_size == HEADER.size + maze_width * ((maze_height + 1) // 2)
+
+
+def test_file_objects_and_missing_seed(tmp_path):
+    maze = generate(5, 7, "backtracker", seed=1)
+    buffer = io.BytesIO()
+    save_maze(buffer, maze)
+    (tmp_path / "maze.bin").write_bytes(buffer.getvalue())
+    maze_file = load_maze(tmp_path / "maze.bin")
+    assert (maze_file.seed, maze_file.algorithm) == (None, "")
+    assert (maze_file.to_grid().walls == maze.walls).all()
+
+
+@pytest.mark.parametrize("height", [1, 2, 5, 8, 11])
+def test_unpack_bands_at_any_even_row(height):
+    walls = np.random.default_rng(height).integers(0, 16, (4, height), dtype=np.uint8)
+    packed = pack_walls(walls)
+    assert (unpack_walls(packed, height) == walls).all()
+    for y_start in range(0, height, 2):
+        for rows in range(1, height - y_start + 1):
+            assert (unpack_walls(packed, rows, y_start) == walls[:, y_start:y_start + rows]).all()
+
+
+@pytest.mark.parametrize("seal", [True, False])
+def test_region_matches_the_whole_maze(tmp_path, seal):
+    maze = generate(11, 9, "eller", seed=4)
+    save_maze(tmp_path / "maze.bin", maze)
+    maze_file = load_maze(tmp_path / "maze.bin")
+    for x, y, width, height in [(0, 0, 9, 11), (1, 1, 3, 4), (2, 3, 5, 1), (0, 5, 9, 6), (8, 10, 1, 1), (4, 7, 2, 3)]:
+        region = maze_file.region(x, y, width, height, seal=seal).walls
+        expected = maze.walls[x:x + width, y:y + height].copy()
+        if seal:
+            expected[0, :] |= LEFT
+            expected[-1, :] |= RIGHT
+            expected[:, 0] |= TOP
+            expected[:, -1] |= BOTTOM
+        assert (region == expected).all(), (x, y, width, height)
+    # sealing only closes the border of the rectangle
+    assert (maze_file.region(1, 1, 3, 4).walls[1:-1, 1:-1] == maze.walls[2:3, 2:4]).all()
+
+
+@pytest.mark.parametrize("x, y, width, height", [(-1, 0, 2, 2), (0, -1, 2, 2), (0, 0, 0, 2), (8, 0, 2, 2),
+                                                 (0, 10, 2, 2)])
+def test_region_outside_the_maze(tmp_path, x, y, width, height):
+    save_maze(tmp_path / "maze.bin", generate(11, 9, "eller", seed=4))
+    with pytest.raises(IndexError):
+        load_maze(tmp_path / "maze.bin").region(x, y, width, height)
+
+
+def test_rejected_headers(tmp_path):
+    maze = generate(3, 3, "kruskal", seed=0)
+    with pytest.raises(ValueError):
+        save_maze(tmp_path / "maze.bin", maze, algorithm="a" * 17)
+    with pytest.raises(ValueError):
+        save_maze(tmp_path / "maze.bin", maze, seed=2 ** 63)
+    (tmp_path / "other.bin").write_bytes(b"PNG" + bytes(HEADER.size))
+    with pytest.raises(ValueError, match="not a maze file"):
+        load_maze(tmp_path / "other.bin")
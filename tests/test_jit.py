@@ -0,0 +1,81 @@
+import random
+
+import numpy as np
+import pytest
+
+import maze_jit
+from MazeGenerator import MazeGenerator
+from MazeSolver import MazeSolver
+from maze_algorithms import generate
+from maze_distance import distance_field
+from maze_draw import draw_maze
+from maze_utils import new_maze
+
+pytest.importorskip("numba")
+
+SEEDS = [0, 7, -3, 2 ** 40 + 5]
+
+
+def both(monkeypatch, run):
+    """
+    Returns the result of run with the kernels forced off, then forced on for any maze size.
+    """
+    monkeypatch.setattr(maze_jit, "MIN_CELLS", 1)
+    results = []
+    for enabled in (False, True):
+        monkeypatch.setattr(maze_jit, "ENABLED", enabled)
+        results.append(run())
+    return results
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_random_stream_matches_python(seed):
+    maze_jit._compile()
+    mt, pos = np.zeros(624, dtype=np.int64), np.zeros(1, dtype=np.int64)
+    maze_jit._seed(mt, pos, seed)
+    rng = random.Random(seed)
+    state = rng.getstate()[1]
+    assert mt.tolist() == list(state[:624]) and pos[0] == state[624]
+    for n in [1, 2, 3, 4] * 500:
+        assert maze_jit._randbelow(mt, pos, n) == rng._randbelow(n)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("step_to_next_random", [None, 1, 5])
+@pytest.mark.parametrize("pop_first", [False, True])
+def test_generator(monkeypatch, seed, step_to_next_random, pop_first):
+    def run():
+        maze = new_maze(23, 31)
+        maze_gen = MazeGenerator(maze, cursor_pos=(4, 9), step_to_next_random=step_to_next_random, seed=seed)
+        for _ in range(10):
+            maze_gen.next_step(pop_first)
+        maze_gen.run(pop_first)
+        return maze.walls.tobytes(), maze_gen.cursor_pos, maze_gen.visited_count, maze_gen.remain_count
+
+    interpreted, compiled = both(monkeypatch, run)
+    assert compiled == interpreted
+
+
+@pytest.mark.parametrize("algorithm", ["backtracker", "kruskal", "eller"])
+@pytest.mark.parametrize("solver", ["astar", "bfs"])
+def test_solver(monkeypatch, algorithm, solver):
+    maze = generate(40, 30, algorithm, seed=3)
+
+    def run():
+        paths = []
+        for start_pos, end_pos in [((0, 0), (29, 39)), ((15, 20), (0, 39)), ((3, 3), (3, 3))]:
+            maze_solver = MazeSolver(maze, start_pos, end_pos, algorithm=solver)
+            paths.append((maze_solver.solve(), maze_solver.path, maze_solver.found))
+        return paths, distance_field(maze, (15, 20)).tolist()
+
+    interpreted, compiled = both(monkeypatch, run)
+    assert compiled == interpreted
+
+
+@pytest.mark.parametrize("cell_size, border_thickness, cursor_pos", [(4, 1, None), (7, 2, (3, 3)), (18, 3, (29, 0))])
+def test_rasterizer(monkeypatch, cell_size, border_thickness, cursor_pos):
+    maze = generate(20, 30, "backtracker", seed=5)
+    interpreted, compiled = both(monkeypatch, lambda: draw_maze(maze, width=cell_size, height=cell_size,
+                                                               border_thickness=border_thickness,
+                                                               cursor_pos=cursor_pos))
+    assert (compiled == interpreted).all()
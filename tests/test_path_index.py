@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from MazeGrid import RIGHT
+from MazePathIndex import MazePathIndex
+from MazeSolver import MazeSolver
+from maze_algorithms import ALGORITHMS, generate
+from maze_distance import distance_field
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+@pytest.mark.parametrize("maze_height, maze_width, root", [(1, 1, (0, 0)), (1, 23, (7, 0)), (17, 1, (0, 16)),
+                                                            (19, 24, (0, 0)), (24, 19, (11, 9))])
+def test_queries_match_breadth_first_search(algorithm, maze_height, maze_width, root):
+    maze = generate(maze_height, maze_width, algorithm, seed=12)
+    index = MazePathIndex(maze, root)
+    root_distances = distance_field(maze, root)
+    assert (index.depth.reshape(maze_width, maze_height) == root_distances).all()
+
+    rng = random.Random(maze_width * maze_height)
+    cells = [(x, y) for x in range(maze_width) for y in range(maze_height)]
+    sources = [(0, 0), (maze_width - 1, maze_height - 1)] + rng.sample(cells, min(3, len(cells)))
+    for source in sources:
+        distances = distance_field(maze, source)
+        targets = cells if len(cells) <= 60 else rng.sample(cells, 60)
+        for target in targets:
+            path = MazeSolver(maze, source, target, algorithm="bfs").solve()
+            assert index.path(source, target) == path
+            assert index.distance(source, target) == distances[target] == len(path) - 1
+            # in a tree the meeting cell is the one of the path closest to the root
+            assert index.lca(source, target) == min(path, key=lambda pos: root_distances[pos])
+
+
+@pytest.mark.parametrize("wall, error", [(False, "loops"), (True, "unreachable")])
+def test_rejects_mazes_that_are_not_trees(wall, error):
+    maze = generate(8, 8, "kruskal", seed=1)
+    # opening a closed wall adds a loop, closing an open one cuts the tree in two
+    x, y = next((x, y) for x in range(7) for y in range(8) if bool(maze.walls[x, y] & RIGHT) != wall)
+    maze.set_wall(x, y, RIGHT, wall)
+    with pytest.raises(ValueError, match=error):
+        MazePathIndex(maze)
@@ -0,0 +1,141 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from MazeSolver import MazeSolver
+from maze_algorithms import generate
+from maze_io import load_maze
+from maze_service import MazeService, _generate_job, _nbytes
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """
+    A thread pool counting the jobs it was given.
+    """
+
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.jobs = 0
+
+    def submit(self, function, *args, **kwargs):
+        self.jobs += 1
+        return super().submit(function, *args, **kwargs)
+
+
+async def get(port, *targets, method="GET"):
+    """
+    Sends requests over one keep-alive connection, returning the status and body of each response.
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    responses = []
+    for i, target in enumerate(targets):
+        connection = "close" if i == len(targets) - 1 else "keep-alive"
+        writer.write(f"{method} {target} HTTP/1.1\r\nHost: test\r\nConnection: {connection}\r\n\r\n".encode())
+        head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        headers = dict(line.lower().split(": ", 1) for line in head[1:] if line)
+        body = await reader.readexactly(int(headers["content-length"]))
+        responses.append((int(head[0].split()[1]), body))
+    writer.close()
+    return responses
+
+
+def serve(service, client):
+    """
+    Runs client(port) against the service listening on a free local port.
+    """
+    async def run():
+        server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+        async with server:
+            return await client(server.sockets[0].getsockname()[1])
+
+    with service.executor:
+        return asyncio.run(run())
+
+
+def test_endpoints(tmp_path):
+    responses = serve(MazeService(CountingExecutor()), lambda port: get(
+        port, "/generate?width=13&height=7&seed=5", "/solve?width=13&height=7&seed=5&start=2,3&solver=bfs",
+        "/render?width=13&height=7&seed=5&cell_size=4"))
+    assert [status for status, _ in responses] == [200, 200, 200]
+
+    maze = generate(7, 13, "backtracker", seed=5)
+    (tmp_path / "maze.bin").write_bytes(responses[0][1])
+    maze_file = load_maze(tmp_path / "maze.bin")
+    assert maze_file.seed == 5 and (maze_file.to_grid().walls == maze.walls).all()
+    solution = json.loads(responses[1][1])
+    assert solution["found"] and solution["end"] == [12, 6]
+    assert [tuple(pos) for pos in solution["path"]] == MazeSolver(maze, (2, 3), (12, 6), algorithm="bfs").solve()
+    assert responses[2][1].startswith(b"\x89PNG")
+
+
+@pytest.mark.parametrize("target, status", [
+    ("/nowhere", 404),
+    ("/generate?width=abc", 400),
+    ("/generate?width=0", 400),
+    ("/generate?width=5000&height=5000", 400),
+    ("/generate?algorithm=prim", 400),
+    ("/generate?seed=-1", 400),
+    ("/solve?start=1", 400),
+    ("/solve?width=10&height=10&end=10,0", 400),
+    ("/solve?solver=dfs", 400),
+    ("/render?cell_size=0", 400),
+])
+def test_bad_requests(target, status):
+    service = MazeService(CountingExecutor())
+    ((answer, body),) = serve(service, lambda port: get(port, target))
+    assert answer == status
+    assert "error" in json.loads(body)
+    assert service.executor.jobs == 0
+
+
+def test_bad_method_and_request_line():
+    async def client(port):
+        (response,) = await get(port, "/generate", method="POST")
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET\r\n\r\n")
+        status = (await reader.readline()).split()[1]
+        writer.close()
+        return response[0], int(status)
+
+    assert serve(MazeService(CountingExecutor()), client) == (405, 400)
+
+
+def test_repeated_requests_are_cache_hits():
+    service = MazeService(CountingExecutor())
+    responses = serve(service, lambda port: get(port, *["/solve?width=20&height=20&seed=1"] * 3))
+    assert len({body for _, body in responses}) == 1
+    # the maze and the path are computed once, the two repeats hit the cached path
+    assert (service.misses, service.hits, service.executor.jobs) == (2, 2, 2)
+
+
+def test_least_recently_used_results_are_evicted_by_size():
+    # room for two 16x16 mazes but not three
+    service = MazeService(CountingExecutor(), cache_bytes=_nbytes(_generate_job(16, 16, "backtracker", 0)) * 5 // 2)
+    targets = ["/generate?width=16&height=16&seed=%d" % seed for seed in (1, 2, 1, 3, 2, 1)]
+    responses = serve(service, lambda port: get(port, *targets))
+    assert all(status == 200 for status, _ in responses)
+    assert responses[0] == responses[2] == responses[5]
+    # seed 3 evicts seed 2, the least recently used, then seed 2 evicts seed 1
+    assert (service.hits, service.misses) == (1, 5)
+    assert service.cached_bytes <= service.cache_bytes
+
+
+def test_results_larger_than_the_budget_are_not_kept():
+    service = MazeService(CountingExecutor(), cache_bytes=_nbytes(_generate_job(16, 16, "backtracker", 0)) - 1)
+    serve(service, lambda port: get(port, *["/generate?width=16&height=16"] * 2))
+    assert (service.hits, service.misses, service.cached_bytes) == (0, 2, 0)
+
+
+def test_concurrent_requests_share_one_computation():
+    service = MazeService(CountingExecutor())
+
+    async def requests():
+        return await asyncio.gather(*(service.respond("GET", "/render?width=30&height=30&seed=9") for _ in range(5)))
+
+    with service.executor:
+        responses = asyncio.run(requests())
+    assert len(set(responses)) == 1 and responses[0][0] == 200
+    # one maze, one path and one image; the only hit is the path reading the maze the image asked for first
+    assert (service.executor.jobs, service.misses, service.hits) == (3, 3, 1)
@@ -0,0 +1,111 @@
+import pytest
+
+import maze_jit
+from MazeGrid import DIRECTIONS, OFFSETS, RIGHT, BOTTOM
+from MazeSolver import MazeSolver, BidirectionalSolver, MultiTargetSolver
+from maze_algorithms import generate
+from maze_distance import distance_field
+
+
+def loopy_maze(maze_height, maze_width, seed):
+    """
+    Returns a maze with every seventh inner wall removed, so most pairs of cells are joined by several paths.
+    """
+    maze = generate(maze_height, maze_width, "kruskal", seed=seed)
+    for x in range(maze_width):
+        for y in range(maze_height):
+            if (x * maze_height + y) % 7 == 0:
+                if x < maze_width - 1:
+                    maze.set_wall(x, y, RIGHT, False)
+                if y < maze_height - 1:
+                    maze.set_wall(x, y, BOTTOM, False)
+    return maze
+
+
+def assert_walkable(maze, path, start_pos, end_pos):
+    """
+    Checks that a path goes from start_pos to end_pos, one open side at a time.
+    """
+    assert path[0] == start_pos and path[-1] == end_pos
+    for (x, y), (next_x, next_y) in zip(path, path[1:]):
+        direction = DIRECTIONS[OFFSETS.index((next_x - x, next_y - y))]
+        assert not maze.walls[x, y] & direction
+
+
+QUERIES = [((0, 0), (18, 13)), ((18, 0), (0, 13)), ((9, 6), (9, 6)), ((3, 11), (4, 11)), ((17, 2), (1, 12))]
+
+
+@pytest.mark.parametrize("jit", [False, True])
+@pytest.mark.parametrize("algorithm", ["astar", "bfs"])
+def test_shortest_paths_match_breadth_first_search(monkeypatch, jit, algorithm):
+    # the kernels are plain Python without Numba, so both paths run everywhere
+    monkeypatch.setattr(maze_jit, "use_jit", lambda cells: jit)
+    for seed in range(4):
+        maze = loopy_maze(14, 19, seed)
+        for start_pos, end_pos in QUERIES:
+            expected = distance_field(maze, start_pos)[end_pos]
+            assert len(MazeSolver(maze, start_pos, end_pos, algorithm="bfs").solve()) - 1 == expected
+            for solver in (MazeSolver, BidirectionalSolver):
+                path = solver(maze, start_pos, end_pos, algorithm=algorithm).solve()
+                assert len(path) - 1 == expected
+                assert_walkable(maze, path, start_pos, end_pos)
+
+
+@pytest.mark.parametrize("algorithm", ["astar", "bfs"])
+def test_step_by_step_ends_on_the_path_solve_returns(algorithm):
+    maze = loopy_maze(14, 19, 5)
+    for start_pos, end_pos in QUERIES:
+        for solver in (MazeSolver, BidirectionalSolver):
+            stepped = solver(maze, start_pos, end_pos, algorithm=algorithm)
+            for _ in stepped.steps():
+                pass
+            assert stepped.found
+            assert len(stepped.path) == len(solver(maze, start_pos, end_pos, algorithm=algorithm).solve())
+
+
+def test_unreachable_end():
+    maze = loopy_maze(6, 6, 1)
+    for direction, (dx, dy) in zip(DIRECTIONS, OFFSETS):
+        if maze.in_bounds(5 + dx, 5 + dy):
+            maze.set_wall(5, 5, direction, True)
+    for solver in (MazeSolver, BidirectionalSolver):
+        for algorithm in ("astar", "bfs"):
+            assert solver(maze, (0, 0), (5, 5), algorithm=algorithm).solve() == []
+    multi = MultiTargetSolver(maze, (0, 0), [(5, 5)], all_targets=True)
+    assert multi.solve() == [] and not multi.found
+
+
+def run(solver, stepped):
+    """
+    Runs a solver to the end with solve(), or one step at a time, returning the path to the nearest target.
+    """
+    if not stepped:
+        return solver.solve()
+    for _ in solver.steps():
+        pass
+    return solver.path_to(solver.nearest)
+
+
+@pytest.mark.parametrize("algorithm", ["astar", "bfs"])
+@pytest.mark.parametrize("stepped", [False, True])
+def test_multi_target_distances_match_breadth_first_search(algorithm, stepped):
+    maze = loopy_maze(14, 19, 2)
+    start_pos = (6, 4)
+    targets = [(18, 13), (0, 0), (6, 5), (12, 1), (0, 13)]
+    distances = distance_field(maze, start_pos)
+
+    solver = MultiTargetSolver(maze, start_pos, targets, algorithm=algorithm)
+    nearest = min(targets, key=lambda target: distances[target])
+    run(solver, stepped)
+    assert solver.nearest == nearest and solver.distances == {nearest: distances[nearest]}
+    assert_walkable(maze, solver.path, start_pos, nearest)
+    assert len(solver.path) - 1 == distances[nearest]
+
+    solver = MultiTargetSolver(maze, start_pos, targets, algorithm=algorithm, all_targets=True)
+    assert run(solver, stepped) == solver.path_to(nearest)
+    assert solver.distances == {target: distances[target] for target in targets}
+    for target in targets:
+        assert_walkable(maze, solver.path_to(target), start_pos, target)
+        assert len(solver.path_to(target)) - 1 == distances[target]
+    # the search went on past the nearest target, its path ends at the last one reached
+    assert solver.path == solver.path_to(list(solver.distances)[-1])
@@ -0,0 +1,27 @@
+from maze_stats import MazeStats
+
+
+def test_prometheus_buckets_hold_durations_up_to_their_label():
+    stats = MazeStats()
+    durations = [1000, 1023, 1024, 5000]
+    for duration in durations:
+        stats.observe_ns("step_ns", duration)
+    lines = stats.to_prometheus().splitlines()
+    buckets = [line for line in lines if line.startswith("maze_step_ns_bucket")]
+    assert buckets == [
+        'maze_step_ns_bucket{le="1023"} 2',
+        'maze_step_ns_bucket{le="2047"} 3',
+        'maze_step_ns_bucket{le="4095"} 3',
+        'maze_step_ns_bucket{le="8191"} 4',
+        'maze_step_ns_bucket{le="+Inf"} 4',
+    ]
+    for line in buckets[:-1]:
+        bound, count = int(line.split('"')[1]), int(line.split()[-1])
+        assert count == sum(duration <= bound for duration in durations)
+    assert "maze_step_ns_sum 8047" in lines and "maze_step_ns_count 4" in lines
+
+
+def test_prometheus_zero_durations():
+    stats = MazeStats()
+    stats.observe_ns("step_ns", 0)
+    assert 'maze_step_ns_bucket{le="0"} 1' in stats.to_prometheus().splitlines()
@@ -0,0 +1,33 @@
+from MazeGenerator import MazeGenerator
+from MazeSolver import MazeSolver
+from maze_trace import record_trace, TracePlayer
+from maze_utils import new_maze
+
+
+def test_solve_only_trace(tmp_path):
+    maze = new_maze(12, 9)
+    maze_gen = MazeGenerator(maze, seed=4)
+    maze_gen.run()
+    expected = MazeSolver(maze, (0, 0), (8, 11)).solve()
+
+    trace = tmp_path / "solve.mztr"
+    count = record_trace(str(trace), maze_gen, MazeSolver(maze, (0, 0), (8, 11)), checkpoint_interval=4)
+    player = TracePlayer(str(trace))
+
+    assert player.gen_count == 0 and len(player) == count
+    assert (player.maze.walls == maze.walls).all()
+    assert player.seek(len(player)).path == expected
+    assert (player.seek(1).maze.walls == maze.walls).all()
+
+
+def test_generation_trace_seeks_to_every_checkpoint(tmp_path):
+    maze = new_maze(6, 5)
+    trace = tmp_path / "full.mztr"
+    for interval in (1, 7, 29, 1000):
+        record_trace(str(trace), MazeGenerator(maze.copy(), seed=2), MazeSolver(maze.copy(), (0, 0), (4, 5)),
+                     checkpoint_interval=interval)
+        generated = maze.copy()
+        MazeGenerator(generated, seed=2).run()
+        player = TracePlayer(str(trace))
+        assert (player.seek(player.gen_count).maze.walls == generated.walls).all()
+        assert (player.seek(0).maze.walls == maze.walls).all()